@@ -0,0 +1,103 @@
+# benchmarks/corpus.py
+# 프롬프트 생성기 벤치마크용 한국어/영어 콘셉트 코퍼스 생성 (시드 고정)
+# 사용 예: python benchmarks/corpus.py --size 3000 -o benchmarks/data/prompt_corpus.jsonl
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import List
+
+CORPUS_PATH = Path(__file__).resolve().parent / "data" / "prompt_corpus.jsonl"
+
+KO_ADJECTIVES = [
+    "귀여운", "예쁜", "아름다운", "멋진", "밝은", "어두운", "화려한", "작은", "큰", "즐거운",
+    "행복한", "슬픈", "신비로운", "고요한", "역동적인", "사실적인", "예술적인", "단순한", "분위기있는", "따뜻한"
+]
+KO_SUBJECTS = [
+    "강아지가", "고양이가", "아이가", "아기가", "여성이", "여자가", "남성이", "남자가", "사람들이", "새가",
+    "자동차가", "기차가", "로봇이", "나비가", "말이", "돌고래가", "할머니가", "학생들이", "댄서가", "요리사가"
+]
+KO_PLACES = [
+    "공원에서", "해변에서", "숲 속에서", "도시에서", "무대에서", "스튜디오에서", "바다 위에서", "산 위에서",
+    "집에서", "실내에서", "실외에서", "눈 덮인 마을에서", "비 오는 거리에서", "카페에서", "들판에서"
+]
+KO_ACTIONS = [
+    "뛰노는", "달리는", "걷는", "서있는", "앉아있는", "춤추는", "노래를 부르는", "노래하는", "자는", "먹는",
+    "쉬는", "점프하는", "날아가는", "웃는", "요리하는", "헤엄치는", "움직이는", "보는"
+]
+KO_ENDINGS = [
+    "영상", "장면", "모습", "풍경", "시네마틱 영상", "드라마틱 장면", "미니멀 영상", "다이나믹 영상", "느린 영상", "빠른 영상"
+]
+KO_SCENERY = [
+    "아름다운 숲 속의 자연 풍경", "어두운 도시의 시네마틱 야경", "밝은 해변의 일출", "고요한 산 위의 안개",
+    "화려한 불꽃놀이 장면", "눈 내리는 자연 풍경", "바다 위로 지는 노을", "분위기있는 숲 속 오두막"
+]
+
+EN_ADJECTIVES = ["cute", "beautiful", "dark", "bright", "vibrant", "cinematic", "peaceful", "dramatic", "tiny", "majestic"]
+EN_SUBJECTS = ["dog", "cat", "puppy", "woman", "man", "child", "baby", "robot", "horse", "dancer", "city skyline", "mountain"]
+EN_ACTIONS = ["running", "walking", "dancing", "singing", "sleeping", "playing", "jumping", "standing", "moving slowly"]
+EN_PLACES = ["in a park", "on the beach", "in a forest", "in the city", "on a stage", "in a studio", "at night", "in the snow"]
+EN_STYLES = ["", ", cinematic", ", slow motion", ", 4K", ", dramatic lighting", ", natural colors"]
+
+
+def _korean(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.1:
+        return rng.choice(KO_SCENERY)
+    parts = []
+    if rng.random() < 0.7:
+        parts.append(rng.choice(KO_ADJECTIVES))
+    parts.append(rng.choice(KO_SUBJECTS))
+    if rng.random() < 0.6:
+        parts.append(rng.choice(KO_PLACES))
+    parts.append(rng.choice(KO_ACTIONS))
+    if rng.random() < 0.4:
+        parts.append(rng.choice(KO_ADJECTIVES))
+    parts.append(rng.choice(KO_ENDINGS))
+    text = " ".join(parts)
+    if rng.random() < 0.15:
+        # 두 문장으로 된 긴 설명
+        text += f", {rng.choice(KO_PLACES)} {rng.choice(KO_ACTIONS)} {rng.choice(KO_ENDINGS)}"
+    return text
+
+
+def _english(rng: random.Random) -> str:
+    return (f"{rng.choice(EN_ADJECTIVES)} {rng.choice(EN_SUBJECTS)} {rng.choice(EN_ACTIONS)} "
+            f"{rng.choice(EN_PLACES)}{rng.choice(EN_STYLES)}")
+
+
+def build_corpus(size: int = 3000, seed: int = 42, english_ratio: float = 0.25) -> List[str]:
+    """중복 없는 콘셉트 코퍼스 생성"""
+    rng = random.Random(seed)
+    corpus = {}
+    attempts = 0
+    while len(corpus) < size and attempts < size * 50:
+        attempts += 1
+        text = _english(rng) if rng.random() < english_ratio else _korean(rng)
+        corpus.setdefault(text, None)
+    return list(corpus)
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line)["input"] for line in f if line.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="벤치마크 코퍼스 생성")
+    parser.add_argument("--size", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", default=str(CORPUS_PATH))
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for text in corpus:
+            f.write(json.dumps({"input": text}, ensure_ascii=False) + "\n")
+    print(f"{len(corpus)} concepts -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
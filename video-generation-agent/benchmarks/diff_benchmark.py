@@ -0,0 +1,87 @@
+# benchmarks/diff_benchmark.py
+# 프롬프트 diff 지연 시간 측정 - diff_engine(word/char) 대 기존 difflib.ndiff 방식
+# 사용 예: python benchmarks/diff_benchmark.py --words 40 150 300 --edit-ratio 0.1 0.3
+import argparse
+import difflib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from corpus import build_corpus  # noqa: E402
+from components.prompt_editor.diff_engine import diff_text  # noqa: E402
+
+ENHANCERS = ["cinematic", "4k", "slow motion", "soft lighting", "golden hour", "tracking shot",
+             "shallow depth of field", "high detail", "dramatic", "wide angle"]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _make_pair(texts: List[str], words: int, edit_ratio: float, rng: random.Random) -> Tuple[str, str]:
+    """코퍼스 문장을 이어 붙인 프롬프트와 단어 삽입/삭제/교체로 편집한 버전"""
+    original: List[str] = []
+    while len(original) < words:
+        original.extend(rng.choice(texts).split())
+        original.extend(rng.choice(ENHANCERS).split())
+    original = original[:words]
+    edited = list(original)
+    for _ in range(max(1, int(words * edit_ratio))):
+        position = rng.randrange(len(edited))
+        roll = rng.random()
+        if roll < 0.33 and len(edited) > 1:
+            del edited[position]
+        elif roll < 0.66:
+            edited.insert(position, rng.choice(ENHANCERS))
+        else:
+            edited[position] = rng.choice(texts).split()[0]
+    return " ".join(original), " ".join(edited)
+
+
+def _ndiff(original: str, modified: str) -> None:
+    # 기존 generate_diff 방식
+    list(difflib.ndiff(original.split(), modified.split()))
+
+
+def _measure(fn: Callable[[str, str], object], pairs: List[Tuple[str, str]]) -> dict:
+    samples = []
+    for original, modified in pairs:
+        started = time.perf_counter()
+        fn(original, modified)
+        samples.append((time.perf_counter() - started) * 1e3)
+    return {"p50": round(_percentile(samples, 50), 3), "p99": round(_percentile(samples, 99), 3)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="프롬프트 diff 벤치마크")
+    parser.add_argument("--words", type=int, nargs="+", default=[40, 150, 300])
+    parser.add_argument("--edit-ratio", type=float, nargs="+", default=[0.1, 0.3])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    texts = build_corpus(2000, seed=args.seed)
+    rng = random.Random(args.seed)
+    report = []
+    for words in args.words:
+        for ratio in args.edit_ratio:
+            pairs = [_make_pair(texts, words, ratio, rng) for _ in range(args.pairs)]
+            report.append({
+                "words": words,
+                "edit_ratio": ratio,
+                "word_ms": _measure(lambda a, b: diff_text(a, b, "word"), pairs),
+                "char_ms": _measure(lambda a, b: diff_text(a, b, "char"), pairs),
+                "ndiff_ms": _measure(_ndiff, pairs),
+            })
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
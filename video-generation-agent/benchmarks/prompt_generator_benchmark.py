@@ -0,0 +1,185 @@
+# benchmarks/prompt_generator_benchmark.py
+# PromptGenerator 지연 시간/처리량/단계별 비용 벤치마크 및 기준선 비교
+# 사용 예:
+#   python benchmarks/prompt_generator_benchmark.py                  # 측정 후 기준선과 비교
+#   python benchmarks/prompt_generator_benchmark.py --save-baseline  # 현재 결과를 기준선으로 저장
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from corpus import CORPUS_PATH, load_corpus  # noqa: E402
+from components.prompt_generator.generator import PromptGenerator  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "prompt_generator.json"
+
+# 단계별 측정 대상 (중첩 호출 포함 시간)
+STAGES = [
+    "_extract_nouns", "_extract_adjectives", "_extract_verbs", "_extract_subject",
+    "_extract_action", "_extract_environment", "_extract_style", "_match_category",
+    "_build_prompt"
+]
+
+# 기준선 비교 지표: (이름, 값이 클수록 좋은지)
+COMPARED_METRICS = [
+    ("latency.p50_us", False),
+    ("latency.p99_us", False),
+    ("throughput.cold_per_sec", True),
+]
+
+
+def _clear_memo() -> None:
+    PromptGenerator._parse_cache.clear()
+    PromptGenerator._category_cache.clear()
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure_latency(generator: PromptGenerator, corpus: List[str], repeat: int = 3) -> Dict[str, float]:
+    """단건 generate_prompt 지연 시간 (메모이제이션 비활성, 입력별 반복 측정의 최솟값)"""
+    samples = [float("inf")] * len(corpus)
+    for _ in range(repeat):
+        for index, text in enumerate(corpus):
+            _clear_memo()
+            started = time.perf_counter()
+            generator.generate_prompt_sync(text)
+            samples[index] = min(samples[index], (time.perf_counter() - started) * 1e6)
+    return {
+        "p50_us": round(_percentile(samples, 50), 1),
+        "p99_us": round(_percentile(samples, 99), 1),
+        "mean_us": round(statistics.fmean(samples), 1),
+        "max_us": round(max(samples), 1),
+    }
+
+
+def measure_throughput(generator: PromptGenerator, corpus: List[str]) -> Dict[str, float]:
+    """generate_batch 처리량 (콜드/메모 적중 상태)"""
+    _clear_memo()
+    started = time.perf_counter()
+    generator.generate_batch(corpus)
+    cold = len(corpus) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    generator.generate_batch(corpus)
+    warm = len(corpus) / (time.perf_counter() - started)
+    _clear_memo()
+    return {"cold_per_sec": round(cold, 1), "warm_per_sec": round(warm, 1)}
+
+
+def _timed(func: Callable, totals: Dict[str, List[float]], name: str) -> Callable:
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            totals[name].append(time.perf_counter() - started)
+    return wrapper
+
+
+def measure_stages(generator: PromptGenerator, corpus: List[str]) -> Dict[str, Dict[str, float]]:
+    """단계별 평균 비용 (인스턴스 메서드를 타이머로 감싸 측정)"""
+    totals: Dict[str, List[float]] = defaultdict(list)
+    stages = [name for name in STAGES if hasattr(generator, name)]
+    for name in stages:
+        setattr(generator, name, _timed(getattr(generator, name), totals, name))
+
+    # 토크나이저와 사전 스캔은 공유 객체이므로 측정 후 원복
+    tokenizer, lexicon = generator.tokenizer, generator.lexicon
+    original_tokenize, original_scan = tokenizer.tokenize, lexicon.scan
+    tokenizer.tokenize = _timed(original_tokenize, totals, "tokenizer.tokenize")
+    lexicon.scan = _timed(original_scan, totals, "lexicon.scan")
+
+    try:
+        total_seconds = 0.0
+        for text in corpus:
+            _clear_memo()
+            started = time.perf_counter()
+            generator.generate_prompt_sync(text)
+            total_seconds += time.perf_counter() - started
+    finally:
+        for name in stages:
+            delattr(generator, name)
+        del tokenizer.tokenize
+        del lexicon.scan
+
+    report = {}
+    for name, samples in totals.items():
+        report[name] = {
+            "calls_per_input": round(len(samples) / len(corpus), 2),
+            "mean_us": round(statistics.fmean(samples) * 1e6, 2),
+            "share_pct": round(sum(samples) / total_seconds * 100, 1),
+        }
+    return report
+
+
+def _lookup(report: Dict[str, Any], dotted: str) -> float:
+    value = report
+    for part in dotted.split("."):
+        value = value[part]
+    return value
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준선 대비 허용 범위를 넘는 회귀 목록"""
+    regressions = []
+    for metric, higher_is_better in COMPARED_METRICS:
+        current, previous = _lookup(report, metric), _lookup(baseline, metric)
+        change = (current - previous) / previous if previous else 0.0
+        worse = -change if higher_is_better else change
+        status = "REGRESSION" if worse > tolerance else "ok"
+        print(f"  {metric:<28} {previous:>12} -> {current:>12} ({change:+.1%}) {status}")
+        if worse > tolerance:
+            regressions.append(metric)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="PromptGenerator 벤치마크")
+    parser.add_argument("--corpus", default=str(CORPUS_PATH))
+    parser.add_argument("--limit", type=int, default=None, help="사용할 코퍼스 크기")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3, help="지연 시간 측정 반복 횟수")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 회귀 비율")
+    args = parser.parse_args()
+
+    corpus = load_corpus(Path(args.corpus))[:args.limit]
+    generator = PromptGenerator()
+    generator.generate_batch(corpus[:50])  # 사전 로드 및 워밍업
+
+    report = {
+        "corpus_size": len(corpus),
+        "latency": measure_latency(generator, corpus, args.repeat),
+        "throughput": measure_throughput(generator, corpus),
+        "stages": measure_stages(generator, corpus),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline saved -> {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print("baseline not found - run with --save-baseline first")
+        return 0
+
+    print("baseline comparison:")
+    regressions = compare(report, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# benchmarks/similarity_benchmark.py
+# 유사 프롬프트 인덱스 색인 처리량/검색 지연 시간/재현율 측정
+# 사용 예: python benchmarks/similarity_benchmark.py --size 200000 --queries 300
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from corpus import build_corpus  # noqa: E402
+from components.history.similarity_index import SimilarityIndex, char_ngrams  # noqa: E402
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _perturb(text: str, rng: random.Random) -> str:
+    """띄어쓰기/문장부호/부분 삭제로 변형한 질의"""
+    words = text.split()
+    if len(words) > 3 and rng.random() < 0.5:
+        del words[rng.randrange(len(words))]
+    text = " ".join(words)
+    if rng.random() < 0.5:
+        text = text.replace(" ", "", 1)
+    return text + rng.choice(["", "!", " 영상", "..."])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="유사 프롬프트 인덱스 벤치마크")
+    parser.add_argument("--size", type=int, default=100000, help="색인할 히스토리 입력 수")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--num-perm", type=int, default=64)
+    parser.add_argument("--bands", type=int, default=32)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    texts = build_corpus(args.size, seed=args.seed)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = SimilarityIndex(Path(directory), num_perm=args.num_perm, bands=args.bands)
+        started = time.perf_counter()
+        for start in range(0, len(texts), 10000):
+            index.add_many({"input": text} for text in texts[start:start + 10000])
+        build_seconds = time.perf_counter() - started
+
+        # 증분 추가 (save_history 경로)
+        extra = [f"{text} 추가" for text in rng.sample(texts, min(200, len(texts)))]
+        add_samples = []
+        for text in extra:
+            started = time.perf_counter()
+            index.add({"input": text})
+            add_samples.append((time.perf_counter() - started) * 1e3)
+
+        queries = [_perturb(text, rng) for text in rng.sample(texts, args.queries)]
+        latencies, hits = [], 0
+        gram_sets = [char_ngrams(text) for text in texts]
+        recall_total = recall_found = 0
+        for query in queries:
+            started = time.perf_counter()
+            results = index.query(query, top_k=10, threshold=args.threshold)
+            latencies.append((time.perf_counter() - started) * 1e3)
+            hits += bool(results)
+
+            # 정확한 전수 검색 결과 대비 재현율 (상위 10개 기준)
+            grams = char_ngrams(query)
+            exact = sorted((len(grams & other) / len(grams) for other in gram_sets), reverse=True)[:10]
+            expected = [score for score in exact if score >= args.threshold]
+            recall_total += len(expected)
+            recall_found += min(len(expected), len(results))
+
+    report = {
+        "documents": len(texts),
+        "build_docs_per_sec": round(len(texts) / build_seconds, 1),
+        "add_ms": {"p50": round(_percentile(add_samples, 50), 3), "p99": round(_percentile(add_samples, 99), 3)},
+        "query_ms": {
+            "p50": round(_percentile(latencies, 50), 3),
+            "p99": round(_percentile(latencies, 99), 3),
+            "mean": round(statistics.fmean(latencies), 3),
+        },
+        "queries_with_results": hits,
+        "recall_at_10": round(recall_found / recall_total, 3) if recall_total else None,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# benchmarks/tokenizer_benchmark.py
+# 토크나이저 백엔드 정확도/처리량 비교
+# 사용 예: python benchmarks/tokenizer_benchmark.py --backends regex spacy --repeat 200
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from components.prompt_generator.tokenizer import SpacyTokenizer, TokenizedText, get_tokenizer  # noqa: E402
+
+GOLD_PATH = Path(__file__).resolve().parent / "data" / "tokenizer_gold.jsonl"
+FIELDS = ("nouns", "adjectives", "verbs")
+
+
+def load_gold(path: Path) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _predicted(tokens: TokenizedText, field: str) -> set:
+    if field == "nouns":
+        # 두 백엔드 모두 영어 단어는 품사 구분 없이 명사 후보로 넘김
+        return set(tokens.nouns) | set(tokens.english_words)
+    return set(getattr(tokens, field))
+
+
+def _matches(expected: str, predicted: str, lenient: bool) -> bool:
+    if not lenient:
+        return expected == predicted
+    # 어간('화려')이나 조사가 붙은 어절('강아지가')도 정답으로 인정
+    return expected.startswith(predicted) or predicted.startswith(expected)
+
+
+def score(gold: List[Dict], predictions: List[TokenizedText],
+          lenient: bool = False) -> Dict[str, Dict[str, float]]:
+    """품사별 precision/recall/F1"""
+    results = {}
+    for field in FIELDS:
+        tp_expected = tp_predicted = total_expected = total_predicted = 0
+        for entry, tokens in zip(gold, predictions):
+            expected = set(entry[field])
+            predicted = _predicted(tokens, field)
+            total_expected += len(expected)
+            total_predicted += len(predicted)
+            tp_expected += sum(1 for e in expected if any(_matches(e, p, lenient) for p in predicted))
+            tp_predicted += sum(1 for p in predicted if any(_matches(e, p, lenient) for e in expected))
+        precision = tp_predicted / total_predicted if total_predicted else 0.0
+        recall = tp_expected / total_expected if total_expected else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        results[field] = {"precision": round(precision, 3), "recall": round(recall, 3), "f1": round(f1, 3)}
+    return results
+
+
+def throughput(tokenizer, texts: List[str], repeat: int) -> Dict[str, float]:
+    """단건/배치 토큰화 처리량 (texts/sec)"""
+    corpus = texts * repeat
+
+    started = time.perf_counter()
+    for text in corpus:
+        tokenizer.tokenize(text)
+    single = len(corpus) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    tokenizer.tokenize_batch(corpus)
+    batch = len(corpus) / (time.perf_counter() - started)
+
+    return {"single_per_sec": round(single, 1), "batch_per_sec": round(batch, 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="토크나이저 백엔드 정확도/처리량 비교")
+    parser.add_argument("--backends", nargs="+", default=["regex", "spacy"])
+    parser.add_argument("--repeat", type=int, default=100, help="처리량 측정 시 코퍼스 반복 횟수")
+    args = parser.parse_args()
+
+    gold = load_gold(GOLD_PATH)
+    texts = [entry["text"] for entry in gold]
+
+    report = {}
+    for backend in args.backends:
+        started = time.perf_counter()
+        tokenizer = get_tokenizer(backend)
+        load_seconds = time.perf_counter() - started
+
+        if backend == "spacy" and not isinstance(tokenizer, SpacyTokenizer):
+            report[backend] = {"skipped": "spaCy 모델을 로드할 수 없음"}
+            continue
+
+        predictions = tokenizer.tokenize_batch(texts)
+        report[backend] = {
+            "load_seconds": round(load_seconds, 3),
+            "accuracy": score(gold, predictions),
+            "accuracy_prefix_match": score(gold, predictions, lenient=True),
+            "throughput": throughput(tokenizer, texts, args.repeat),
+        }
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,50 +21,273 @@
 
 # src/components/cache/cache_manager.py
 import redis
-import json
+import random
+import threading
+import time
+import uuid
 from datetime import timedelta
 from config.settings import settings
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, List, Mapping
+from components.cache.redis_client import get_redis, get_redis_breaker
+from components.cache.serializer import get_serializer
+from utils.ttl_cache import TTLCache
+
+# 파이프라인 한 번에 보내는 최대 명령 수 (요청/응답 버퍼 상한)
+PIPELINE_BATCH_SIZE = 1000
+# 잠금 해제 - 값이 자신의 토큰일 때만 삭제 (조회와 삭제를 원자적으로)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class _Flight:
+    """진행 중인 단일 계산 (같은 키의 동시 요청은 결과를 기다림)"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
 
 class CacheManager:
+    # 프로세스 내 1단계 캐시 (Redis 앞단, 모든 인스턴스 공유) - 직렬화된 값으로 보관
+    _local = TTLCache(maxsize=settings.CACHE_LOCAL_SIZE, ttl=settings.CACHE_LOCAL_TTL)
+    # 키별 진행 중인 계산 (single-flight)
+    _flights: Dict[str, _Flight] = {}
+    _flights_lock = threading.Lock()
+    _coalesced = 0
+
     def __init__(self):
-        self.redis = None
-        if settings.REDIS_HOST:
-            try:
-                # 패스워드 옵션 조건부 설정
-                password = getattr(settings, 'REDIS_PASSWORD', None)
-                self.redis = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=password,  # None이면 패스워드 없이 연결
-                    decode_responses=True
-                )
-                self.redis.ping()  # 연결 테스트
-            except redis.ConnectionError:
-                self.redis = None
+        # 프로세스 공유 연결 풀 사용 (리런마다 새 연결/ping 없음)
+        self.redis = get_redis()
+        # Redis 장애 시 즉시 캐시 없이 동작하도록 모든 명령은 공유 차단기를 거침
+        self.breaker = get_redis_breaker()
+        self.serializer = get_serializer()
+        self._release_lock = self.redis.register_script(RELEASE_LOCK_SCRIPT) if self.redis is not None else None
 
     def get(self, key: str) -> Optional[Dict]:
-        """캐시에서 데이터 가져오기"""
-        if not self.redis:
-            return None
-            
-        data = self.redis.get(key)
-        return json.loads(data) if data else None
+        """캐시에서 데이터 가져오기 (프로세스 내 캐시 -> Redis)"""
+        data = self._local.get(key)
+        if data is None:
+            # 값과 남은 만료 시간을 한 번의 왕복으로 조회
+            result = self._call(lambda client: self._get_with_ttl(client, key).execute(),
+                                error_message="캐시 조회 실패")
+            if not result:
+                return None
+            data, remaining = result
+            if data:
+                self._local.set(key, data, ttl=self._local_ttl(remaining))
+        return self.serializer.decode(data)
 
     def set(self, key: str, value: Dict, ttl: int = 3600) -> bool:
-        """캐시에 데이터 저장"""
-        if not self.redis:
-            return False
-            
-        try:
-            self.redis.setex(key, timedelta(seconds=ttl), json.dumps(value))
-            return True
-        except Exception as e:
-            print(f"캐시 저장 실패: {e}")
-            return False
+        """캐시에 데이터 저장 (만료 시각 동기화를 막기 위해 TTL에 지터 적용)"""
+        data = self.serializer.encode(value)
+        ttl = self._jittered(ttl)
+        self._local.set(key, data, ttl=min(ttl, settings.CACHE_LOCAL_TTL))
+        return self._call(lambda client: bool(client.setex(key, timedelta(seconds=ttl), data)),
+                          default=False, error_message="캐시 저장 실패")
 
     def delete(self, key: str) -> None:
         """캐시 데이터 삭제"""
-        if self.redis:
-            self.redis.delete(key)
\ No newline at end of file
+        self._local.delete(key)
+        self._call(lambda client: client.delete(key), error_message="캐시 삭제 실패")
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """여러 키 조회 - 프로세스 내 캐시에 없는 키만 MGET으로 한 번에 (적중한 키만 반환)"""
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            data = self._local.get(key)
+            value = self.serializer.decode(data) if data is not None else None
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        for start in range(0, len(missing), PIPELINE_BATCH_SIZE):
+            batch = missing[start:start + PIPELINE_BATCH_SIZE]
+            # 값과 남은 만료 시간을 같은 왕복에서 조회
+            result = self._call(lambda client: self._mget_with_ttl(client, batch).execute(),
+                                error_message="캐시 일괄 조회 실패")
+            if not result:
+                break
+            values, *remaining = result
+            for key, data, key_ttl in zip(batch, values, remaining):
+                value = self.serializer.decode(data)
+                if value is not None:
+                    self._local.set(key, data, ttl=self._local_ttl(key_ttl))
+                    found[key] = value
+        return found
+
+    def set_many(self, items: Mapping[str, Dict], ttl: int = 3600,
+                 ttls: Optional[Mapping[str, int]] = None) -> bool:
+        """여러 키 저장 - 파이프라인 사용 (ttls로 키별 TTL 지정, 없으면 ttl)"""
+        entries = []
+        for key, value in items.items():
+            data = self.serializer.encode(value)
+            key_ttl = self._jittered(ttls.get(key, ttl) if ttls else ttl)
+            self._local.set(key, data, ttl=min(key_ttl, settings.CACHE_LOCAL_TTL))
+            entries.append((key, key_ttl, data))
+
+        def write(client: redis.Redis) -> bool:
+            for start in range(0, len(entries), PIPELINE_BATCH_SIZE):
+                pipe = client.pipeline(transaction=False)
+                for key, key_ttl, data in entries[start:start + PIPELINE_BATCH_SIZE]:
+                    pipe.setex(key, timedelta(seconds=key_ttl), data)
+                pipe.execute()
+            return True
+
+        return self._call(write, default=False, error_message="캐시 일괄 저장 실패")
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """여러 키 삭제 - 삭제된 Redis 키 수 반환"""
+        unique = list(dict.fromkeys(keys))
+        for key in unique:
+            self._local.delete(key)
+        if not unique:
+            return 0
+
+        def remove(client: redis.Redis) -> int:
+            return sum(client.delete(*unique[start:start + PIPELINE_BATCH_SIZE])
+                       for start in range(0, len(unique), PIPELINE_BATCH_SIZE))
+
+        return self._call(remove, default=0, error_message="캐시 일괄 삭제 실패")
+
+    def health(self) -> Dict[str, Any]:
+        """Redis 차단기 상태 (상태 패널용)"""
+        return {**self.breaker.snapshot(), "configured": self.redis is not None}
+
+    def get_or_set(self, key: str, factory: Callable[[], Any], ttl: int = 3600,
+                   cacheable: Callable[[Any], bool] = bool) -> Any:
+        """캐시 조회 후 없으면 계산해서 저장 - 같은 키는 한 호출자만 계산
+
+        같은 프로세스의 동시 요청은 계산 결과를 공유하고, 다른 프로세스와는
+        Redis 잠금으로 조율합니다. cacheable이 False를 반환하는 결과는 저장하지 않습니다.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                CacheManager._coalesced += 1
+
+        if not leader:
+            flight.done.wait(settings.CACHE_LOCK_TIMEOUT)
+            if flight.error is not None:
+                raise flight.error
+            if flight.done.is_set():
+                return flight.value
+            # 대표 호출자가 제한 시간 내에 끝나지 않으면 직접 계산
+            return factory()
+
+        try:
+            # 직전에 끝난 계산의 결과가 이미 저장됐을 수 있음
+            cached = self.serializer.decode(self._local.get(key))
+            if cached is not None:
+                flight.value = cached
+                return flight.value
+            flight.value = self._compute(key, factory, ttl, cacheable)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """프로세스 내 캐시 통계"""
+        return {**self._local.stats(), "coalesced": CacheManager._coalesced}
+
+    def _compute(self, key: str, factory: Callable[[], Any], ttl: int,
+                 cacheable: Callable[[Any], bool]) -> Any:
+        """다른 프로세스가 계산 중이면 결과를 기다리고, 아니면 직접 계산"""
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        locked = self._acquire(lock_key, token)
+        if not locked:
+            cached = self._wait_for(key)
+            if cached is not None:
+                return cached
+        try:
+            value = factory()
+            if cacheable(value):
+                self.set(key, value, ttl)
+            return value
+        finally:
+            if locked:
+                self._release(lock_key, token)
+
+    def _acquire(self, lock_key: str, token: str) -> bool:
+        # Redis를 쓸 수 없으면 잠금 없이 직접 계산
+        return bool(self._call(
+            lambda client: client.set(lock_key, token, nx=True,
+                                      px=int(settings.CACHE_LOCK_TIMEOUT * 1000)),
+            default=True
+        ))
+
+    def _release(self, lock_key: str, token: str) -> None:
+        # 자신이 잡은 잠금만 해제 (만료 후 다른 프로세스가 잡은 잠금 보호, EVALSHA 한 번)
+        self._call(lambda client: self._release_lock(keys=[lock_key], args=[token], client=client))
+
+    def _wait_for(self, key: str) -> Optional[Dict]:
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            if not self._call(lambda client: client.exists(f"{key}:lock"), default=0):
+                return None
+        return None
+
+    def _call(self, operation: Callable[[redis.Redis], Any], default: Any = None,
+              error_message: Optional[str] = None) -> Any:
+        """차단기를 거쳐 Redis 명령 실행 - 연결이 없거나 차단 중이거나 실패하면 default"""
+        if self.redis is None or not self.breaker.allow():
+            return default
+        try:
+            result = operation(self.redis)
+        except (redis.RedisError, OSError) as e:
+            self.breaker.record_failure(e)
+            if error_message:
+                print(f"{error_message}: {e}")
+            return default
+        self.breaker.record_success()
+        return result
+
+    @staticmethod
+    def _get_with_ttl(client, key: str):
+        pipe = client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.ttl(key)
+        return pipe
+
+    @staticmethod
+    def _mget_with_ttl(client, keys: List[str]):
+        pipe = client.pipeline(transaction=False)
+        pipe.mget(keys)
+        for key in keys:
+            pipe.ttl(key)
+        return pipe
+
+    @staticmethod
+    def _local_ttl(remaining: Optional[int]) -> float:
+        """Redis 남은 만료 시간을 넘지 않는 프로세스 내 TTL"""
+        if remaining is None or remaining < 0:
+            return settings.CACHE_LOCAL_TTL
+        # 0은 TTLCache에서 만료 없음이므로 최소 1초
+        return min(max(remaining, 1), settings.CACHE_LOCAL_TTL)
+
+    @staticmethod
+    def _jittered(ttl: int) -> int:
+        jitter = settings.CACHE_TTL_JITTER
+        if not jitter:
+            return ttl
+        return max(1, int(round(ttl * random.uniform(1 - jitter, 1 + jitter))))
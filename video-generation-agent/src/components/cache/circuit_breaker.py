@@ -0,0 +1,130 @@
+# src/components/cache/circuit_breaker.py
+import threading
+import time
+import structlog
+from typing import Any, Dict, Optional
+
+logger = structlog.get_logger()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """외부 의존성 호출 차단기 (스레드 안전)
+
+    연속 실패가 failure_threshold 이상이면 열려서 호출을 즉시 거부하고,
+    backoff 초 후 한 호출만 시험 삼아 허용합니다. 시험 호출이 실패하면
+    대기 시간을 max_backoff까지 두 배로 늘립니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, backoff: float = 1.0,
+                 max_backoff: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._backoff = backoff
+        self._retry_at = 0.0
+        self._last_error: Optional[str] = None
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (열린 상태에서는 잠금 없이 바로 거부)"""
+        if self._state == CLOSED:
+            return True
+        if self._state == OPEN and time.monotonic() < self._retry_at:
+            self._rejected += 1
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if self._state != CLOSED and now >= self._retry_at:
+                # 시험 호출은 한 번에 하나만 (결과 보고가 없으면 backoff 후 다시 허용)
+                self._state = HALF_OPEN
+                self._retry_at = now + self._backoff
+                return True
+            if self._state == CLOSED:
+                return True
+        self._rejected += 1
+        return False
+
+    def rejecting(self) -> bool:
+        """백오프 중이라 호출을 거부하는 상태인지 (allow와 달리 시험 호출을 소비하지 않음)"""
+        return self._state != CLOSED and time.monotonic() < self._retry_at
+
+    def record_success(self) -> None:
+        if self._state == CLOSED and not self._failures:
+            return
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("circuit_closed", breaker=self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._backoff = self.base_backoff
+
+    def record_failure(self, error: Any = None) -> None:
+        with self._lock:
+            self._last_error = str(error) if error is not None else None
+            self._failures += 1
+            if self._state == CLOSED and self._failures < self.failure_threshold:
+                return
+            self._open()
+
+    def trip(self, error: Any = None) -> None:
+        """임계값과 관계없이 즉시 열기 (연결 자체가 실패한 경우)"""
+        with self._lock:
+            self._last_error = str(error) if error is not None else None
+            self._failures += 1
+            self._open()
+
+    def _open(self) -> None:
+        # 시험 호출이 실패하면 대기 시간을 두 배로 (잠금을 잡은 상태에서 호출)
+        if self._state == HALF_OPEN:
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+        self._state = OPEN
+        self._retry_at = time.monotonic() + self._backoff
+        logger.warning("circuit_open", breaker=self.name, retry_in=self._backoff,
+                       error=self._last_error)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._backoff = self.base_backoff
+            self._retry_at = 0.0
+            self._last_error = None
+            self._rejected = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """상태 패널용 현재 상태"""
+        retry_in = max(0.0, self._retry_at - time.monotonic()) if self._state == OPEN else 0.0
+        return {
+            "name": self.name,
+            "state": self._state,
+            "failures": self._failures,
+            "retry_in": round(retry_in, 1),
+            "rejected": self._rejected,
+            "last_error": self._last_error,
+        }
+
+
+# 이름별 프로세스 공유 차단기
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """이름별 공유 차단기 (최초 호출의 설정으로 생성)"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name, **kwargs))
+    return breaker
@@ -0,0 +1,94 @@
+# src/components/cache/redis_client.py
+import threading
+import redis
+import structlog
+from typing import Any, Dict, Optional
+from config.settings import settings
+from components.cache.circuit_breaker import CircuitBreaker, get_breaker
+
+logger = structlog.get_logger()
+
+# 프로세스 공유 클라이언트 (최초 사용 시 생성)
+_client: Optional[redis.Redis] = None
+_client_lock = threading.Lock()
+# fakeredis 백엔드 저장소 (reset_redis 전까지 유지)
+_fake_server = None
+
+
+def _connection_kwargs() -> Dict[str, Any]:
+    return {
+        "host": settings.REDIS_HOST,
+        "port": settings.REDIS_PORT,
+        "db": settings.REDIS_DB,
+        "password": settings.REDIS_PASSWORD,  # None이면 패스워드 없이 연결
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+        "decode_responses": False,  # 값은 serializer가 바이트로 인코딩
+    }
+
+
+def _get_fake_server():
+    global _fake_server
+    if _fake_server is None:
+        import fakeredis
+        _fake_server = fakeredis.FakeServer()
+    return _fake_server
+
+
+def _create_client() -> redis.Redis:
+    if settings.REDIS_BACKEND == "fake":
+        import fakeredis
+        return fakeredis.FakeRedis(server=_get_fake_server(), decode_responses=False)
+    return redis.Redis(connection_pool=redis.ConnectionPool(**_connection_kwargs()))
+
+
+def get_redis_breaker() -> CircuitBreaker:
+    """Redis 공유 차단기 (CacheManager와 상태 패널이 같은 상태를 봄)"""
+    return get_breaker(
+        "redis",
+        failure_threshold=settings.REDIS_BREAKER_THRESHOLD,
+        backoff=settings.REDIS_BREAKER_BACKOFF,
+        max_backoff=settings.REDIS_BREAKER_MAX_BACKOFF
+    )
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """프로세스 공유 Redis 클라이언트 (연결 풀 사용, 사용할 수 없으면 None)
+
+    최초 호출에서만 연결을 확인하고, 실패하면 차단기가 다시 허용할 때까지
+    (지수 백오프) 연결을 시도하지 않습니다.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    if not settings.REDIS_HOST and settings.REDIS_BACKEND != "fake":
+        return None
+    breaker = get_redis_breaker()
+    if not breaker.allow():
+        return None
+
+    with _client_lock:
+        if _client is None:
+            client = _create_client()
+            try:
+                client.ping()  # 연결 테스트 (프로세스당 한 번)
+            except (redis.RedisError, OSError) as e:
+                client.connection_pool.disconnect()
+                breaker.trip(e)
+                return None
+            breaker.record_success()
+            _client = client
+    return _client
+
+
+def reset_redis() -> None:
+    """공유 클라이언트 초기화 (설정 변경 후 또는 테스트용)"""
+    global _client, _fake_server
+    with _client_lock:
+        if _client is not None:
+            _client.connection_pool.disconnect()
+        _client = None
+        _fake_server = None
+        get_redis_breaker().reset()
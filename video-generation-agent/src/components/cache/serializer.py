@@ -0,0 +1,146 @@
+# src/components/cache/serializer.py
+import json
+import struct
+import zlib
+import structlog
+from typing import Any, Callable, Dict, Optional
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+# 캐시 값 봉투: MAGIC + (스키마 버전, 코덱 ID, 플래그) + 페이로드
+MAGIC = b"VG"
+HEADER = struct.Struct("!BBB")
+HEADER_SIZE = len(MAGIC) + HEADER.size
+# 캐시 값 구조가 바뀌면 올림 (다른 버전의 값은 miss 처리)
+SCHEMA_VERSION = 1
+FLAG_ZLIB = 0x01
+
+
+class Codec:
+    """캐시 페이로드 인코더 (코덱 ID는 봉투에 기록되어 읽을 때 사용)"""
+
+    def __init__(self, name: str, codec_id: int, dumps: Callable[[Any], bytes],
+                 loads: Callable[[bytes], Any]):
+        self.name = name
+        self.codec_id = codec_id
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _json_codec() -> Codec:
+    return Codec(
+        "json", 1,
+        lambda value: json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        lambda data: json.loads(data.decode("utf-8"))
+    )
+
+
+def _orjson_codec() -> Codec:
+    import orjson
+    return Codec("orjson", 2, orjson.dumps, orjson.loads)
+
+
+def _msgpack_codec() -> Codec:
+    import msgpack
+    return Codec(
+        "msgpack", 3,
+        lambda value: msgpack.packb(value, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False)
+    )
+
+
+# 코덱 팩토리 (선택 의존성은 사용 시점에 import)
+_CODEC_FACTORIES: Dict[str, Callable[[], Codec]] = {
+    "json": _json_codec,
+    "orjson": _orjson_codec,
+    "msgpack": _msgpack_codec,
+}
+# auto 선택 시 우선순위
+_AUTO_ORDER = ("msgpack", "orjson", "json")
+_codecs: Dict[str, Optional[Codec]] = {}
+
+
+def get_codec(name: str) -> Optional[Codec]:
+    """이름으로 코덱 조회 (라이브러리가 없으면 None)"""
+    if name not in _codecs:
+        try:
+            _codecs[name] = _CODEC_FACTORIES[name]()
+        except (ImportError, KeyError):
+            _codecs[name] = None
+    return _codecs[name]
+
+
+def _codec_by_id(codec_id: int) -> Optional[Codec]:
+    for name in _CODEC_FACTORIES:
+        codec = get_codec(name)
+        if codec is not None and codec.codec_id == codec_id:
+            return codec
+    return None
+
+
+class CacheSerializer:
+    """버전 봉투 + 선택적 zlib 압축을 적용하는 캐시 직렬화기
+
+    읽을 때는 봉투의 코덱 ID를 따르므로 인코더 설정을 바꿔도 기존 값을 읽을 수 있고,
+    봉투 이전의 JSON 문자열 값도 그대로 읽습니다.
+    """
+
+    def __init__(self, codec: str = "auto", compress_threshold: int = 1024,
+                 compress_level: int = 6):
+        names = _AUTO_ORDER if codec == "auto" else (codec, "json")
+        self.codec = next(c for c in (get_codec(name) for name in names) if c is not None)
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def encode(self, value: Any) -> bytes:
+        payload = self.codec.dumps(value)
+        flags = 0
+        if self.compress_threshold and len(payload) >= self.compress_threshold:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload, flags = compressed, FLAG_ZLIB
+        return MAGIC + HEADER.pack(SCHEMA_VERSION, self.codec.codec_id, flags) + payload
+
+    def decode(self, data: Optional[bytes]) -> Optional[Any]:
+        """값 복원 - 스키마 버전이 다르거나 읽을 수 없으면 None (캐시 miss)"""
+        if not data:
+            return None
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not data.startswith(MAGIC):
+            # 봉투 도입 이전에 저장된 JSON 값
+            try:
+                return json.loads(data)
+            except ValueError:
+                return None
+
+        version, codec_id, flags = HEADER.unpack_from(data, len(MAGIC))
+        if version != SCHEMA_VERSION:
+            return None
+        codec = _codec_by_id(codec_id)
+        if codec is None:
+            logger.warning("cache_codec_unavailable", codec_id=codec_id)
+            return None
+        payload = data[HEADER_SIZE:]
+        try:
+            if flags & FLAG_ZLIB:
+                payload = zlib.decompress(payload)
+            return codec.loads(payload)
+        except Exception as e:
+            logger.warning("cache_decode_failed", codec=codec.name, error=str(e))
+            return None
+
+
+_serializer: Optional[CacheSerializer] = None
+
+
+def get_serializer() -> CacheSerializer:
+    """설정 기반 프로세스 공유 직렬화기"""
+    global _serializer
+    if _serializer is None:
+        _serializer = CacheSerializer(
+            codec=settings.CACHE_SERIALIZER,
+            compress_threshold=settings.CACHE_COMPRESS_THRESHOLD
+        )
+    return _serializer
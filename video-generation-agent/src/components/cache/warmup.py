@@ -0,0 +1,152 @@
+# src/components/cache/warmup.py
+# 히스토리 기반 캐시 워밍 - 자주 쓰인 입력의 프롬프트와 영상 미리보기를 미리 계산
+# 사용 예 (src 디렉토리에서, 배포 직후 한 번 실행):
+#   python -m components.cache.warmup --limit 500
+import argparse
+import asyncio
+import sys
+import threading
+import time
+import structlog
+from pathlib import Path
+from typing import Dict, List, Optional
+from config.settings import settings
+from components.cache.cache_manager import CacheManager
+from components.history.history_manager import HistoryManager
+from components.prompt_generator.generator import PreparedInput, PromptGenerator
+from components.video_generator.generator import VideoGenerator
+
+logger = structlog.get_logger()
+
+# 앱 기본 영상 설정 (main.py 슬라이더/체크박스 기본값과 같아야 미리보기가 적중)
+PREVIEW_DURATION = 10
+PREVIEW_LOOP = False
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+
+class RateLimiter:
+    """초당 처리량 제한 (rate가 0 이하면 제한 없음)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+
+    def acquire(self, count: int = 1) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(self._next, now) + self.interval * count
+
+
+class CacheWarmer:
+    """히스토리의 인기 입력으로 프롬프트/영상 캐시를 채움"""
+
+    def __init__(self, cache: Optional[CacheManager] = None,
+                 history: Optional[HistoryManager] = None,
+                 prompt_generator: Optional[PromptGenerator] = None,
+                 video_generator: Optional[VideoGenerator] = None,
+                 rate: Optional[float] = None, chunk_size: int = 50):
+        self.cache = cache or CacheManager()
+        self.history = history or HistoryManager()
+        self.prompt_generator = prompt_generator or PromptGenerator()
+        self.video_generator = video_generator or VideoGenerator()
+        self.limiter = RateLimiter(settings.CACHE_WARMUP_RATE if rate is None else rate)
+        self.chunk_size = chunk_size
+
+    def warm_prompts(self, limit: int) -> int:
+        """인기 입력의 프롬프트 결과를 일괄 생성해 캐시에 저장 - 새로 저장한 건수 반환"""
+        inputs: Dict[str, PreparedInput] = {}
+        popular = [text for text, _ in self.history.get_popular_inputs(limit=limit)]
+        for prepared in self.prompt_generator.prepare_batch(popular):
+            # 정규화 후 같은 키가 되는 입력은 한 번만 (키를 만든 스냅샷으로 생성)
+            inputs.setdefault(prepared.cache_key, prepared)
+
+        keys = list(inputs)
+        warmed = 0
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start:start + self.chunk_size]
+            cached = self.cache.get_many(chunk)
+            missing = [key for key in chunk if key not in cached]
+            if not missing:
+                continue
+            self.limiter.acquire(len(missing))
+            results = self.prompt_generator.generate_batch([inputs[key] for key in missing])
+            self.cache.set_many(dict(zip(missing, results)))
+            warmed += len(missing)
+        return warmed
+
+    def warm_videos(self, limit: int) -> int:
+        """자주 쓰인 최종 프롬프트의 기본 설정 영상을 미리 렌더링 - 렌더링한 건수 반환"""
+        rendered = 0
+        for prompt, _ in self.history.get_popular_inputs(limit=limit, field="edited_prompt"):
+            key = self.video_generator.cache_key(prompt, PREVIEW_DURATION, PREVIEW_LOOP)
+            cached = self.cache.get(key)
+            if cached and (Path(settings.DATA_DIR) / cached["video_url"]).exists():
+                continue
+            self.limiter.acquire()
+            result = asyncio.run(self.video_generator.generate(
+                prompt, duration=PREVIEW_DURATION, loop=PREVIEW_LOOP
+            ))
+            if result.get("success"):
+                self.cache.set(key, result)
+                rendered += 1
+        return rendered
+
+    def run(self, prompt_limit: Optional[int] = None,
+            video_limit: Optional[int] = None) -> Dict[str, float]:
+        started = time.perf_counter()
+        prompts = self.warm_prompts(settings.CACHE_WARMUP_LIMIT if prompt_limit is None else prompt_limit)
+        videos = self.warm_videos(settings.CACHE_WARMUP_VIDEO_LIMIT if video_limit is None else video_limit)
+        report = {"prompts": prompts, "videos": videos,
+                  "seconds": round(time.perf_counter() - started, 2)}
+        logger.info("cache_warmup_complete", **report)
+        return report
+
+
+def _warmup_loop(interval: float) -> None:
+    while True:
+        try:
+            CacheWarmer().run()
+        except Exception as e:
+            logger.error("cache_warmup_failed", error=str(e))
+        if interval <= 0:
+            return
+        time.sleep(interval)
+
+
+def start_background_warmup() -> bool:
+    """프로세스당 한 번 백그라운드 워밍 시작 (CACHE_WARMUP_INTERVAL 초마다 반복, 0이면 한 번)"""
+    global _warmup_thread
+    if not settings.CACHE_WARMUP_ENABLED:
+        return False
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return False
+        _warmup_thread = threading.Thread(
+            target=_warmup_loop, args=(settings.CACHE_WARMUP_INTERVAL,),
+            name="cache-warmup", daemon=True
+        )
+        _warmup_thread.start()
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="히스토리 기반 캐시 워밍")
+    parser.add_argument("--limit", type=int, default=settings.CACHE_WARMUP_LIMIT,
+                        help="워밍할 인기 입력 수")
+    parser.add_argument("--videos", type=int, default=settings.CACHE_WARMUP_VIDEO_LIMIT,
+                        help="미리 렌더링할 영상 수")
+    parser.add_argument("--rate", type=float, default=settings.CACHE_WARMUP_RATE,
+                        help="초당 최대 생성 건수 (0이면 제한 없음)")
+    args = parser.parse_args(argv)
+
+    CacheWarmer(rate=args.rate).run(prompt_limit=args.limit, video_limit=args.videos)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# src/components/history/delta.py
+# 히스토리 델타 저장 형식 - 원본 프롬프트(base)는 한 번만 저장하고 리비전마다 편집 델타만 기록
+#
+# 저장 항목 (FORMAT_VERSION 2):
+#   {"v": 2, "session_id", "input", "category", "timestamp",
+#    "base_id": 원본 해시, "delta": [...], "diff": {"summary": {...}}}
+# delta는 원본 토큰(공백/비공백 덩어리) 기준 연산 목록입니다.
+#   양수 n -> 원본 토큰 n개 복사, 음수 -n -> 원본 토큰 n개 건너뜀, 문자열 -> 그대로 삽입
+# diff는 요약(summary)만 저장하고, 변경 목록(changes/hunks)은 detail="full"로 읽을 때만 다시 계산합니다.
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+from components.prompt_editor.diff_engine import diff_opcodes, diff_text
+from components.prompt_editor.editor import summarize_changes
+
+FORMAT_VERSION = 2
+_TOKEN_RE = re.compile(r"\s+|\S+")
+
+Delta = List[Union[int, str]]
+
+
+def base_id(text: str) -> str:
+    """원본 프롬프트 식별자 (내용 해시)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def encode_delta(base: str, target: str) -> Delta:
+    """base를 target으로 바꾸는 연산 목록 (같으면 빈 목록)"""
+    if base == target:
+        return []
+    source = _TOKEN_RE.findall(base)
+    dest = _TOKEN_RE.findall(target)
+    delta: Delta = []
+
+    def emit(op: Union[int, str]) -> None:
+        # 같은 종류의 연속 연산은 합침
+        if delta and type(delta[-1]) is type(op) and (isinstance(op, str) or (delta[-1] > 0) == (op > 0)):
+            delta[-1] += op
+        else:
+            delta.append(op)
+
+    position = 0
+    for _, i1, i2, j1, j2 in diff_opcodes(source, dest):
+        if i1 > position:
+            emit(i1 - position)
+        position = i2
+        if i2 > i1:
+            emit(-(i2 - i1))
+        if j2 > j1:
+            emit("".join(dest[j1:j2]))
+    # 끝부분 복사는 생략 (남은 원본 토큰은 적용 시 그대로 이어 붙임)
+    if delta and isinstance(delta[-1], int) and delta[-1] > 0:
+        delta.pop()
+    return delta
+
+
+def apply_delta(base: str, delta: Delta) -> str:
+    """encode_delta의 역연산"""
+    if not delta:
+        return base
+    source = _TOKEN_RE.findall(base)
+    parts: List[str] = []
+    position = 0
+    for op in delta:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.extend(source[position:position + op])
+            position += op
+        else:
+            position -= op
+    parts.extend(source[position:])
+    return "".join(parts)
+
+
+def is_packed(doc: Dict) -> bool:
+    return doc.get("v") == FORMAT_VERSION
+
+
+def pack_entry(entry: Dict) -> Tuple[Dict, Optional[str]]:
+    """전체 항목 -> (델타 항목, 원본 프롬프트) - 원본이 없는 항목은 그대로"""
+    original = entry.get("original_prompt")
+    if not isinstance(original, str):
+        return dict(entry), None
+    edited = entry.get("edited_prompt", original)
+    packed: Dict[str, Any] = {
+        key: value for key, value in entry.items()
+        if key not in ("_id", "original_prompt", "edited_prompt", "diff")
+    }
+    packed.update({
+        "v": FORMAT_VERSION,
+        "base_id": base_id(original),
+        "delta": encode_delta(original, edited),
+    })
+    summary = (entry.get("diff") or {}).get("summary")
+    if summary is not None:
+        packed["diff"] = {"summary": dict(summary)}
+    return packed, original
+
+
+def unpack_entry(doc: Dict, base: Optional[str], detail: str = "summary") -> Dict:
+    """델타 항목 -> 전체 항목
+
+    detail: none(프롬프트만) | summary(저장된 diff 요약) | full(diff 변경 목록까지 다시 계산)
+    """
+    if not is_packed(doc):
+        return doc
+    entry = {key: value for key, value in doc.items() if key not in ("v", "base_id", "delta")}
+    if base is None:
+        # 원본을 찾을 수 없는 경우 (보관 정책 등으로 삭제)
+        entry["original_prompt"] = entry["edited_prompt"] = ""
+        return entry
+    edited = apply_delta(base, doc.get("delta") or [])
+    entry["original_prompt"] = base
+    entry["edited_prompt"] = edited
+    if detail == "full" and "diff" in doc:
+        # 변경 목록은 요청할 때만 계산 (summary 조회는 저장된 요약 그대로)
+        changes, hunks = diff_text(base, edited)
+        summary = doc["diff"].get("summary") or {}
+        if "added_words" not in summary:
+            # 요약 일부만 저장하던 이전 항목
+            summary = summarize_changes(changes, base, edited)
+        entry["diff"] = {
+            "timestamp": doc.get("timestamp"),
+            "original": base,
+            "modified": edited,
+            "mode": "word",
+            "changes": changes,
+            "hunks": hunks,
+            "summary": summary
+        }
+    return entry
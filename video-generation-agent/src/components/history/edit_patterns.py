@@ -0,0 +1,227 @@
+# src/components/history/edit_patterns.py
+# 편집 패턴 집계 - 카테고리별로 사용자가 추가/삭제한 단어의 빈발 항목을 고정 크기 Space-Saving 표로 유지
+# 히스토리 저장(지연 쓰기 배치)마다 갱신되고, 프롬프트 생성기는 사용자가 남기는 품질 문구를 우선 선택
+#
+# 스냅샷 (EDIT_PATTERN_PATH, 저장 주기마다 덮어씀):
+#   {"version": 1, "edits": {카테고리: 편집 수}, "sketches": {"카테고리/added": {...}, "카테고리/removed": {...}}}
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import structlog
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from config.settings import settings
+from components.lexicon.lexicon import get_lexicon
+from utils.space_saving import SpaceSaving
+from utils.ttl_cache import TTLCache
+
+logger = structlog.get_logger()
+
+SNAPSHOT_VERSION = 1
+KINDS = ("added", "removed")
+_NON_WORD = re.compile(r"[\W_]+")
+# 점수 평활화 (관측이 적은 단어는 0에 가깝게)
+_PRIOR = 5
+
+
+def normalize_term(term: str) -> str:
+    """집계용 단어 정규화 (소문자, 문장부호 제거 - "4K," -> "4k")"""
+    return _NON_WORD.sub("", term.lower())
+
+
+def _terms(changes: Iterable[Dict], kind: str) -> Set[str]:
+    terms = set()
+    for change in changes:
+        if change.get("type") == kind:
+            # char 모드 변경은 여러 단어일 수 있음
+            terms.update(normalize_term(word) for word in str(change.get("content", "")).split())
+    terms.discard("")
+    return terms
+
+
+class EditPatternAggregator:
+    """카테고리별 추가/삭제 단어 빈발 항목 (카테고리 x 2개 표, 표마다 capacity개로 메모리 고정)"""
+
+    def __init__(self, path: Optional[Path] = None, capacity: Optional[int] = None,
+                 save_interval: Optional[float] = None):
+        self.path = Path(path) if path else None
+        self.capacity = capacity or settings.EDIT_PATTERN_CAPACITY
+        self.save_interval = settings.EDIT_PATTERN_SAVE_INTERVAL if save_interval is None else save_interval
+        self._sketches: Dict[Tuple[str, str], SpaceSaving] = {}
+        self._edits: Dict[str, int] = {}
+        # 세션별로 이미 집계한 (추가, 삭제) 단어 - 연속 편집이 같은 단어를 반복 집계하지 않도록
+        self._sessions = TTLCache(settings.EDIT_PATTERN_SESSIONS, settings.EDIT_PATTERN_SESSION_TTL)
+        # (카테고리, 후보) -> (버전, 우선 후보) - 프롬프트 생성마다 다시 계산하지 않도록 잠시 보관
+        self._preferred = TTLCache(256, settings.EDIT_PATTERN_REFRESH)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._load()
+
+    def _category(self, category: Optional[str]) -> str:
+        # 사전에 없는 카테고리(error 등)는 general로 모아 표 개수 고정
+        return category if category in get_lexicon().templates else "general"
+
+    def _sketch(self, category: str, kind: str) -> SpaceSaving:
+        key = (category, kind)
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            with self._lock:
+                sketch = self._sketches.setdefault(key, SpaceSaving(self.capacity))
+        return sketch
+
+    def observe(self, entry: Dict) -> None:
+        """히스토리 항목 하나의 추가/삭제 단어 집계"""
+        changes = (entry.get("diff") or {}).get("changes")
+        if not changes:
+            return
+        added = _terms(changes, "added")
+        removed = _terms(changes, "removed")
+        # 같은 세션의 연속 편집(원본 대비 누적 diff)은 직전 집계 이후 새로 생긴 단어만 반영
+        session_id = entry.get("session_id")
+        if session_id:
+            key = (session_id, entry.get("original_prompt"))
+            previous = self._sessions.get(key)
+            self._sessions.set(key, (added, removed))
+            if previous is not None:
+                added = added - previous[0]
+                removed = removed - previous[1]
+        if not added and not removed:
+            return
+
+        category = self._category(entry.get("category"))
+        for kind, terms in (("added", added), ("removed", removed)):
+            if terms:
+                sketch = self._sketch(category, kind)
+                for term in terms:
+                    sketch.add(term)
+        with self._lock:
+            self._edits[category] = self._edits.get(category, 0) + 1
+            self._dirty = True
+
+    def observe_many(self, entries: Iterable[Dict]) -> None:
+        for entry in entries:
+            self.observe(entry)
+        if self._dirty and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def term_counts(self, category: str, term: str) -> Tuple[int, int]:
+        """단어의 (추가 횟수, 삭제 횟수) 추정값"""
+        term = normalize_term(term)
+        counts = []
+        for kind in KINDS:
+            sketch = self._sketches.get((self._category(category), kind))
+            counts.append(sketch.count(term) if sketch else 0)
+        return counts[0], counts[1]
+
+    def keep_score(self, category: str, phrase: str) -> float:
+        """문구를 사용자가 남기는 정도 (-1 ~ 1, 추가가 많으면 양수, 삭제가 많으면 음수, 관측 없으면 0)"""
+        scores = []
+        for word in phrase.split():
+            added, removed = self.term_counts(category, word)
+            scores.append((added - removed) / (added + removed + _PRIOR))
+        return sum(scores) / len(scores) if scores else 0.0
+
+    def preference(self, category: str, candidates: Sequence[str]) -> Tuple[str, Tuple[str, ...]]:
+        """카테고리의 (버전, 우선 후보) - 버전은 프롬프트 캐시 키에, 후보는 품질 문구 선택에 함께 사용
+
+        점수가 양수인 문구만, 없으면 삭제되지 않는(0 이상) 문구만, 모두 음수면 가장 덜 삭제된 문구 하나.
+        후보는 점수 순서가 아니라 정렬된 집합이라 동점이나 순위만 바뀌면 버전과 선택이 그대로이고,
+        다른 카테고리의 변화는 영향을 주지 않습니다. 결과는 EDIT_PATTERN_REFRESH 초 동안 재사용합니다.
+        """
+        category = self._category(category)
+        key = (category, tuple(candidates))
+        cached = self._preferred.get(key)
+        if cached is None:
+            preferred = tuple(sorted(self._select_enhancers(category, candidates)))
+            version = hashlib.sha256("\n".join(preferred).encode("utf-8")).hexdigest()[:12]
+            cached = (version, preferred)
+            self._preferred.set(key, cached)
+        return cached
+
+    def _select_enhancers(self, category: str, candidates: Sequence[str]) -> Set[str]:
+        scored = [(self.keep_score(category, candidate), candidate) for candidate in candidates]
+        preferred = {candidate for score, candidate in scored if score > 0}
+        preferred = preferred or {candidate for score, candidate in scored if score >= 0}
+        return preferred or {max(scored)[1]}
+
+    def top_terms(self, category: str, kind: str = "added", limit: int = 20) -> List[Dict]:
+        """카테고리별 가장 많이 추가/삭제된 단어 (count는 추정값, error는 최대 과대 추정)"""
+        sketch = self._sketches.get((self._category(category), kind))
+        if sketch is None:
+            return []
+        return [{"term": term, "count": count, "error": error} for term, count, error in sketch.top(limit)]
+
+    def stats(self) -> Dict[str, Dict]:
+        """카테고리별 편집 수와 상위 추가/삭제 단어"""
+        with self._lock:
+            edits = dict(self._edits)
+        return {
+            category: {
+                "edits": count,
+                "added": self.top_terms(category, "added", 10),
+                "removed": self.top_terms(category, "removed", 10)
+            }
+            for category, count in edits.items()
+        }
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            sketches = dict(self._sketches)
+            edits = dict(self._edits)
+        return {
+            "version": SNAPSHOT_VERSION,
+            "edits": edits,
+            "sketches": {f"{category}/{kind}": sketch.to_dict() for (category, kind), sketch in sketches.items()}
+        }
+
+    def save(self) -> None:
+        """스냅샷 저장 (임시 파일에 쓴 뒤 교체)"""
+        self._last_save = time.monotonic()
+        if self.path is None:
+            return
+        with self._lock:
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("edit_patterns_save_failed", error=str(e))
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("edit_patterns_load_failed", error=str(e))
+            return
+        if data.get("version") != SNAPSHOT_VERSION:
+            return
+        self._edits = dict(data.get("edits", {}))
+        for name, sketch in data.get("sketches", {}).items():
+            category, _, kind = name.rpartition("/")
+            self._sketches[(category, kind)] = SpaceSaving.from_dict(sketch, capacity=self.capacity)
+
+
+_aggregator: Optional[EditPatternAggregator] = None
+_aggregator_lock = threading.Lock()
+
+
+def get_edit_patterns() -> EditPatternAggregator:
+    """프로세스 공유 편집 패턴 집계기 (종료 시 스냅샷 저장)"""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                _aggregator = EditPatternAggregator(Path(settings.EDIT_PATTERN_PATH))
+                atexit.register(_aggregator.save)
+    return _aggregator
@@ -0,0 +1,244 @@
+# src/components/history/exporter.py
+# 히스토리 분석용 열 기반(Parquet/Arrow) 내보내기 - 배치 단위로 읽고 써서 메모리 사용량 고정,
+# 마지막으로 내보낸 timestamp 이후 항목만 추가로 내보냄
+#
+# 출력 구조 (날짜별 파티션):
+#   <out>/date=2024-05-01/part-<실행 ID>-0000.parquet
+#   <out>/_export_state.json   - {"last_timestamp", "rows", "runs"}
+# 사용 예 (src 디렉토리에서):
+#   python -m components.history.exporter --format parquet
+import argparse
+import json
+import os
+import sys
+import time
+import structlog
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from config.settings import settings
+from components.history.history_manager import HistoryManager
+
+logger = structlog.get_logger()
+
+STATE_FILE = "_export_state.json"
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+# diff.summary에서 펼쳐 넣는 열
+SUMMARY_COLUMNS = ("total_changes", "added_words", "removed_words", "word_count_diff", "improved")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("히스토리 내보내기에는 pyarrow가 필요합니다 (pip install pyarrow)") from e
+    return pyarrow
+
+
+def history_schema():
+    pa = _require_pyarrow()
+    return pa.schema([
+        ("timestamp", pa.timestamp("us")),
+        ("session_id", pa.string()),
+        ("input", pa.string()),
+        ("category", pa.string()),
+        ("original_prompt", pa.string()),
+        ("edited_prompt", pa.string()),
+        ("total_changes", pa.int32()),
+        ("added_words", pa.int32()),
+        ("removed_words", pa.int32()),
+        ("word_count_diff", pa.int32()),
+        ("improved", pa.bool_()),
+        ("change_types", pa.list_(pa.string())),
+        # 실제로 추가/삭제된 단어 (편집 패턴 분석용)
+        ("added_terms", pa.list_(pa.string())),
+        ("removed_terms", pa.list_(pa.string())),
+    ])
+
+
+def flatten_entry(entry: Dict) -> Dict[str, Any]:
+    """히스토리 항목 -> 한 행 (diff 요약 필드를 열로 펼침)"""
+    diff = entry.get("diff") or {}
+    summary = diff.get("summary") or {}
+    changes = diff.get("changes") or []
+    timestamp = entry.get("timestamp")
+    row = {
+        "timestamp": datetime.fromisoformat(timestamp) if timestamp else None,
+        "session_id": entry.get("session_id"),
+        "input": entry.get("input"),
+        "category": entry.get("category"),
+        "original_prompt": entry.get("original_prompt"),
+        "edited_prompt": entry.get("edited_prompt"),
+        "change_types": summary.get("change_types"),
+        "added_terms": [c.get("content") for c in changes if c.get("type") == "added"],
+        "removed_terms": [c.get("content") for c in changes if c.get("type") == "removed"],
+    }
+    for column in SUMMARY_COLUMNS:
+        row[column] = summary.get(column)
+    return row
+
+
+class _PartitionWriter:
+    """파티션 하나의 파일 작성기 (rows_per_file을 넘으면 다음 파일로)"""
+
+    def __init__(self, directory: Path, run_id: str, fmt: str, schema, rows_per_file: int):
+        self.directory = directory
+        self.run_id = run_id
+        self.fmt = fmt
+        self.schema = schema
+        self.rows_per_file = rows_per_file
+        self.files: List[Path] = []
+        self._writer = None
+        self._rows = 0
+
+    def write(self, table) -> None:
+        offset = 0
+        while offset < table.num_rows:
+            if self._writer is None or self._rows >= self.rows_per_file:
+                self._open_next()
+            length = min(table.num_rows - offset, self.rows_per_file - self._rows)
+            self._writer.write_table(table.slice(offset, length))
+            self._rows += length
+            offset += length
+
+    def _open_next(self) -> None:
+        pa = _require_pyarrow()
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # 완료 전까지는 .tmp 이름 (중단된 실행의 파일이 결과에 섞이지 않도록)
+        path = self.directory / f"part-{self.run_id}-{len(self.files):04d}{FORMATS[self.fmt]}.tmp"
+        if self.fmt == "parquet":
+            self._writer = pa.parquet.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(str(path), self.schema)
+        self.files.append(path)
+        self._rows = 0
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class HistoryExporter:
+    """히스토리를 날짜별 파티션 Parquet/Arrow 파일로 증분 내보내기"""
+
+    def __init__(self, output_dir: Optional[Path] = None, history: Optional[HistoryManager] = None,
+                 fmt: Optional[str] = None, batch_size: Optional[int] = None,
+                 rows_per_file: Optional[int] = None):
+        self.output_dir = Path(output_dir or settings.HISTORY_EXPORT_DIR)
+        self.history = history or HistoryManager()
+        self.fmt = fmt or settings.HISTORY_EXPORT_FORMAT
+        if self.fmt not in FORMATS:
+            raise ValueError(f"format must be one of {tuple(FORMATS)}")
+        self.batch_size = batch_size or settings.HISTORY_EXPORT_BATCH_SIZE
+        self.rows_per_file = rows_per_file or settings.HISTORY_EXPORT_ROWS_PER_FILE
+
+    @property
+    def state_path(self) -> Path:
+        return self.output_dir / STATE_FILE
+
+    def load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"last_timestamp": None, "rows": 0, "runs": 0}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp = self.state_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def _batches(self, entries: Iterable[Dict]) -> Iterable[List[Dict]]:
+        batch = []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def export(self, full: bool = False) -> Dict[str, Any]:
+        """마지막 내보내기 이후 항목을 내보내고 결과 요약 반환 (full이면 처음부터)"""
+        pa = _require_pyarrow()
+        schema = history_schema()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # 이전에 중단된 실행이 남긴 임시 파일 정리
+        for tmp in self.output_dir.glob("date=*/*.tmp"):
+            tmp.unlink()
+
+        state = {"last_timestamp": None, "rows": 0, "runs": 0} if full else self.load_state()
+        since = state.get("last_timestamp")
+        run_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        started = time.perf_counter()
+        # 저장 대기 중인 항목까지 포함
+        self.history.flush()
+
+        writers: Dict[str, _PartitionWriter] = {}
+        rows = 0
+        last_timestamp = since
+        try:
+            for batch in self._batches(self.history.iter_history(detail="full", since=since)):
+                partitions: Dict[str, List[Dict]] = {}
+                for entry in batch:
+                    row = flatten_entry(entry)
+                    if row["timestamp"] is None:
+                        continue
+                    partitions.setdefault(row["timestamp"].date().isoformat(), []).append(row)
+                    last_timestamp = max(last_timestamp or "", entry["timestamp"])
+                for date, partition_rows in partitions.items():
+                    writer = writers.get(date)
+                    if writer is None:
+                        writer = writers[date] = _PartitionWriter(
+                            self.output_dir / f"date={date}", run_id, self.fmt, schema, self.rows_per_file
+                        )
+                    writer.write(pa.Table.from_pylist(partition_rows, schema=schema))
+                    rows += len(partition_rows)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        # 모든 파일을 완성한 뒤에 공개하고 상태 기록 (중간에 실패하면 다음 실행에서 다시 내보냄)
+        previous = [path for path in self.output_dir.glob("date=*/part-*")
+                    if not path.name.startswith(f"part-{run_id}-")] if full else []
+        files = []
+        for writer in writers.values():
+            for path in writer.files:
+                final = path.with_suffix("")
+                os.replace(path, final)
+                files.append(str(final.relative_to(self.output_dir)))
+        for path in previous:
+            path.unlink()
+        if rows or full:
+            self._save_state({
+                "last_timestamp": last_timestamp,
+                "rows": state.get("rows", 0) + rows,
+                "runs": state.get("runs", 0) + 1,
+                "format": self.fmt,
+            })
+        report = {"rows": rows, "files": files, "since": since, "last_timestamp": last_timestamp,
+                  "seconds": round(time.perf_counter() - started, 2)}
+        logger.info("history_export_complete", rows=rows, files=len(files), since=since)
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="히스토리 Parquet/Arrow 내보내기")
+    parser.add_argument("--out", default=settings.HISTORY_EXPORT_DIR, help="출력 디렉토리")
+    parser.add_argument("--format", choices=tuple(FORMATS), default=settings.HISTORY_EXPORT_FORMAT)
+    parser.add_argument("--batch-size", type=int, default=settings.HISTORY_EXPORT_BATCH_SIZE)
+    parser.add_argument("--full", action="store_true", help="상태를 무시하고 처음부터 내보내기")
+    args = parser.parse_args(argv)
+
+    report = HistoryExporter(Path(args.out), fmt=args.format, batch_size=args.batch_size).export(full=args.full)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,74 +1,625 @@
 # src/components/history/history_manager.py
+import asyncio
+import itertools
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
-from pymongo import MongoClient
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Set, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import BulkWriteError
 from config.settings import settings
+from utils.ttl_cache import TTLCache
+from components.history.edit_patterns import get_edit_patterns
+from components.history.delta import apply_delta, is_packed, pack_entry, unpack_entry
+from components.history.log_store import get_log_store
+from components.history.mongo_client import GuardedCollection, get_collection
+from components.history.similarity_index import get_similarity_index
+from components.history.write_behind import WriteBehindBuffer
 from pathlib import Path
 
+# 히스토리 조회에 필요한 인덱스 (이름, 키) - 최근순 페이지, 입력별/카테고리별 조회
+HISTORY_INDEXES: List[Tuple[str, List[Tuple[str, int]]]] = [
+    ("timestamp_desc", [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ("input_timestamp", [("input", ASCENDING), ("timestamp", DESCENDING)]),
+    ("category_timestamp", [("category", ASCENDING), ("timestamp", DESCENDING)]),
+]
+
+# 사이드바 목록용 필드 (diff는 요약만, 변경 목록 전체는 제외)
+SUMMARY_PROJECTION = {
+    "session_id": 1,
+    "input": 1,
+    "original_prompt": 1,
+    "edited_prompt": 1,
+    "category": 1,
+    "timestamp": 1,
+    "diff.summary": 1,
+    # 델타 저장 항목 복원용
+    "v": 1,
+    "base_id": 1,
+    "delta": 1,
+}
+
+# 조회 시 한 번에 원본을 찾아 복원하는 항목 수
+_UNPACK_BATCH = 1000
+DUPLICATE_KEY = 11000
+
+
 class HistoryManager:
+    # 인덱스 확인을 마친 컬렉션 (Streamlit 재실행마다 반복하지 않도록 프로세스 공유)
+    _indexed_collections = set()
+    _migrate_lock = threading.Lock()
+    # 지연 쓰기 버퍼 (프로세스 공유, 최초 생성한 인스턴스의 저장소로 기록)
+    _writer: Optional[WriteBehindBuffer] = None
+    _writer_lock = threading.Lock()
+    # 원본 프롬프트 (base_id -> 원문), MongoDB에 저장된 것으로 확인된 base_id
+    _base_cache = TTLCache(maxsize=4096)
+    _mongo_bases = TTLCache(maxsize=16384)
+    # 로컬 원본 저장소 전체 (최초 조회 시 한 번 로드)
+    _local_bases: Optional[Dict[str, str]] = None
+    _local_bases_lock = threading.Lock()
+    # 항목 저장과 참조 없는 원본 정리를 직렬화 (정리 중 새 항목이 참조하는 원본을 지우지 않도록)
+    _base_gc_lock = threading.Lock()
+
     def __init__(self):
         self.history_dir = Path(settings.DATA_DIR) / "history"
         self.history_dir.mkdir(exist_ok=True, parents=True)
         
-        # MongoDB 연결 설정
-        if settings.MONGODB_URL:
-            self.client = MongoClient(settings.MONGODB_URL)
-            self.db = self.client[settings.MONGODB_DB]
-            self.collection = self.db["prompt_history"]
-        else:
-            self.collection = None
+        # 로컬 저장소 (추가 전용 세그먼트 로그, 프로세스 공유)
+        self.local_store = get_log_store(self.history_dir / "log")
+        # 원본은 개수로 자르지 않음 (참조하는 항목이 남아 있을 수 있음 - 정리는 rollup_history)
+        self.base_store = get_log_store(self.history_dir / "bases", max_records=0)
+        self._migrate_legacy_files()
+        
+        # MongoDB 인덱스 확인 (연결 가능한 경우 프로세스당 한 번)
+        if settings.MONGODB_ENSURE_INDEXES and self.collection is not None:
+            self.ensure_indexes()
+        
+        # 전체 히스토리 유사 입력 인덱스 (프로세스 공유)
+        self.similarity_index = get_similarity_index()
+        
+        self.writer = self._get_writer() if settings.HISTORY_WRITE_BEHIND else None
+
+    @property
+    def collection(self) -> Optional[GuardedCollection]:
+        """히스토리 컬렉션 (연결되지 않았거나 장애로 차단 중이면 None - 로컬 저장소 사용)"""
+        return get_collection("prompt_history")
+
+    @property
+    def bases(self) -> Optional[GuardedCollection]:
+        """델타 저장 항목의 원본 프롬프트 컬렉션"""
+        return get_collection("prompt_bases")
+
+    def _get_writer(self) -> WriteBehindBuffer:
+        cls = type(self)
+        if cls._writer is None:
+            with cls._writer_lock:
+                if cls._writer is None:
+                    cls._writer = WriteBehindBuffer(
+                        self._write_batch,
+                        batch_size=settings.HISTORY_FLUSH_SIZE,
+                        interval=settings.HISTORY_FLUSH_INTERVAL,
+                        max_pending=settings.HISTORY_MAX_PENDING,
+                        enqueue_timeout=settings.HISTORY_ENQUEUE_TIMEOUT
+                    )
+        return cls._writer
 
     def save_history(self, entry: Dict) -> None:
-        """히스토리 항목 저장"""
+        """히스토리 항목 저장 (지연 쓰기 사용 시 같은 세션의 대기 중인 항목은 최신 편집으로 교체)"""
         entry['timestamp'] = datetime.now().isoformat()
+        if self.writer is not None:
+            # 같은 세션에서 같은 원본 프롬프트를 연속 편집한 경우만 병합
+            session_id = entry.get('session_id')
+            key = (session_id, entry.get('original_prompt')) if session_id else None
+            self.writer.submit(entry, key=key)
+        else:
+            self._write_batch([entry])
+
+    def flush(self) -> int:
+        """대기 중인 히스토리를 즉시 저장"""
+        return self.writer.flush() if self.writer is not None else 0
+
+    def _write_batch(self, entries: List[Dict]) -> None:
+        """항목 일괄 저장 (MongoDB 실패분은 로컬 백업)"""
+        # 델타 형식으로 변환 (insert_many가 _id를 추가하므로 항상 사본)
+        if settings.HISTORY_DELTA_ENCODING:
+            packed = [pack_entry(entry) for entry in entries]
+        else:
+            packed = [(dict(entry), None) for entry in entries]
+        docs = [doc for doc, _ in packed]
+        bases = {doc["base_id"]: base for doc, base in packed if base is not None}
+        with self._base_gc_lock:
+            self._store_docs(docs, bases)
         
-        # MongoDB 저장
+        # 유사도 인덱스 증분 갱신
+        try:
+            self.similarity_index.add_many(entries)
+        except Exception as e:
+            print(f"유사도 인덱스 갱신 실패: {e}")
+        
+        # 카테고리별 편집 패턴 집계 (프롬프트 생성기의 품질 문구 선택에 사용)
+        if settings.EDIT_PATTERNS_ENABLED:
+            try:
+                get_edit_patterns().observe_many(entries)
+            except Exception as e:
+                print(f"편집 패턴 집계 실패: {e}")
+
+    def _store_docs(self, docs: List[Dict], bases: Dict[str, str]) -> None:
+        failed = docs
         if self.collection is not None:
             try:
-                self.collection.insert_one(entry)
+                # 원본을 먼저 저장해야 항목을 읽을 수 있음
+                self._store_mongo_bases(bases)
+                self.collection.insert_many(docs, ordered=False)
+                failed = []
+            except BulkWriteError as e:
+                failed_indexes = {error["index"] for error in e.details.get("writeErrors", [])}
+                failed = [doc for i, doc in enumerate(docs) if i in failed_indexes]
+                print(f"MongoDB 저장 일부 실패: {len(failed)}건, 로컬에 백업 저장")
             except Exception as e:
                 print(f"MongoDB 저장 실패: {e}, 로컬에 백업 저장")
-                self._save_to_local(entry)
-        else:
-            self._save_to_local(entry)
+        if failed:
+            self._store_local_bases({doc["base_id"]: bases[doc["base_id"]]
+                                     for doc in failed if doc.get("base_id") in bases})
+        for doc in failed:
+            self._save_to_local(doc)
 
     def _save_to_local(self, entry: Dict) -> None:
-        """로컬 파일 시스템에 저장"""
-        filename = f"history_{datetime.now().strftime('%Y%m%d%H%M%S')}.json"
-        filepath = self.history_dir / filename
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(entry, f, ensure_ascii=False)
-
-    def get_recent_history(self, limit: int = 5) -> List[Dict]:
-        """최근 히스토리 조회"""
+        """로컬 세그먼트 로그에 추가"""
+        # insert_one 실패 시 entry에 남은 _id는 제외
+        self.local_store.append({key: value for key, value in entry.items() if key != "_id"})
+
+    def _store_mongo_bases(self, bases: Dict[str, str]) -> None:
+        """아직 저장되지 않은 원본 프롬프트 저장 (이미 있는 원본의 중복 키 오류는 무시)"""
+        new = {bid: text for bid, text in bases.items() if bid not in self._mongo_bases}
+        if not new:
+            return
+        now = datetime.now().isoformat()
+        try:
+            self.bases.insert_many([{"_id": bid, "text": text, "created": now} for bid, text in new.items()],
+                                   ordered=False)
+        except BulkWriteError as e:
+            if any(error.get("code") != DUPLICATE_KEY for error in e.details.get("writeErrors", [])):
+                raise
+        for bid, text in new.items():
+            self._mongo_bases.set(bid, True)
+            self._base_cache.set(bid, text)
+
+    def _load_local_bases(self) -> Dict[str, str]:
+        cls = type(self)
+        if cls._local_bases is None:
+            with cls._local_bases_lock:
+                if cls._local_bases is None:
+                    cls._local_bases = {record["_id"]: record["text"]
+                                        for record in self.base_store.iter_records()}
+        return cls._local_bases
+
+    def _store_local_bases(self, bases: Dict[str, str]) -> None:
+        known = self._load_local_bases()
+        with self._local_bases_lock:
+            for bid, text in bases.items():
+                if bid not in known:
+                    self.base_store.append({"_id": bid, "text": text})
+                    known[bid] = text
+
+    def _resolve_bases(self, base_ids: Set[str]) -> Dict[str, str]:
+        """base_id -> 원문 (캐시 -> MongoDB -> 로컬 순으로 조회)"""
+        found = {}
+        missing: Set[str] = set()
+        for bid in base_ids:
+            text = self._base_cache.get(bid)
+            if text is None:
+                missing.add(bid)
+            else:
+                found[bid] = text
+        if missing and self.collection is not None:
+            try:
+                for doc in self.bases.find({"_id": {"$in": list(missing)}}):
+                    found[doc["_id"]] = doc["text"]
+                    self._mongo_bases.set(doc["_id"], True)
+            except Exception as e:
+                print(f"MongoDB 원본 조회 실패: {e}, 로컬에서 로드")
+        looked_up = set(missing)
+        missing -= set(found)
+        if missing:
+            local = self._load_local_bases()
+            found.update({bid: local[bid] for bid in missing if bid in local})
+        for bid in looked_up & set(found):
+            self._base_cache.set(bid, found[bid])
+        return found
+
+    def _unpack(self, docs: List[Dict], detail: str = "summary") -> List[Dict]:
+        """델타 항목을 전체 항목으로 복원 (이전 형식 항목은 그대로)"""
+        base_ids = {doc["base_id"] for doc in docs if is_packed(doc)}
+        if not base_ids:
+            return docs
+        bases = self._resolve_bases(base_ids)
+        return [unpack_entry(doc, bases.get(doc.get("base_id")), detail) for doc in docs]
+
+    def _unpack_stream(self, docs: Iterable[Dict], detail: str = "summary") -> Iterator[Dict]:
+        iterator = iter(docs)
+        while True:
+            batch = list(itertools.islice(iterator, _UNPACK_BATCH))
+            if not batch:
+                return
+            yield from self._unpack(batch, detail)
+
+    def _migrate_legacy_files(self) -> None:
+        """항목별 JSON 파일로 저장된 이전 히스토리를 로그로 옮기고 legacy 디렉토리로 이동"""
+        with self._migrate_lock:
+            files = sorted(self.history_dir.glob("history_*.json"), key=lambda x: x.stat().st_mtime)
+            if not files:
+                return
+            legacy_dir = self.history_dir / "legacy"
+            legacy_dir.mkdir(exist_ok=True)
+            for file in files:
+                try:
+                    with open(file, 'r', encoding='utf-8') as f:
+                        self.local_store.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"히스토리 파일 이전 실패: {file.name} ({e})")
+                    continue
+                file.replace(legacy_dir / file.name)
+            self.local_store.sync()
+
+    def ensure_indexes(self, force: bool = False) -> Dict[str, bool]:
+        """필요한 인덱스를 생성하고 실제 존재 여부를 확인 (인덱스 이름 -> 존재 여부)"""
+        key = self.collection.full_name
+        if not force and key in self._indexed_collections:
+            return {name: True for name, _ in HISTORY_INDEXES}
+        try:
+            # 이미 있는 인덱스는 서버에서 무시됨 (background 옵션은 4.2부터 무시되므로 생략)
+            self.collection.create_indexes([IndexModel(keys, name=name) for name, keys in HISTORY_INDEXES])
+            existing = self.collection.index_information()
+        except Exception as e:
+            print(f"MongoDB 인덱스 생성 실패: {e}")
+            return {name: False for name, _ in HISTORY_INDEXES}
+        # 같은 이름이라도 키 구성이 다르면 누락으로 간주
+        status = {
+            name: [(field, int(direction)) for field, direction in existing.get(name, {}).get("key", [])] == keys
+            for name, keys in HISTORY_INDEXES
+        }
+        missing = [name for name, ok in status.items() if not ok]
+        if missing:
+            print(f"MongoDB 인덱스 누락: {', '.join(missing)}")
+        else:
+            self._indexed_collections.add(key)
+        return status
+
+    def get_recent_history(self, limit: int = 5, category: Optional[str] = None) -> List[Dict]:
+        """최근 히스토리 조회 (사이드바용 요약 필드만, 아직 저장 대기 중인 항목 포함)"""
+        history = self.get_history_page(limit=limit, category=category)[0]
+        if self.writer is None:
+            return history
+        pending = [entry for entry in self.writer.pending()
+                   if not category or entry.get('category') == category]
+        if not pending:
+            return history
+        # 저장 직후라 양쪽에 모두 있는 항목은 하나만
+        seen = set()
+        merged = []
+        for entry in sorted(pending + history, key=lambda e: e.get('timestamp', ''), reverse=True):
+            key = (entry.get('session_id'), entry.get('timestamp'))
+            if key not in seen:
+                seen.add(key)
+                merged.append(entry)
+        return merged[:limit]
+
+    async def aget_recent_history(self, limit: int = 5, category: Optional[str] = None) -> List[Dict]:
+        """get_recent_history의 비동기 버전 (다른 작업과 동시에 조회)"""
+        return await asyncio.to_thread(self.get_recent_history, limit, category)
+
+    async def aget_history_page(self, limit: int = 20, cursor: Optional[str] = None,
+                                category: Optional[str] = None,
+                                projection: Optional[Dict[str, int]] = None) -> Tuple[List[Dict], Optional[str]]:
+        return await asyncio.to_thread(self.get_history_page, limit, cursor, category, projection)
+
+    async def aget_stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.get_stats)
+
+    def get_history_page(self, limit: int = 20, cursor: Optional[str] = None,
+                         category: Optional[str] = None,
+                         projection: Optional[Dict[str, int]] = None) -> Tuple[List[Dict], Optional[str]]:
+        """최근순 히스토리 한 페이지와 다음 페이지 커서 (더 없으면 None)
+
+        커서는 마지막 항목의 (timestamp, _id) 위치이므로 skip 없이 인덱스에서 바로 이어 읽습니다.
+        """
         if self.collection is not None:
             try:
-                return list(self.collection.find().sort("timestamp", -1).limit(limit))
+                return self._find_page(limit, cursor, category, projection or SUMMARY_PROJECTION)
             except Exception as e:
                 print(f"MongoDB 조회 실패: {e}, 로컬에서 로드")
-                return self._load_from_local(limit)
-        return self._load_from_local(limit)
+        return self._load_page_from_local(limit, cursor, category)
 
-    def _load_from_local(self, limit: int) -> List[Dict]:
-        """로컬 파일 시스템에서 로드"""
-        files = sorted(self.history_dir.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True)
+    def _find_page(self, limit: int, cursor: Optional[str], category: Optional[str],
+                   projection: Dict[str, int]) -> Tuple[List[Dict], Optional[str]]:
+        query: Dict[str, Any] = {}
+        if category:
+            query["category"] = category
+        if cursor:
+            timestamp, _, oid = cursor.partition("|")
+            if oid:
+                query["$or"] = [
+                    {"timestamp": {"$lt": timestamp}},
+                    {"timestamp": timestamp, "_id": {"$lt": ObjectId(oid)}},
+                ]
+            else:
+                query["timestamp"] = {"$lt": timestamp}
+        # 하나 더 읽어 다음 페이지 존재 여부 판단
+        docs = list(
+            self.collection.find(query, {**projection, "_id": 1})
+            .sort([("timestamp", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit + 1)
+        )
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            last = docs[-1]
+            next_cursor = f"{last.get('timestamp', '')}|{last['_id']}"
+        for doc in docs:
+            doc.pop("_id", None)
+        detail = "full" if "diff" in projection else "summary"
+        return self._unpack(docs, detail), next_cursor
+
+    def _load_page_from_local(self, limit: int, cursor: Optional[str],
+                              category: Optional[str]) -> Tuple[List[Dict], Optional[str]]:
+        """로컬 파일 시스템에서 최근순 페이지 로드 (커서는 timestamp)"""
+        before = cursor.partition("|")[0] if cursor else None
         history = []
-        for file in files[:limit]:
-            with open(file, 'r', encoding='utf-8') as f:
-                history.append(json.load(f))
-        return history
-
-    def find_similar_prompts(self, query: str, threshold: float = 0.7) -> List[Dict]:
-        """유사한 프롬프트 검색 (간단한 키워드 매칭)"""
-        all_entries = self.get_recent_history(limit=100)
-        query_keywords = set(query.lower().split())
-        
-        similar = []
-        for entry in all_entries:
-            entry_keywords = set(entry['input'].lower().split())
-            intersection = query_keywords.intersection(entry_keywords)
-            similarity = len(intersection) / max(len(query_keywords), 1)
-            if similarity >= threshold:
-                similar.append(entry)
-        return similar
\ No newline at end of file
+        for entry in self._load_from_local(None):
+            timestamp = entry.get("timestamp", "")
+            if before is not None and timestamp >= before:
+                continue
+            if category and entry.get("category") != category:
+                continue
+            history.append(entry)
+            if len(history) > limit:
+                break
+        next_cursor = None
+        if len(history) > limit:
+            history = history[:limit]
+            next_cursor = history[-1].get("timestamp")
+        return self._unpack(history), next_cursor
+
+    def _load_from_local(self, limit: Optional[int]) -> Iterator[Dict]:
+        """로컬 로그에서 최근순으로 로드 (limit이 있으면 끝부분만 읽음)"""
+        if limit is None:
+            return self.local_store.iter_records(reverse=True)
+        return iter(self.local_store.tail(limit))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """히스토리 통계 (전체 건수, 카테고리별 건수, 평균 변경 수, 개선 비율, 기간)"""
+        if self.collection is not None:
+            try:
+                return self._aggregate_stats()
+            except Exception as e:
+                print(f"MongoDB 집계 실패: {e}, 로컬에서 집계")
+        return self._local_stats()
+
+    def _aggregate_stats(self) -> Dict[str, Any]:
+        pipeline = [
+            {"$facet": {
+                "overall": [
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "avg_changes": {"$avg": "$diff.summary.total_changes"},
+                        "improved": {"$sum": {"$cond": [{"$eq": ["$diff.summary.improved", True]}, 1, 0]}},
+                        "first": {"$min": "$timestamp"},
+                        "last": {"$max": "$timestamp"},
+                    }},
+                ],
+                "categories": [
+                    {"$group": {"_id": {"$ifNull": ["$category", "unknown"]}, "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1, "_id": 1}},
+                ],
+            }},
+        ]
+        result = next(self.collection.aggregate(pipeline), {})
+        overall = (result.get("overall") or [{}])[0]
+        total = overall.get("total", 0)
+        return {
+            "total": total,
+            "categories": {doc["_id"]: doc["count"] for doc in result.get("categories", [])},
+            "avg_changes": round(overall.get("avg_changes") or 0.0, 2),
+            "improved_ratio": round(overall.get("improved", 0) / total, 3) if total else 0.0,
+            "first": overall.get("first"),
+            "last": overall.get("last"),
+        }
+
+    def _local_stats(self) -> Dict[str, Any]:
+        total = improved = changes = changed_entries = 0
+        categories = Counter()
+        timestamps = []
+        for entry in self._load_from_local(None):
+            total += 1
+            categories[entry.get("category") or "unknown"] += 1
+            summary = (entry.get("diff") or {}).get("summary") or {}
+            if "total_changes" in summary:
+                changes += summary["total_changes"]
+                changed_entries += 1
+            improved += summary.get("improved") is True
+            if entry.get("timestamp"):
+                timestamps.append(entry["timestamp"])
+        return {
+            "total": total,
+            "categories": dict(sorted(categories.items(), key=lambda item: (-item[1], item[0]))),
+            "avg_changes": round(changes / changed_entries, 2) if changed_entries else 0.0,
+            "improved_ratio": round(improved / total, 3) if total else 0.0,
+            "first": min(timestamps, default=None),
+            "last": max(timestamps, default=None),
+        }
+
+    def get_popular_inputs(self, limit: int = 100, field: str = "input") -> List[Tuple[str, int]]:
+        """가장 자주 등장한 입력(또는 field 값)과 횟수 - 캐시 워밍용"""
+        # 델타 저장 항목의 프롬프트는 (원본, 델타) 조합으로 집계한 뒤 복원
+        packed_field = field in ("original_prompt", "edited_prompt")
+        if self.collection is not None:
+            try:
+                match: Dict[str, Any] = {field: {"$type": "string", "$ne": ""}}
+                group_key: Any = f"${field}"
+                if packed_field:
+                    match = {"$or": [match, {"v": {"$exists": True}}]}
+                    packed_key = {"base": "$base_id", "delta": "$delta" if field == "edited_prompt" else []}
+                    group_key = {"$ifNull": [f"${field}", packed_key]}
+                pipeline = [
+                    {"$match": match},
+                    {"$group": {"_id": group_key, "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}},
+                    {"$limit": limit}
+                ]
+                counts = Counter()
+                groups = list(self.collection.aggregate(pipeline))
+                bases = self._resolve_bases({doc["_id"]["base"] for doc in groups if isinstance(doc["_id"], dict)})
+                for doc in groups:
+                    value = doc["_id"]
+                    if isinstance(value, dict):
+                        if value["base"] not in bases:
+                            continue
+                        value = apply_delta(bases[value["base"]], value["delta"])
+                    counts[value] += doc["count"]
+                return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            except Exception as e:
+                print(f"MongoDB 집계 실패: {e}, 로컬에서 집계")
+        counts = Counter()
+        records = self.local_store.iter_records()
+        if packed_field:
+            records = self._unpack_stream(records, detail="none")
+        for entry in records:
+            value = entry.get(field)
+            if isinstance(value, str) and value:
+                counts[value] += 1
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def iter_history(self, detail: str = "summary", since: Optional[str] = None) -> Iterator[Dict]:
+        """전체 히스토리를 오래된 순으로 순회 (since가 있으면 그 이후 항목만, detail은 delta.unpack_entry 참고)"""
+        if self.collection is not None:
+            try:
+                query = {"timestamp": {"$gt": since}} if since else {}
+                cursor = self.collection.find(query, {"_id": 0}).sort("timestamp", 1).batch_size(_UNPACK_BATCH)
+                yield from self._unpack_stream(cursor, detail)
+                return
+            except Exception as e:
+                print(f"MongoDB 조회 실패: {e}, 로컬에서 로드")
+        records = self.local_store.iter_records()
+        if since:
+            records = (record for record in records if record.get("timestamp", "") > since)
+        yield from self._unpack_stream(records, detail)
+
+    def rollup_history(self, older_than_days: Optional[int] = None) -> Dict[str, int]:
+        """보관 기간이 지난 세션은 원본 프롬프트별 마지막 리비전만 남기고 삭제 (삭제 건수 반환)
+
+        정리 후 어떤 항목도 참조하지 않는 원본 프롬프트도 삭제합니다 (bases).
+        """
+        days = settings.HISTORY_RETENTION_DAYS if older_than_days is None else older_than_days
+        if days <= 0:
+            return {"mongodb": 0, "local": 0, "bases": 0}
+        self.flush()
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        removed = {"mongodb": 0, "local": self._rollup_local(cutoff), "bases": 0}
+        if self.collection is not None:
+            try:
+                removed["mongodb"] = self._rollup_mongo(cutoff)
+            except Exception as e:
+                print(f"MongoDB 히스토리 정리 실패: {e}")
+        removed["bases"] = self._collect_bases(cutoff)
+        return removed
+
+    def _collect_bases(self, cutoff: str) -> int:
+        """참조하는 항목이 없는 원본 프롬프트 삭제 (삭제 건수 반환)"""
+        with self._base_gc_lock:
+            referenced = {record["base_id"] for record in self.local_store.iter_records() if record.get("base_id")}
+            removed = self._collect_local_bases(referenced)
+            if self.collection is not None:
+                try:
+                    removed += self._collect_mongo_bases(referenced, cutoff)
+                except Exception as e:
+                    print(f"MongoDB 원본 정리 실패: {e}")
+        return removed
+
+    def _collect_local_bases(self, referenced: Set[str]) -> int:
+        if not self.base_store.count():
+            return 0
+        known = self._load_local_bases()
+        stale = set(known) - referenced
+        if not stale:
+            return 0
+        with self._local_bases_lock:
+            dropped = self.base_store.compact(keep=lambda record: record["_id"] not in stale, rotate=True)["dropped"]
+            for bid in stale:
+                known.pop(bid, None)
+                self._base_cache.delete(bid)
+        return dropped
+
+    def _collect_mongo_bases(self, referenced: Set[str], cutoff: str) -> int:
+        referenced = set(referenced)
+        pipeline = [{"$match": {"base_id": {"$type": "string"}}}, {"$group": {"_id": "$base_id"}}]
+        referenced.update(group["_id"] for group in self.collection.aggregate(pipeline, allowDiskUse=True))
+        # 다른 프로세스가 방금 저장한 원본은 건드리지 않도록 보관 기간이 지난 원본만 대상
+        candidates = self.bases.find({"created": {"$lt": cutoff}}, {"_id": 1})
+        stale = (doc["_id"] for doc in candidates if doc["_id"] not in referenced)
+        removed = 0
+        while True:
+            chunk = list(itertools.islice(stale, _UNPACK_BATCH))
+            if not chunk:
+                return removed
+            removed += self.bases.delete_many({"_id": {"$in": chunk}}).deleted_count
+            for bid in chunk:
+                self._mongo_bases.delete(bid)
+                self._base_cache.delete(bid)
+
+    def _rollup_mongo(self, cutoff: str) -> int:
+        pipeline = [
+            {"$match": {"session_id": {"$type": "string"}}},
+            {"$sort": {"timestamp": 1}},
+            {"$group": {
+                "_id": {"session": "$session_id", "base": {"$ifNull": ["$base_id", "$original_prompt"]}},
+                "last": {"$max": "$timestamp"},
+                "count": {"$sum": 1},
+                "ids": {"$push": "$_id"},
+            }},
+            {"$match": {"last": {"$lt": cutoff}, "count": {"$gt": 1}}},
+        ]
+        # 마지막 리비전(시간순 마지막 _id)을 제외한 나머지
+        stale = itertools.chain.from_iterable(
+            group["ids"][:-1] for group in self.collection.aggregate(pipeline, allowDiskUse=True)
+        )
+        removed = 0
+        while True:
+            chunk = list(itertools.islice(stale, _UNPACK_BATCH))
+            if not chunk:
+                return removed
+            removed += self.collection.delete_many({"_id": {"$in": chunk}}).deleted_count
+
+    def _rollup_local(self, cutoff: str) -> int:
+        def rollup_key(record: Dict) -> Optional[Tuple[str, Any]]:
+            session_id = record.get("session_id")
+            if not session_id:
+                return None
+            return session_id, record.get("base_id", record.get("original_prompt"))
+
+        latest: Dict[Tuple[str, Any], Tuple[str, int]] = {}
+        for record in self.local_store.iter_records():
+            key = rollup_key(record)
+            if key is not None:
+                last, count = latest.get(key, ("", 0))
+                latest[key] = (max(last, record.get("timestamp", "")), count + 1)
+        final = {key: last for key, (last, count) in latest.items() if last < cutoff and count > 1}
+        if not final:
+            return 0
+
+        def keep(record: Dict) -> bool:
+            key = rollup_key(record)
+            # 집계 이후 추가된 레코드(더 최신)도 유지
+            return key not in final or record.get("timestamp", "") >= final[key]
+
+        # 활성 세그먼트까지 포함 (기본 세그먼트 크기에서는 교체가 드물어 닫힌 세그먼트가 없을 수 있음)
+        return self.local_store.compact(keep=keep, rotate=True)["dropped"]
+
+    def find_similar_prompts(self, query: str, threshold: float = 0.7, limit: int = 10) -> List[Dict]:
+        """유사한 프롬프트 검색 (전체 히스토리 문자 n-gram 인덱스, 유사도 높은 순)"""
+        # 인덱스가 없던 기존 히스토리는 최초 검색 시 한 번 색인
+        self.similarity_index.bootstrap(lambda: self.iter_history(detail="none"))
+        return [entry for _, entry in
+                self.similarity_index.query(query, top_k=limit, threshold=threshold)]
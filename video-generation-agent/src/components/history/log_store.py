@@ -0,0 +1,375 @@
+# src/components/history/log_store.py
+# 로컬 히스토리용 추가 전용(append-only) JSONL 세그먼트 로그
+#
+# 디렉토리 구조:
+#   segment_00000001.jsonl / .idx          - 레코드 한 줄씩, .idx는 각 레코드 시작 위치(uint64 LE)
+#   segment_00000001_00000004.jsonl / .idx - 1~4번 세그먼트를 합친 압축(compaction) 결과
+# 마지막 세그먼트에만 추가하고, segment_size를 넘으면 새 세그먼트로 교체합니다.
+import json
+import os
+import re
+import struct
+import threading
+import time
+import structlog
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+OFFSET = struct.Struct("<Q")
+FSYNC_POLICIES = ("always", "interval", "never")
+_SEGMENT_RE = re.compile(r"^segment_(\d{8})(?:_(\d{8}))?\.jsonl$")
+# 역순 읽기 시 한 번에 읽는 레코드 수
+_READ_BATCH = 256
+
+
+class _Segment:
+    """세그먼트 파일 하나 (first~last 원본 세그먼트 번호 범위)"""
+
+    def __init__(self, directory: Path, first: int, last: Optional[int] = None):
+        self.first = first
+        self.last = first if last is None else last
+        name = f"segment_{first:08d}" if self.last == first else f"segment_{first:08d}_{self.last:08d}"
+        self.path = directory / f"{name}.jsonl"
+        self.index_path = directory / f"{name}.idx"
+        self.count = 0
+        self.size = 0
+
+    def read_offsets(self, start: int, stop: int) -> List[int]:
+        """start~stop번째 레코드의 시작 위치"""
+        if stop <= start:
+            return []
+        with open(self.index_path, "rb") as f:
+            f.seek(start * OFFSET.size)
+            data = f.read((stop - start) * OFFSET.size)
+        return [value for (value,) in OFFSET.iter_unpack(data)]
+
+    def read_records(self, start: int, stop: int) -> List[Dict]:
+        """start~stop번째 레코드 (연속 구간을 한 번에 읽음, 손상된 줄은 건너뜀)"""
+        offsets = self.read_offsets(start, min(stop, self.count))
+        if not offsets:
+            return []
+        end = self.read_offsets(stop, stop + 1)[0] if stop < self.count else self.size
+        with open(self.path, "rb") as f:
+            f.seek(offsets[0])
+            data = f.read(end - offsets[0])
+        records = []
+        for line in data.split(b"\n"):
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning("history_log_corrupt_record", segment=self.path.name)
+        return records
+
+
+class SegmentLogStore:
+    """추가 전용 JSONL 세그먼트 로그 (스레드 안전)
+
+    fsync 정책:
+      always   - 추가할 때마다 fsync (가장 안전, 가장 느림)
+      interval - 마지막 fsync 후 fsync_interval 초가 지난 추가 시점에 fsync
+      never    - OS에 맡김 (프로세스 종료에는 안전, 전원 장애 시 최근 기록 유실 가능)
+    어떤 정책이든 중간에 끊긴 마지막 줄은 다시 열 때 잘라냅니다.
+    """
+
+    def __init__(self, directory: Path, segment_size: int = 4 * 1024 * 1024,
+                 fsync: str = "interval", fsync_interval: float = 1.0, max_records: int = 0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        # 0보다 크면 세그먼트 교체 시 초과분을 압축으로 삭제
+        self.max_records = max_records
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._log = None
+        self._index = None
+        self._last_sync = time.monotonic()
+        self._dirty = False
+        self._load()
+
+    # ---- 쓰기 ----
+
+    def append(self, record: Dict) -> None:
+        # json.dumps는 줄바꿈을 이스케이프하므로 한 레코드는 항상 한 줄
+        data = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        with self._lock:
+            active = self._segments[-1]
+            if active.count and active.size + len(data) > self.segment_size:
+                if self.max_records and self.count() > self.max_records:
+                    self.compact(self.max_records)
+                active = self._rotate()
+            # 로그를 먼저 쓰고 위치를 기록 (인덱스가 앞서면 복구 시 잘라냄)
+            self._log.write(data)
+            self._index.write(OFFSET.pack(active.size))
+            active.size += len(data)
+            active.count += 1
+            self._dirty = True
+            self._flush(force=self.fsync == "always")
+
+    def _flush(self, force: bool = False) -> None:
+        self._log.flush()
+        self._index.flush()
+        if self.fsync == "never" or not self._dirty:
+            return
+        if force or time.monotonic() - self._last_sync >= self.fsync_interval:
+            os.fsync(self._log.fileno())
+            os.fsync(self._index.fileno())
+            self._last_sync = time.monotonic()
+            self._dirty = False
+
+    def sync(self) -> None:
+        """정책과 관계없이 지금까지의 기록을 디스크에 반영"""
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+                self._index.flush()
+                os.fsync(self._log.fileno())
+                os.fsync(self._index.fileno())
+                self._last_sync = time.monotonic()
+                self._dirty = False
+
+    def _rotate(self) -> _Segment:
+        self._close_files(sync=True)
+        segment = _Segment(self.directory, self._segments[-1].last + 1)
+        self._segments.append(segment)
+        self._open_active()
+        self._sync_directory()
+        return segment
+
+    def _open_active(self) -> None:
+        active = self._segments[-1]
+        self._log = open(active.path, "ab")
+        self._index = open(active.index_path, "ab")
+
+    def _close_files(self, sync: bool = False) -> None:
+        if self._log is None:
+            return
+        if sync:
+            self._dirty = True
+            self._flush(force=self.fsync != "never")
+        self._log.close()
+        self._index.close()
+        self._log = self._index = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_files(sync=True)
+
+    def _sync_directory(self) -> None:
+        if self.fsync == "never" or os.name == "nt":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # ---- 읽기 ----
+
+    def count(self) -> int:
+        return sum(segment.count for segment in self._segments)
+
+    def tail(self, limit: int) -> List[Dict]:
+        """최근 limit개 레코드 (최신순) - 인덱스로 필요한 구간만 읽음"""
+        records: List[Dict] = []
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+            for segment in reversed(self._segments):
+                need = limit - len(records)
+                if need <= 0:
+                    break
+                records.extend(reversed(segment.read_records(max(0, segment.count - need), segment.count)))
+        return records
+
+    def iter_records(self, reverse: bool = False) -> Iterator[Dict]:
+        """전체 레코드 순회 (reverse=True면 최신순, 세그먼트별로 조금씩 읽음)"""
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+            segments = [(segment, segment.count) for segment in self._segments]
+        if reverse:
+            segments.reverse()
+        for segment, count in segments:
+            batches = range(0, count, _READ_BATCH)
+            for start in (reversed(batches) if reverse else batches):
+                try:
+                    batch = segment.read_records(start, min(start + _READ_BATCH, count))
+                except FileNotFoundError:
+                    # 순회 도중 압축으로 교체된 세그먼트
+                    break
+                yield from (reversed(batch) if reverse else batch)
+
+    # ---- 압축 ----
+
+    def compact(self, max_records: Optional[int] = None,
+                keep: Optional[Callable[[Dict], bool]] = None, rotate: bool = False) -> Dict[str, int]:
+        """닫힌 세그먼트들을 하나로 합치고 max_records를 넘는 오래된 레코드와
+        keep(record)이 False인 레코드를 삭제
+
+        rotate=True면 활성 세그먼트를 먼저 닫아 압축 대상에 포함합니다 (보관 정책 정리처럼
+        최근 레코드까지 봐야 하는 경우 - 세그먼트 크기에 도달하지 않은 저장소도 정리됨).
+
+        합친 결과를 임시 파일로 쓴 뒤 원본 번호 범위 이름으로 교체하고 원본을 지웁니다.
+        도중에 중단되어도 다시 열 때 범위에 포함된 원본이 정리되므로 중복/유실이 없습니다.
+        """
+        with self._lock:
+            if rotate and self._segments[-1].count:
+                self._rotate()
+            sealed = self._segments[:-1]
+            total = self.count()
+            drop = max(0, total - max_records) if max_records else 0
+            if not sealed or (len(sealed) == 1 and not drop and keep is None):
+                return {"segments": 0, "dropped": 0}
+            kept_offset = 0
+            output = _Segment(self.directory, sealed[0].first, sealed[-1].last)
+            tmp_log = output.path.with_suffix(".jsonl.tmp")
+            tmp_index = output.index_path.with_suffix(".idx.tmp")
+            dropped = 0
+            with open(tmp_log, "wb") as log, open(tmp_index, "wb") as index:
+                for segment in sealed:
+                    skip = min(segment.count, drop - dropped)
+                    dropped += skip
+                    if skip == segment.count:
+                        continue
+                    offsets = segment.read_offsets(skip, segment.count)
+                    with open(segment.path, "rb") as f:
+                        f.seek(offsets[0])
+                        data = f.read(segment.size - offsets[0])
+                    if keep is None:
+                        log.write(data)
+                        index.write(b"".join(OFFSET.pack(kept_offset + offset - offsets[0]) for offset in offsets))
+                        kept_offset += len(data)
+                        output.count += len(offsets)
+                        continue
+                    for line in data.splitlines(keepends=True):
+                        try:
+                            kept = keep(json.loads(line))
+                        except ValueError:
+                            kept = False
+                        if not kept:
+                            dropped += 1
+                            continue
+                        log.write(line)
+                        index.write(OFFSET.pack(kept_offset))
+                        kept_offset += len(line)
+                        output.count += 1
+                log.flush()
+                index.flush()
+                os.fsync(log.fileno())
+                os.fsync(index.fileno())
+            output.size = kept_offset
+
+            # 인덱스 -> 로그 순으로 교체 (로그 이름이 보이는 순간부터 범위 파일이 유효)
+            os.replace(tmp_index, output.index_path)
+            os.replace(tmp_log, output.path)
+            self._sync_directory()
+            for segment in sealed:
+                if segment.path != output.path:
+                    self._remove(segment)
+            self._segments = [output] + self._segments[len(sealed):]
+            # 남은 레코드가 없어도 범위 이름은 남겨 다음 세그먼트 번호를 보존
+            logger.info("history_log_compacted", segments=len(sealed), dropped=dropped,
+                        records=self.count())
+            return {"segments": len(sealed), "dropped": dropped}
+
+    @staticmethod
+    def _remove(segment: _Segment) -> None:
+        for path in (segment.path, segment.index_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ---- 열기/복구 ----
+
+    def _load(self) -> None:
+        for tmp in self.directory.glob("*.tmp"):
+            tmp.unlink()
+        found: List[Tuple[int, int]] = []
+        for path in self.directory.glob("segment_*.jsonl"):
+            match = _SEGMENT_RE.match(path.name)
+            if match:
+                first = int(match.group(1))
+                found.append((first, int(match.group(2) or first)))
+
+        # 압축 결과 범위에 포함된 원본은 교체 도중 중단된 잔여물
+        found.sort(key=lambda item: (item[0], -item[1]))
+        segments: List[_Segment] = []
+        for first, last in found:
+            if segments and last <= segments[-1].last:
+                self._remove(_Segment(self.directory, first, last))
+                continue
+            segments.append(_Segment(self.directory, first, last))
+        if not segments:
+            segments.append(_Segment(self.directory, 1))
+            segments[0].path.touch()
+
+        for segment in segments:
+            self._recover(segment)
+        self._segments = segments
+        self._open_active()
+
+    def _recover(self, segment: _Segment) -> None:
+        """인덱스를 로그에 맞춤 - 인덱스 뒤에 남은 레코드를 색인하고 끊긴 마지막 줄을 잘라냄"""
+        segment.size = segment.path.stat().st_size if segment.path.exists() else 0
+        if not segment.index_path.exists():
+            segment.index_path.touch()
+        count = segment.index_path.stat().st_size // OFFSET.size
+        offsets = segment.read_offsets(0, count) if count else []
+        # 로그보다 앞선 인덱스 항목 제거
+        while offsets and offsets[-1] >= segment.size:
+            offsets.pop()
+
+        position = offsets.pop() if offsets else 0
+        with open(segment.path, "rb") as f:
+            f.seek(position)
+            tail = f.read()
+        good_end = position
+        for line in tail.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            offsets.append(good_end)
+            good_end += len(line)
+
+        if good_end < segment.size:
+            logger.warning("history_log_truncated", segment=segment.path.name,
+                           dropped_bytes=segment.size - good_end)
+            with open(segment.path, "r+b") as f:
+                f.truncate(good_end)
+            segment.size = good_end
+        if len(offsets) != count:
+            with open(segment.index_path, "wb") as f:
+                f.write(b"".join(OFFSET.pack(offset) for offset in offsets))
+        segment.count = len(offsets)
+
+
+# 디렉토리별 프로세스 공유 로그
+_stores: Dict[str, SegmentLogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_log_store(directory: Path, max_records: Optional[int] = None) -> SegmentLogStore:
+    """디렉토리별 공유 로그 (설정 기반으로 최초 한 번 열기, max_records=0이면 개수 제한 없음)"""
+    key = str(Path(directory).resolve())
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = _stores[key] = SegmentLogStore(
+                    Path(directory),
+                    segment_size=settings.HISTORY_SEGMENT_SIZE,
+                    fsync=settings.HISTORY_FSYNC,
+                    fsync_interval=settings.HISTORY_FSYNC_INTERVAL,
+                    max_records=settings.HISTORY_MAX_LOCAL_RECORDS if max_records is None else max_records
+                )
+    return store
@@ -0,0 +1,161 @@
+# src/components/history/mongo_client.py
+import threading
+import structlog
+from typing import Any, Callable, Dict, Optional
+from pymongo import MongoClient
+from pymongo.errors import AutoReconnect, PyMongoError, ServerSelectionTimeoutError
+from config.settings import settings
+from components.cache.circuit_breaker import CircuitBreaker, get_breaker
+
+logger = structlog.get_logger()
+
+# 프로세스 공유 클라이언트 (최초 사용 시 생성 - 클라이언트마다 모니터 스레드와 연결 풀이 생기므로 하나만)
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+# 서버에 닿지 못한 오류 - 차단기를 열어 이후 호출은 바로 로컬 저장소로
+CONNECTION_ERRORS = (ServerSelectionTimeoutError, AutoReconnect)
+
+
+class MongoCircuitOpen(PyMongoError):
+    """차단기가 열려 있어 MongoDB를 호출하지 않음"""
+
+
+def _guarded(breaker: CircuitBreaker, operation: Callable[[], Any]) -> Any:
+    try:
+        result = operation()
+    except CONNECTION_ERRORS as e:
+        breaker.record_failure(e)
+        raise
+    breaker.record_success()
+    return result
+
+
+class GuardedCursor:
+    """커서 순회 중 연결 오류도 차단기에 기록"""
+
+    def __init__(self, cursor: Any, breaker: CircuitBreaker):
+        self._cursor = cursor
+        self._breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._cursor, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # sort/limit/batch_size 등은 같은 커서를 반환
+            return self if result is self._cursor else result
+        return call
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return next(self._cursor)
+        except CONNECTION_ERRORS as e:
+            self._breaker.record_failure(e)
+            raise
+
+
+class GuardedCollection:
+    """차단기를 거치는 컬렉션 - 연결 오류는 실패로 기록하고, 차단 중에는 서버 선택을 기다리지 않고 바로 실패"""
+
+    def __init__(self, collection: Any, breaker: CircuitBreaker):
+        self._collection = collection
+        self._breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._collection, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            if not self._breaker.allow():
+                raise MongoCircuitOpen(f"MongoDB circuit open ({name})")
+            result = _guarded(self._breaker, lambda: attr(*args, **kwargs))
+            # find/aggregate 결과 커서
+            if hasattr(result, "__next__"):
+                return GuardedCursor(result, self._breaker)
+            return result
+        return call
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    return {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+        "retryWrites": True,
+        "appname": settings.APP_NAME,
+    }
+
+
+def _create_client() -> MongoClient:
+    if settings.MONGODB_BACKEND == "mock":
+        import mongomock
+        return mongomock.MongoClient()
+    return MongoClient(settings.MONGODB_URL, **_client_kwargs())
+
+
+def get_mongo_breaker() -> CircuitBreaker:
+    """MongoDB 공유 차단기 (연결 실패 시 백오프 동안 로컬 저장소 사용)"""
+    return get_breaker(
+        "mongodb",
+        failure_threshold=1,
+        backoff=settings.MONGODB_BREAKER_BACKOFF,
+        max_backoff=settings.MONGODB_BREAKER_MAX_BACKOFF
+    )
+
+
+def get_mongo_client() -> Optional[MongoClient]:
+    """프로세스 공유 MongoClient (사용할 수 없으면 None)
+
+    최초 호출에서만 ping으로 연결을 확인하고, 실패하면 차단기가 다시 허용할 때까지
+    (지수 백오프) 연결을 시도하지 않습니다.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    if not settings.MONGODB_URL and settings.MONGODB_BACKEND != "mock":
+        return None
+    breaker = get_mongo_breaker()
+    if not breaker.allow():
+        return None
+
+    with _client_lock:
+        if _client is None:
+            client = _create_client()
+            try:
+                client.admin.command("ping")
+            except PyMongoError as e:
+                client.close()
+                breaker.trip(e)
+                return None
+            breaker.record_success()
+            _client = client
+    return _client
+
+
+def get_collection(name: str) -> Optional[GuardedCollection]:
+    """공유 클라이언트의 컬렉션 (연결이 없거나 차단기가 백오프 중이면 None - 로컬 저장소 사용)"""
+    client = get_mongo_client()
+    breaker = get_mongo_breaker()
+    if client is None or breaker.rejecting():
+        return None
+    return GuardedCollection(client[settings.MONGODB_DB][name], breaker)
+
+
+def reset_mongo() -> None:
+    """공유 클라이언트 초기화 (설정 변경 후 또는 테스트용)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        get_mongo_breaker().reset()
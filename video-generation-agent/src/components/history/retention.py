@@ -0,0 +1,60 @@
+# src/components/history/retention.py
+# 히스토리 보관 정책 - 보관 기간이 지난 세션을 원본 프롬프트별 마지막 리비전으로 정리
+# 사용 예 (src 디렉토리에서):
+#   python -m components.history.retention --days 30
+import argparse
+import sys
+import threading
+import time
+import structlog
+from typing import List, Optional
+from config.settings import settings
+from components.history.history_manager import HistoryManager
+
+logger = structlog.get_logger()
+
+_rollup_thread: Optional[threading.Thread] = None
+_rollup_lock = threading.Lock()
+
+
+def _rollup_loop(interval: float) -> None:
+    while True:
+        try:
+            removed = HistoryManager().rollup_history()
+            logger.info("history_rollup_complete", **removed)
+        except Exception as e:
+            logger.error("history_rollup_failed", error=str(e))
+        if interval <= 0:
+            return
+        time.sleep(interval)
+
+
+def start_background_rollup() -> bool:
+    """프로세스당 한 번 백그라운드 정리 시작 (HISTORY_ROLLUP_INTERVAL 초마다 반복, 0이면 한 번)"""
+    global _rollup_thread
+    if settings.HISTORY_RETENTION_DAYS <= 0:
+        return False
+    with _rollup_lock:
+        if _rollup_thread is not None:
+            return False
+        _rollup_thread = threading.Thread(
+            target=_rollup_loop, args=(settings.HISTORY_ROLLUP_INTERVAL,),
+            name="history-rollup", daemon=True
+        )
+        _rollup_thread.start()
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="히스토리 보관 기간 정리")
+    parser.add_argument("--days", type=int, default=settings.HISTORY_RETENTION_DAYS,
+                        help="이 기간(일)보다 오래된 세션을 마지막 리비전만 남기고 정리")
+    args = parser.parse_args(argv)
+
+    removed = HistoryManager().rollup_history(older_than_days=args.days)
+    logger.info("history_rollup_complete", **removed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+# src/components/history/similarity_index.py
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+import zlib
+import numpy as np
+import structlog
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from config.settings import settings
+
+logger = structlog.get_logger()
+
+# 파일 형식/해시 파라미터가 바뀌면 올림 (기존 인덱스는 다시 생성)
+INDEX_VERSION = 2
+
+# 범용 해시 (a*x + b) mod P - a, b, x < 2^32 이므로 uint64에서 넘치지 않음
+_PRIME = np.uint64(4294967311)
+_NON_WORD = re.compile(r'[\W_]+')
+
+# 증분 추가분이 이 크기(또는 기존 문서 수의 1/8)를 넘으면 정렬 배열 재구성
+_MIN_DELTA = 1024
+# docs.jsonl에서 최신이 아닌 레코드가 이만큼(또는 문서 수만큼) 쌓이면 최신 레코드만 남기고 다시 씀
+_MIN_STALE = 1024
+
+# docs.jsonl에 저장하는 필드 (유사 프롬프트 추천에 표시하는 값만 - diff 등 전체 항목은 히스토리 저장소에)
+DOC_FIELDS = ("session_id", "input", "original_prompt", "edited_prompt", "category", "timestamp")
+
+
+def normalize_text(text: str) -> str:
+    """중복 판정용 입력 정규화 (NFC, 소문자, 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def char_ngrams(text: str, n: int = 2) -> Set[str]:
+    """공백/문장부호를 뺀 문자 n-gram (한국어 띄어쓰기 차이에 영향 없음)"""
+    compact = _NON_WORD.sub("", normalize_text(text))
+    if len(compact) <= n:
+        return {compact} if compact else set()
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+def _text_key(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class SimilarityIndex:
+    """문자 n-gram MinHash-LSH 기반 유사 입력 인덱스 (파일에 증분 저장)
+
+    파일 구성 (directory 아래):
+      meta.json       파라미터/버전
+      signatures.u32  문서별 MinHash 서명 (num_perm x uint32, 추가만)
+      keys.u64        문서별 정규화 입력 해시 (추가만)
+      offsets.u64     문서별 최신 레코드의 docs.jsonl 위치 (같은 입력이 다시 저장되면 갱신)
+      docs.jsonl      DOC_FIELDS만 담은 레코드 (추가만, 최신이 아닌 레코드가 쌓이면 다시 씀)
+
+    같은 입력은 한 문서로 합쳐 최신 히스토리 항목을 반환합니다.
+    """
+
+    def __init__(self, directory: Path, num_perm: int = 64, bands: int = 32,
+                 ngram: int = 2, seed: int = 1, candidate_limit: int = 64):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self.seed = seed
+        self.candidate_limit = candidate_limit
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._band_mult = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self._lock = threading.RLock()
+        self._paths = {name: self.directory / name for name in
+                       ("meta.json", "signatures.u32", "keys.u64", "offsets.u64", "docs.jsonl")}
+        self._load()
+
+    # ---- 공개 API ----
+
+    @property
+    def bootstrapped(self) -> bool:
+        return bool(self._meta.get("bootstrapped"))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """히스토리 항목 하나 추가/갱신"""
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """히스토리 항목 일괄 추가 - 새로 추가된 문서 수 반환"""
+        with self._lock:
+            new_ids: List[int] = []
+            new_keys: List[int] = []
+            new_sigs: List[np.ndarray] = []
+            new_offsets: List[int] = []
+            pending: Dict[int, int] = {}
+
+            with open(self._paths["docs.jsonl"], "ab") as docs:
+                for entry in entries:
+                    text = entry.get("input")
+                    if not isinstance(text, str) or not text.strip():
+                        continue
+                    normalized = normalize_text(text)
+                    key = _text_key(normalized)
+                    offset = docs.tell()
+                    record = {name: entry[name] for name in DOC_FIELDS if name in entry}
+                    docs.write(json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+
+                    doc_id = pending.get(key)
+                    if doc_id is None:
+                        doc_id = self._lookup(key)
+                    if doc_id is not None:
+                        # 이미 색인된 입력 - 최신 레코드 위치만 갱신
+                        if doc_id >= self._count:
+                            new_offsets[doc_id - self._count] = offset
+                        else:
+                            self._update_offset(doc_id, offset)
+                        self._stale += 1
+                        continue
+
+                    doc_id = self._count + len(new_ids)
+                    pending[key] = doc_id
+                    new_ids.append(doc_id)
+                    new_keys.append(key)
+                    new_offsets.append(offset)
+                    new_sigs.append(self._signature(char_ngrams(text, self.ngram)))
+
+            if not new_ids:
+                if self._stale > max(_MIN_STALE, self._count):
+                    self._rebuild()
+                return 0
+
+            sigs = np.vstack(new_sigs).astype(np.uint32)
+            with open(self._paths["signatures.u32"], "ab") as f:
+                f.write(sigs.tobytes())
+            with open(self._paths["keys.u64"], "ab") as f:
+                f.write(np.asarray(new_keys, dtype=np.uint64).tobytes())
+            with open(self._paths["offsets.u64"], "ab") as f:
+                f.write(np.asarray(new_offsets, dtype=np.uint64).tobytes())
+
+            self._count += len(new_ids)
+
+            if self._count - self._base_count > max(_MIN_DELTA, self._base_count // 8):
+                self._rebuild()
+            else:
+                band_keys = self._band_keys(sigs)
+                for row, doc_id in enumerate(new_ids):
+                    self._delta_sigs[doc_id] = sigs[row]
+                    self._delta_offsets[doc_id] = new_offsets[row]
+                    self._delta_keys[new_keys[row]] = doc_id
+                    for band in range(self.bands):
+                        self._delta_bands.setdefault((band, int(band_keys[row, band])), []).append(doc_id)
+            return len(new_ids)
+
+    def query(self, text: str, top_k: int = 10, threshold: float = 0.0) -> List[Tuple[float, Dict[str, Any]]]:
+        """유사 입력 검색 - (점수, 히스토리 항목) 목록 (점수 높은 순, 같으면 최근 문서 우선)
+
+        점수는 질의 n-gram 중 문서에 포함된 비율입니다.
+        """
+        grams = char_ngrams(text, self.ngram)
+        if not grams:
+            return []
+        with self._lock:
+            if not self._count:
+                return []
+            signature = self._signature(grams)
+            ids = self._candidates(signature)
+            if not len(ids):
+                return []
+
+            if len(ids) > self.candidate_limit:
+                # 서명 일치율(추정 자카드)로 후보 축소
+                estimated = (self._signatures_for(ids) == signature).mean(axis=1)
+                ids = ids[np.lexsort((-ids, -estimated))[:self.candidate_limit]]
+
+            scored = []
+            with open(self._paths["docs.jsonl"], "rb") as docs:
+                for doc_id in ids.tolist():
+                    record = self._read_record(docs, doc_id)
+                    if record is None:
+                        continue
+                    doc_grams = char_ngrams(record.get("input", ""), self.ngram)
+                    score = len(grams & doc_grams) / len(grams)
+                    if score >= threshold:
+                        scored.append((score, doc_id, record))
+
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [(round(score, 4), entry) for score, _, entry in scored[:top_k]]
+
+    def bootstrap(self, load_entries: Callable[[], Iterable[Dict[str, Any]]]) -> int:
+        """기존 히스토리 전체로 최초 한 번 색인 - 추가된 문서 수 반환"""
+        with self._lock:
+            if self.bootstrapped:
+                return 0
+            added = self.add_many(load_entries())
+            self._meta["bootstrapped"] = True
+            self._write_meta()
+            logger.info("similarity_index_bootstrapped", documents=self._count)
+            return added
+
+    def clear(self) -> None:
+        """인덱스 파일 삭제 후 빈 상태로 초기화"""
+        with self._lock:
+            for path in self._paths.values():
+                path.unlink(missing_ok=True)
+            self._load()
+
+    # ---- 내부 구현 ----
+
+    def _params(self) -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "num_perm": self.num_perm, "bands": self.bands,
+                "ngram": self.ngram, "seed": self.seed}
+
+    def _write_meta(self) -> None:
+        tmp = self._paths["meta.json"].with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._meta), encoding="utf-8")
+        tmp.replace(self._paths["meta.json"])
+
+    def _load(self) -> None:
+        meta = {}
+        if self._paths["meta.json"].exists():
+            try:
+                meta = json.loads(self._paths["meta.json"].read_text(encoding="utf-8"))
+            except ValueError:
+                meta = {}
+        params = self._params()
+        if any(meta.get(name) != value for name, value in params.items()):
+            # 파라미터가 다른 인덱스는 재사용할 수 없으므로 새로 생성
+            if meta:
+                logger.info("similarity_index_reset", directory=str(self.directory))
+            for name, path in self._paths.items():
+                if name != "meta.json":
+                    path.unlink(missing_ok=True)
+            meta = {**params, "bootstrapped": False}
+        self._meta = meta
+        if meta.get("compacting") and self._paths["docs.jsonl"].exists():
+            # docs.jsonl 재작성 도중 중단 - 어느 쪽 파일이든 문서마다 레코드가 있으므로 위치를 다시 계산
+            self._repair_offsets()
+            meta["compacting"] = False
+        self._write_meta()
+        self._stale = 0
+        self._rebuild()
+
+    def _stored_count(self) -> int:
+        # 쓰기 도중 중단된 경우를 대비해 모든 파일에 온전히 기록된 문서 수만 사용
+        sizes = []
+        for name, width in (("signatures.u32", 4 * self.num_perm), ("keys.u64", 8), ("offsets.u64", 8)):
+            path = self._paths[name]
+            sizes.append(path.stat().st_size // width if path.exists() else 0)
+        return min(sizes)
+
+    def _rebuild(self) -> None:
+        """파일에서 정렬된 LSH 밴드/키 배열 재구성 (최신이 아닌 레코드가 많으면 docs.jsonl도 다시 씀)"""
+        count = self._stored_count()
+        if count and self._needs_compaction(count):
+            self._compact_docs(count)
+        if count:
+            self._sigs = np.memmap(self._paths["signatures.u32"], dtype=np.uint32, mode="r",
+                                   shape=(count, self.num_perm))
+            keys = np.fromfile(self._paths["keys.u64"], dtype=np.uint64, count=count)
+            self._offsets = np.fromfile(self._paths["offsets.u64"], dtype=np.uint64, count=count)
+            band_keys = self._band_keys(self._sigs)
+            self._band_order = np.argsort(band_keys, axis=0, kind="stable").astype(np.int64)
+            self._band_sorted = np.take_along_axis(band_keys, self._band_order, axis=0)
+            self._key_order = np.argsort(keys, kind="stable")
+            self._key_sorted = keys[self._key_order]
+        else:
+            self._sigs = np.empty((0, self.num_perm), dtype=np.uint32)
+            self._offsets = np.empty(0, dtype=np.uint64)
+            self._band_order = np.empty((0, self.bands), dtype=np.int64)
+            self._band_sorted = np.empty((0, self.bands), dtype=np.uint64)
+            self._key_order = np.empty(0, dtype=np.int64)
+            self._key_sorted = np.empty(0, dtype=np.uint64)
+        self._count = self._base_count = count
+        self._delta_sigs: Dict[int, np.ndarray] = {}
+        self._delta_offsets: Dict[int, int] = {}
+        self._delta_keys: Dict[int, int] = {}
+        self._delta_bands: Dict[Tuple[int, int], List[int]] = {}
+
+    def _needs_compaction(self, count: int) -> bool:
+        if self._stale > max(_MIN_STALE, count):
+            return True
+        path = self._paths["docs.jsonl"]
+        size = path.stat().st_size if path.exists() else 0
+        if size < 1 << 20:
+            return False
+        # 재시작 직후에는 최신 레코드 일부의 평균 크기로 파일이 실제 필요량의 2배를 넘는지 추정
+        offsets = np.fromfile(self._paths["offsets.u64"], dtype=np.uint64, count=count)
+        sample = np.random.default_rng(self.seed).choice(offsets, size=min(256, count), replace=False)
+        with open(path, "rb") as docs:
+            lengths = []
+            for offset in sample.tolist():
+                docs.seek(offset)
+                lengths.append(len(docs.readline()))
+        return size > 2 * count * (sum(lengths) / len(lengths))
+
+    def _compact_docs(self, count: int) -> None:
+        """docs.jsonl을 문서별 최신 레코드만 남겨 다시 쓰고 offsets.u64 갱신"""
+        offsets = np.fromfile(self._paths["offsets.u64"], dtype=np.uint64, count=count)
+        docs_tmp = self._paths["docs.jsonl"].with_suffix(".jsonl.tmp")
+        offsets_tmp = self._paths["offsets.u64"].with_suffix(".u64.tmp")
+        new_offsets = np.empty(count, dtype=np.uint64)
+        with open(self._paths["docs.jsonl"], "rb") as source, open(docs_tmp, "wb") as target:
+            for doc_id, offset in enumerate(offsets.tolist()):
+                source.seek(offset)
+                new_offsets[doc_id] = target.tell()
+                target.write(source.readline())
+        new_offsets.tofile(offsets_tmp)
+
+        self._meta["compacting"] = True
+        self._write_meta()
+        os.replace(docs_tmp, self._paths["docs.jsonl"])
+        os.replace(offsets_tmp, self._paths["offsets.u64"])
+        self._meta["compacting"] = False
+        self._write_meta()
+        logger.info("similarity_docs_compacted", documents=count, stale=self._stale)
+        self._stale = 0
+
+    def _repair_offsets(self) -> None:
+        """docs.jsonl을 훑어 문서별 마지막 레코드 위치로 offsets.u64 재작성"""
+        count = self._stored_count()
+        latest: Dict[int, int] = {}
+        with open(self._paths["docs.jsonl"], "rb") as docs:
+            offset = 0
+            for line in docs:
+                try:
+                    text = json.loads(line).get("input")
+                except ValueError:
+                    text = None
+                if isinstance(text, str):
+                    latest[_text_key(normalize_text(text))] = offset
+                offset += len(line)
+        keys = np.fromfile(self._paths["keys.u64"], dtype=np.uint64, count=count)
+        np.asarray([latest.get(int(key), 0) for key in keys], dtype=np.uint64).tofile(self._paths["offsets.u64"])
+        logger.info("similarity_offsets_repaired", documents=count)
+
+    def _signature(self, grams: Set[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams),
+                             dtype=np.uint64, count=len(grams))
+        if not len(hashes):
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        values = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return (values.min(axis=1) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def _band_keys(self, sigs: np.ndarray) -> np.ndarray:
+        """(문서 수, bands) 밴드 해시 - 충돌은 후보 검증 단계에서 걸러짐"""
+        shaped = np.asarray(sigs, dtype=np.uint64).reshape(len(sigs), self.bands, self.rows)
+        return np.bitwise_xor.reduce(shaped * self._band_mult, axis=2)
+
+    def _candidates(self, signature: np.ndarray) -> np.ndarray:
+        """밴드가 하나 이상 일치하는 문서 ID (중복 제거)"""
+        query_keys = self._band_keys(signature[None, :])[0]
+        parts = []
+        for band in range(self.bands):
+            key = query_keys[band]
+            if self._base_count:
+                column = self._band_sorted[:, band]
+                lo = np.searchsorted(column, key, side="left")
+                hi = np.searchsorted(column, key, side="right")
+                if hi > lo:
+                    parts.append(self._band_order[lo:hi, band])
+            delta = self._delta_bands.get((band, int(key)))
+            if delta:
+                parts.append(np.asarray(delta, dtype=np.int64))
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(parts))
+
+    def _signatures_for(self, ids: np.ndarray) -> np.ndarray:
+        base = ids < self._base_count
+        result = np.empty((len(ids), self.num_perm), dtype=np.uint32)
+        result[base] = self._sigs[ids[base]]
+        for row in np.flatnonzero(~base):
+            result[row] = self._delta_sigs[int(ids[row])]
+        return result
+
+    def _lookup(self, key: int) -> Optional[int]:
+        doc_id = self._delta_keys.get(key)
+        if doc_id is not None or not self._base_count:
+            return doc_id
+        index = np.searchsorted(self._key_sorted, np.uint64(key))
+        if index < self._base_count and self._key_sorted[index] == key:
+            return int(self._key_order[index])
+        return None
+
+    def _update_offset(self, doc_id: int, offset: int) -> None:
+        if doc_id < self._base_count:
+            self._offsets[doc_id] = offset
+        else:
+            self._delta_offsets[doc_id] = offset
+        with open(self._paths["offsets.u64"], "r+b") as f:
+            f.seek(doc_id * 8)
+            f.write(np.uint64(offset).tobytes())
+
+    def _read_record(self, docs: BinaryIO, doc_id: int) -> Optional[Dict[str, Any]]:
+        offset = self._offsets[doc_id] if doc_id < self._base_count else self._delta_offsets[doc_id]
+        docs.seek(int(offset))
+        line = docs.readline()
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+
+_index: Optional[SimilarityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """프로세스 공유 유사도 인덱스"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SimilarityIndex(
+                    Path(settings.SIMILARITY_INDEX_DIR),
+                    num_perm=settings.SIMILARITY_NUM_PERM,
+                    bands=settings.SIMILARITY_BANDS
+                )
+    return _index
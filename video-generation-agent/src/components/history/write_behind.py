@@ -0,0 +1,122 @@
+# src/components/history/write_behind.py
+# 히스토리 저장 지연 쓰기(write-behind) 버퍼 - 세션별 연속 편집을 병합해 백그라운드에서 일괄 저장
+import atexit
+import itertools
+import threading
+import time
+import structlog
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = structlog.get_logger()
+
+
+class WriteBehindBuffer:
+    """저장할 항목을 모아 batch_size개가 쌓이거나 interval 초가 지나면 flush_fn으로 일괄 저장
+
+    같은 키(세션)의 항목이 아직 저장되지 않았다면 최신 항목으로 교체합니다.
+    대기 항목이 max_pending개에 이르면 submit이 최대 enqueue_timeout 초 기다리고,
+    그래도 자리가 없으면 호출한 스레드에서 직접 저장합니다 (유실 없이 속도만 늦춤).
+    """
+
+    def __init__(self, flush_fn: Callable[[List[Dict]], None], batch_size: int = 100,
+                 interval: float = 1.0, max_pending: int = 1000, enqueue_timeout: float = 0.5,
+                 name: str = "history-writer"):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_pending = max(max_pending, batch_size)
+        self.enqueue_timeout = enqueue_timeout
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        # 저장 중인 배치 (완료 전까지 조회에 포함)
+        self._inflight: List[Dict] = []
+        self._flush_lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._closed = False
+        self._stats = {"submitted": 0, "coalesced": 0, "flushed": 0, "batches": 0,
+                       "blocked": 0, "inline": 0, "failed": 0}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, entry: Dict, key: Optional[Hashable] = None) -> None:
+        """저장 예약 (key가 같은 대기 항목은 교체)"""
+        with self._cond:
+            self._stats["submitted"] += 1
+            if key is not None and key in self._pending:
+                self._pending[key] = entry
+                self._stats["coalesced"] += 1
+                return
+            if len(self._pending) >= self.max_pending and not self._closed:
+                self._stats["blocked"] += 1
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: len(self._pending) < self.max_pending or self._closed,
+                                    timeout=self.enqueue_timeout)
+            if self._closed or len(self._pending) >= self.max_pending:
+                inline = True
+            else:
+                inline = False
+                self._pending[key if key is not None else ("_", next(self._sequence))] = entry
+                if len(self._pending) >= self.batch_size:
+                    self._cond.notify_all()
+        if inline:
+            # 백그라운드 저장이 따라오지 못하거나 종료된 뒤의 요청
+            self._stats["inline"] += 1
+            self._write([entry])
+
+    def pending(self) -> List[Dict]:
+        """아직 저장되지 않은 항목 (저장 중 포함)"""
+        with self._cond:
+            return list(self._inflight) + list(self._pending.values())
+
+    def flush(self) -> int:
+        """대기 항목을 지금 저장하고 저장한 건수 반환"""
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._pending.values())
+                self._pending.clear()
+                self._inflight = batch
+                self._cond.notify_all()
+            if batch:
+                self._write(batch)
+            with self._cond:
+                self._inflight = []
+            return len(batch)
+
+    def _write(self, batch: List[Dict]) -> None:
+        try:
+            self.flush_fn(batch)
+            self._stats["flushed"] += len(batch)
+            self._stats["batches"] += 1
+        except Exception as e:
+            self._stats["failed"] += len(batch)
+            logger.error("history_flush_failed", count=len(batch), error=str(e))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.interval
+                while not self._closed and len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self, timeout: float = 10.0) -> None:
+        """백그라운드 스레드를 멈추고 남은 항목 저장 (프로세스 종료 시 자동 호출)"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending) + len(self._inflight)}
@@ -0,0 +1,169 @@
+# src/components/lexicon/lexicon.py
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+import time
+import structlog
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Optional
+from config.settings import settings
+from utils.aho_corasick import AhoCorasick, ScanResult
+
+logger = structlog.get_logger()
+
+# 컴파일 아티팩트 포맷 버전 (Lexicon 내부 구조 변경 시 증가)
+ARTIFACT_FORMAT = 1
+
+
+def _freeze(value: Any) -> Any:
+    """JSON 값을 읽기 전용 구조로 변환"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class Lexicon:
+    """프롬프트/영상 생성기가 공유하는 컴파일된 어휘 사전"""
+
+    def __init__(self, data: Dict[str, Any], checksum: str = ""):
+        self.data = data
+        self.checksum = checksum
+        self.automaton = AhoCorasick()
+
+        whole_word = set(data.get("whole_word_categories", []))
+        for category, entries in data["scan"].items():
+            self._register(category, entries, whole_word=category in whole_word)
+        for category, template in data["templates"].items():
+            self._register(f"category:{category}", template.get("keywords", []))
+        self.automaton.build()
+
+        self._compile()
+
+    def _register(self, category: str, entries: Iterable, whole_word: bool = False) -> None:
+        """사전 항목 등록 (등록 순서가 우선순위)"""
+        items = entries.items() if isinstance(entries, dict) else ((e, e) for e in entries)
+        for priority, (term, value) in enumerate(items):
+            self.automaton.add(term, category, value, priority=priority, whole_word=whole_word)
+
+    def _compile(self) -> None:
+        """읽기 전용 조회 구조 및 정규식 준비"""
+        data = self.data
+        self.version = str(data["version"])
+        self.templates = _freeze(data["templates"])
+        self.style_modifiers = _freeze(data["style_modifiers"])
+        self.quality_enhancers = _freeze(data["quality_enhancers"])
+        self.maps = _freeze(data["maps"])
+        self.rules = _freeze(data["rules"])
+        self.tables = _freeze(data["scan"])
+        self.patterns = MappingProxyType({
+            name: tuple(re.compile(pattern) for pattern in patterns)
+            for name, patterns in data["patterns"].items()
+        })
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # MappingProxyType은 pickle 불가 - 원본 데이터와 오토마톤만 저장
+        return {"data": self.data, "checksum": self.checksum, "automaton": self.automaton}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.data = state["data"]
+        self.checksum = state["checksum"]
+        self.automaton = state["automaton"]
+        self._compile()
+
+    def scan(self, text: str) -> ScanResult:
+        """입력 한 번 스캔으로 모든 카테고리 매칭 반환"""
+        return self.automaton.scan(text)
+
+
+def load_lexicon(path: Path) -> Lexicon:
+    """사전 파일 로드 - 같은 내용의 컴파일 아티팩트가 있으면 재사용"""
+    raw = path.read_bytes()
+    checksum = hashlib.sha256(raw).hexdigest()[:16]
+    artifact = Path(settings.DATA_DIR) / "cache" / f"lexicon-{ARTIFACT_FORMAT}-{checksum}.pickle"
+
+    if artifact.exists():
+        try:
+            with open(artifact, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning("lexicon_artifact_load_failed", path=str(artifact), error=str(e))
+
+    lexicon = Lexicon(json.loads(raw.decode("utf-8")), checksum)
+
+    try:
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = artifact.with_name(f"{artifact.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(lexicon, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(artifact)
+    except OSError as e:
+        logger.warning("lexicon_artifact_save_failed", path=str(artifact), error=str(e))
+    else:
+        _remove_stale_artifacts(artifact)
+
+    return lexicon
+
+
+def _remove_stale_artifacts(current: Path) -> None:
+    """새 아티팩트 교체 후 이전 사전/포맷의 아티팩트 삭제 (사전이 바뀔 때마다 파일이 쌓이지 않도록)"""
+    for stale in current.parent.glob("lexicon-*.pickle"):
+        if stale.name == current.name:
+            continue
+        try:
+            stale.unlink()
+        except FileNotFoundError:
+            pass  # 다른 프로세스가 먼저 삭제
+        except OSError as e:
+            logger.warning("lexicon_artifact_cleanup_failed", path=str(stale), error=str(e))
+
+
+_lexicon: Optional[Lexicon] = None
+_lexicon_mtime: Optional[int] = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def get_lexicon() -> Lexicon:
+    """프로세스 공유 Lexicon 반환 (사전 파일 변경 시 자동 리로드)"""
+    global _lexicon, _lexicon_mtime, _last_check
+
+    if _lexicon is not None and time.monotonic() - _last_check < settings.LEXICON_RELOAD_INTERVAL:
+        return _lexicon
+
+    with _lock:
+        now = time.monotonic()
+        if _lexicon is not None and now - _last_check < settings.LEXICON_RELOAD_INTERVAL:
+            return _lexicon
+        _last_check = now
+
+        path = Path(settings.LEXICON_PATH)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError as e:
+            if _lexicon is None:
+                raise
+            logger.warning("lexicon_stat_failed", path=str(path), error=str(e))
+            return _lexicon
+
+        if _lexicon is not None and mtime == _lexicon_mtime:
+            return _lexicon
+
+        try:
+            lexicon = load_lexicon(path)
+        except (OSError, ValueError, KeyError, re.error) as e:
+            if _lexicon is None:
+                raise
+            # 잘못된 사전 파일은 무시하고 기존 사전 유지
+            logger.error("lexicon_reload_failed", path=str(path), error=str(e))
+            _lexicon_mtime = mtime
+            return _lexicon
+
+        _lexicon, _lexicon_mtime = lexicon, mtime
+        logger.info("lexicon_loaded", version=lexicon.version, checksum=lexicon.checksum)
+        return _lexicon
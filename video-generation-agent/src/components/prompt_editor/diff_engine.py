@@ -0,0 +1,341 @@
+# src/components/prompt_editor/diff_engine.py
+# 단어/문자 단위 차이 계산 - 실제 토큰 위치와 묶인 교체(replace) 구간 반환
+# patience 방식으로 양쪽에 한 번씩만 나오는 토큰을 기준점으로 고정하고, 기준점 사이 구간만
+# Myers O(ND) 알고리즘으로 맞춥니다 (편집이 많은 긴 프롬프트도 탐색 범위가 작게 유지됨)
+import bisect
+import re
+from collections import Counter
+from itertools import accumulate
+from operator import add
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 공백/비공백 덩어리 (이어 붙이면 원문과 같음)
+_CHUNK_RE = re.compile(r"\s+|\S+")
+# 이보다 작은 구간은 기준점을 찾지 않고 바로 Myers로 맞춤
+_SMALL_GAP = 64
+
+# (태그, 원본 시작, 원본 끝, 수정본 시작, 수정본 끝) - difflib opcodes와 같은 형식, equal 제외
+Opcode = Tuple[str, int, int, int, int]
+
+
+def split_chunks(text: str) -> List[str]:
+    """공백/비공백 덩어리 목록 (이어 붙이면 원문과 같음)"""
+    return _CHUNK_RE.findall(text)
+
+
+def _spaced_words(text: str) -> Optional[List[str]]:
+    """단어 사이가 공백 한 칸이고 앞뒤 공백이 없는 텍스트(일반적인 프롬프트)의 단어 목록, 아니면 None"""
+    words = text.split()
+    return words if " ".join(words) == text else None
+
+
+def _spaced_offsets(words: List[str]) -> List[int]:
+    # 공백 한 칸 간격 단어의 시작 위치 (단어 길이 + 1 누적)
+    return list(map(add, accumulate(map(len, words[:-1]), initial=0), range(len(words))))
+
+
+def tokenize(text: str, mode: str = "word") -> Tuple[List[str], List[int]]:
+    """단어(공백 기준) 또는 문자 토큰 목록과 각 토큰의 원문 내 문자 위치"""
+    if mode == "char":
+        return list(text), list(range(len(text)))
+    words = _spaced_words(text)
+    if words is not None:
+        return words, _spaced_offsets(words)
+    # 공백/비공백 덩어리가 번갈아 나오므로 누적 길이에서 단어 위치만 골라냄
+    chunks = split_chunks(text)
+    start = 1 if chunks and chunks[0].isspace() else 0
+    offsets = list(accumulate(map(len, chunks), initial=0))
+    return chunks[start::2], offsets[start:len(chunks):2]
+
+
+def _myers(a: Sequence, b: Sequence) -> List[Tuple[int, int]]:
+    """a, b의 최장 공통 부분열 대응 (i, j) 목록 - Myers 탐욕 알고리즘 + 역추적"""
+    n, m = len(a), len(b)
+    if not n or not m:
+        return []
+    # 한쪽이 토큰 하나면 탐색 없이 첫 일치 위치
+    if n == 1:
+        return [(0, b.index(a[0]))] if a[0] in b else []
+    if m == 1:
+        return [(a.index(b[0]), 0)] if b[0] in a else []
+    offset = n + m + 1
+    v = [0] * (2 * offset + 1)
+    trace = []
+    for d in range(n + m + 1):
+        # d단계 시작 시점의 대각선 상태 (역추적용, 사용하는 범위만 복사)
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, a, b, d)
+    return []
+
+
+def _backtrack(trace: List[List[int]], a: Sequence, b: Sequence, depth: int) -> List[Tuple[int, int]]:
+    x, y = len(a), len(b)
+    matches = []
+    for d in range(depth, -1, -1):
+        v = trace[d]
+        base = d + 1  # trace[d]의 인덱스 0은 대각선 -d-1
+        k = x - y
+        if d == 0:
+            prev_k = 0
+        elif k == -d or (k != d and v[base + k - 1] < v[base + k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[base + prev_k] if d else 0
+        prev_y = prev_x - prev_k
+        # 대각선(일치) 구간
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        if d:
+            x, y = prev_x, prev_y
+    matches.reverse()
+    return matches
+
+
+def _unique_anchors(a: Sequence, b: Sequence) -> List[Tuple[int, int]]:
+    """양쪽에 한 번씩만 나오는 토큰 쌍 중 순서가 유지되는 최장 부분열 (patience 기준점)"""
+    count_a = Counter(a)
+    count_b = Counter(b)
+    position_b = {token: j for j, token in enumerate(b) if count_b[token] == 1}
+    pairs = [(i, position_b[token]) for i, token in enumerate(a)
+             if count_a[token] == 1 and token in position_b]
+    if not pairs:
+        return []
+    # j 기준 최장 증가 부분열 (O(k log k))
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        slot = bisect.bisect_left(tails, j)
+        if slot == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[slot] = j
+            tail_index[slot] = index
+        previous[index] = tail_index[slot - 1] if slot else -1
+    anchors = []
+    index = tail_index[-1]
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _matches(a: Sequence, b: Sequence, i0: int, i1: int, j0: int, j1: int,
+             out: List[Tuple[int, int]]) -> None:
+    """a[i0:i1], b[j0:j1]의 일치 쌍을 out에 순서대로 추가"""
+    # 공통 앞/뒷부분은 탐색에서 제외
+    while i0 < i1 and j0 < j1 and a[i0] == b[j0]:
+        out.append((i0, j0))
+        i0 += 1
+        j0 += 1
+    tail = []
+    while i0 < i1 and j0 < j1 and a[i1 - 1] == b[j1 - 1]:
+        i1 -= 1
+        j1 -= 1
+        tail.append((i1, j1))
+    if i0 < i1 and j0 < j1:
+        core_a = a[i0:i1]
+        core_b = b[j0:j1]
+        anchors = _unique_anchors(core_a, core_b) if (i1 - i0) * (j1 - j0) > _SMALL_GAP else []
+        if anchors:
+            # 기준점 사이 구간을 재귀적으로 처리 (한쪽이 비어 있으면 일치할 것이 없음)
+            pi, pj = 0, 0
+            for ai, aj in anchors + [(i1 - i0, j1 - j0)]:
+                if pi < ai and pj < aj:
+                    _matches(a, b, i0 + pi, i0 + ai, j0 + pj, j0 + aj, out)
+                out.append((i0 + ai, j0 + aj))
+                pi, pj = ai + 1, aj + 1
+            out.pop()
+        else:
+            out.extend((i0 + i, j0 + j) for i, j in _myers(core_a, core_b))
+    out.extend(reversed(tail))
+
+
+def diff_opcodes(a: Sequence, b: Sequence) -> List[Opcode]:
+    """a -> b 변경 구간 (삭제+추가가 붙어 있으면 replace 하나로 묶음)"""
+    matches: List[Tuple[int, int]] = []
+    _matches(a, b, 0, len(a), 0, len(b), matches)
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for mi, mj in matches + [(len(a), len(b))]:
+        if i < mi or j < mj:
+            tag = "replace" if i < mi and j < mj else ("delete" if i < mi else "insert")
+            opcodes.append((tag, i, mi, j, mj))
+        i, j = mi + 1, mj + 1
+    return opcodes
+
+
+def _char_opcodes(original: str, modified: str) -> List[Opcode]:
+    """문자 단위 변경 구간 - 단어 덩어리로 먼저 맞춘 뒤 바뀐 덩어리는 공통 앞/뒤 문자를 뺀 가운데만 변경으로
+
+    오타 수정처럼 한 곳만 바뀐 단어는 문자 diff와 결과가 같고, 서로 다른 단어로 바꾼 경우는
+    우연히 겹치는 글자로 잘게 쪼개지 않고 하나의 교체로 남습니다 (문자 단위 탐색 없음).
+    """
+    source = _spaced_words(original)
+    target = _spaced_words(modified)
+    if source is not None and target is not None:
+        return _spaced_char_opcodes(original, modified, source, target)
+    source = split_chunks(original)
+    target = split_chunks(modified)
+    source_offsets = list(accumulate(map(len, source), initial=0))
+    target_offsets = list(accumulate(map(len, target), initial=0))
+    return [_trimmed(original, modified, source_offsets[i1], source_offsets[i2], target_offsets[j1], target_offsets[j2])
+            for _, i1, i2, j1, j2 in diff_opcodes(source, target)]
+
+
+def _spaced_char_opcodes(original: str, modified: str, source: List[str], target: List[str]) -> List[Opcode]:
+    """공백 한 칸 간격 텍스트의 문자 단위 변경 구간 - 공백 덩어리 없이 단어만 맞춤 (토큰 수 절반)"""
+    # 마지막 단어 뒤에 가상의 공백이 있다고 보고 단어 구간을 "단어 + 뒤 공백" 문자 구간으로 변환
+    source_offsets = _spaced_offsets(source) + [len(original) + 1]
+    target_offsets = _spaced_offsets(target) + [len(modified) + 1]
+    opcodes: List[Opcode] = []
+    for _, i1, i2, j1, j2 in diff_opcodes(source, target):
+        if i2 == len(source):
+            # 끝까지 이어지는 구간은 앞 단어 뒤 공백부터 (끝에는 뒤 공백이 없음)
+            span = (max(source_offsets[i1] - 1, 0), len(original), max(target_offsets[j1] - 1, 0), len(modified))
+        else:
+            span = (source_offsets[i1], source_offsets[i2], target_offsets[j1], target_offsets[j2])
+        opcodes.append(_trimmed(original, modified, *span))
+    return opcodes
+
+
+def _trimmed(original: str, modified: str, c1: int, c2: int, d1: int, d2: int) -> Opcode:
+    # 바뀐 구간에서 공통 앞/뒤 문자를 뺀 가운데만 변경으로
+    prefix, suffix = common_affixes(original[c1:c2], modified[d1:d2])
+    c1, c2, d1, d2 = c1 + prefix, c2 - suffix, d1 + prefix, d2 - suffix
+    tag = "replace" if c1 < c2 and d1 < d2 else ("delete" if c1 < c2 else "insert")
+    return tag, c1, c2, d1, d2
+
+
+def common_affixes(a: Sequence, b: Sequence) -> Tuple[int, int]:
+    """공통 앞부분 길이와 (앞부분과 겹치지 않는) 공통 뒷부분 길이"""
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[len(a) - 1 - suffix] == b[len(b) - 1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+def diff_text(original: str, modified: str, mode: str = "word") -> Tuple[List[Dict], List[Dict]]:
+    """원본/수정본 차이 -> (변경 목록, 변경 구간 목록)
+
+    변경 목록의 position은 토큰 위치(삭제는 원본, 추가는 수정본 기준), offset은 문자 위치입니다.
+    word 모드는 단어마다 하나, char 모드는 연속된 문자 묶음마다 하나의 변경을 만듭니다.
+    """
+    source, source_offsets = tokenize(original, mode)
+    target, target_offsets = tokenize(modified, mode)
+    opcodes = _char_opcodes(original, modified) if mode == "char" else diff_opcodes(source, target)
+    return _render(original, modified, mode, source, source_offsets, target, target_offsets, opcodes)
+
+
+class IncrementalDiff:
+    """원본은 고정이고 수정본이 조금씩 바뀌는 경우의 diff
+
+    직전 수정본과 달라진 구간을 앞/뒤 공통 부분 제거로 찾고, 그 구간에 걸친 기존 변경 구간까지만
+    원본의 대응 구간과 다시 비교합니다. 나머지 변경 구간은 위치만 옮겨 재사용합니다.
+    """
+
+    def __init__(self, original: str, mode: str = "word"):
+        self.original = original
+        self.mode = mode
+        self.modified = original
+        self._source, self._source_offsets = tokenize(original, mode)
+        self._target, self._target_offsets = list(self._source), list(self._source_offsets)
+        self._opcodes: List[Opcode] = []
+
+    def update(self, modified: str) -> Tuple[List[Dict], List[Dict]]:
+        """수정본 갱신 후 원본 대비 (변경 목록, 변경 구간 목록)"""
+        if modified != self.modified:
+            target, target_offsets = tokenize(modified, self.mode)
+            old = self._target
+            prefix, suffix = common_affixes(old, target)
+            changed_start, changed_end = prefix, len(old) - suffix
+            shift = len(target) - len(old)
+
+            # 바뀐 구간과 겹치거나 맞닿은 변경 구간은 다시 계산, 앞/뒤 구간은 그대로 (뒤는 위치만 이동)
+            opcodes = self._opcodes
+            before = 0
+            while before < len(opcodes) and opcodes[before][4] < changed_start:
+                before += 1
+            after = len(opcodes)
+            while after > before and opcodes[after - 1][3] > changed_end:
+                after -= 1
+            middle = opcodes[before:after]
+            start = min([changed_start] + [op[3] for op in middle])
+            end = max([changed_end] + [op[4] for op in middle])
+            # 변경 구간 밖(일치 구간)에서는 원본 위치 = 수정본 위치 + 누적 길이 차
+            offset_before = opcodes[before - 1][2] - opcodes[before - 1][4] if before else 0
+            offset_after = opcodes[after][1] - opcodes[after][3] if after < len(opcodes) else len(self._source) - len(old)
+            window = self._window(start + offset_before, end + offset_after, start, end + shift, target, modified)
+            self._opcodes = (
+                opcodes[:before] + window
+                + [(tag, i1, i2, j1 + shift, j2 + shift) for tag, i1, i2, j1, j2 in opcodes[after:]]
+            )
+            self.modified = modified
+            self._target, self._target_offsets = target, target_offsets
+        return _render(self.original, self.modified, self.mode, self._source, self._source_offsets,
+                       self._target, self._target_offsets, self._opcodes)
+
+    def _window(self, i1: int, i2: int, j1: int, j2: int, target: List[str], modified: str) -> List[Opcode]:
+        if self.mode == "char":
+            window = _char_opcodes(self.original[i1:i2], modified[j1:j2])
+        else:
+            window = diff_opcodes(self._source[i1:i2], target[j1:j2])
+        return [(tag, i1 + a1, i1 + a2, j1 + b1, j1 + b2) for tag, a1, a2, b1, b2 in window]
+
+
+def _render(original: str, modified: str, mode: str, source: List[str], source_offsets: List[int],
+            target: List[str], target_offsets: List[int], opcodes: List[Opcode]) -> Tuple[List[Dict], List[Dict]]:
+    """변경 구간 -> (변경 목록, 변경 구간 목록)"""
+
+    def span(tokens: List[str], offsets: List[int], text: str, start: int, end: int) -> Tuple[int, int]:
+        if start >= end:
+            # 빈 구간은 다음 토큰(없으면 끝) 위치
+            offset = offsets[start] if start < len(offsets) else len(text)
+            return offset, offset
+        return offsets[start], offsets[end - 1] + len(tokens[end - 1])
+
+    changes: List[Dict] = []
+    hunks: List[Dict] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        removed_span = span(source, source_offsets, original, i1, i2)
+        added_span = span(target, target_offsets, modified, j1, j2)
+        hunks.append({
+            "type": tag,
+            "original": [i1, i2],
+            "modified": [j1, j2],
+            "removed": original[removed_span[0]:removed_span[1]],
+            "added": modified[added_span[0]:added_span[1]],
+        })
+        if mode == "char":
+            if i2 > i1:
+                changes.append({"type": "removed", "position": i1, "offset": removed_span[0],
+                                "content": original[removed_span[0]:removed_span[1]]})
+            if j2 > j1:
+                changes.append({"type": "added", "position": j1, "offset": added_span[0],
+                                "content": modified[added_span[0]:added_span[1]]})
+            continue
+        changes.extend({"type": "removed", "position": i, "offset": source_offsets[i], "content": source[i]}
+                       for i in range(i1, i2))
+        changes.extend({"type": "added", "position": j, "offset": target_offsets[j], "content": target[j]}
+                       for j in range(j1, j2))
+    return changes, hunks
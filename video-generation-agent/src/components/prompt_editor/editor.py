@@ -1,36 +1,75 @@
 # 프롬프트 편집기 코드
-import difflib
 import json
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Deque, Dict, List, Any, Optional
+from config.settings import settings
+from components.prompt_editor.diff_engine import diff_text
+from components.prompt_editor.revisions import RevisionChain
+
+def summarize_changes(changes: List[Dict], original: str, modified: str) -> Dict[str, Any]:
+    """변경 목록 요약 (편집기 인스턴스 없이 히스토리 복원 등에서도 사용)"""
+    added = len([c for c in changes if c["type"] == "added"])
+    removed = len([c for c in changes if c["type"] == "removed"])
+    
+    # 변경 유형 분석
+    change_types = []
+    if added > removed and added > 0:
+        change_types.append("세부 정보 추가")
+    if removed > added and removed > 0:
+        change_types.append("단순화")
+    if added > 0 and removed > 0:
+        change_types.append("내용 변경")
+    if added == 0 and removed == 0:
+        change_types.append("변경 없음")
+    
+    # 단어 수 변화
+    word_count_diff = len(modified.split()) - len(original.split())
+    
+    return {
+        "total_changes": added + removed,
+        "added_words": added,
+        "removed_words": removed,
+        "change_types": change_types,
+        "word_count_diff": word_count_diff,
+        "improved": word_count_diff > 0  # 단어 수 증가를 개선으로 간주
+    }
 
 class PromptEditor:
-    def __init__(self):
-        self.edit_history = []
+    def __init__(self, max_history: Optional[int] = None, max_revisions: Optional[int] = None):
+        # 최근 결과만 보관하는 링 버퍼
+        self.edit_history: Deque[Dict[str, Any]] = deque(maxlen=max_history or settings.PROMPT_EDIT_HISTORY_SIZE)
+        self.max_revisions = max_revisions or settings.PROMPT_MAX_REVISIONS
+        self.revisions: Optional[RevisionChain] = None
     
-    def generate_diff(self, original: str, modified: str) -> Dict[str, Any]:
-        """원본과 수정된 프롬프트 간의 차이 생성"""
-        # diff 생성
-        diff = difflib.ndiff(original.split(), modified.split())
-        
-        # 변경 사항 분석
-        changes = []
-        for i, line in enumerate(diff):
-            if line.startswith('- '):
-                # 삭제된 단어
-                changes.append({
-                    "type": "removed",
-                    "position": i,
-                    "content": line[2:]
-                })
-            elif line.startswith('+ '):
-                # 추가된 단어
-                changes.append({
-                    "type": "added",
-                    "position": i,
-                    "content": line[2:]
-                })
+    def generate_diff(self, original: str, modified: str, mode: str = "word") -> Dict[str, Any]:
+        """원본과 수정된 프롬프트 간의 차이 생성 (mode: word | char)"""
+        # 변경 사항 분석 - position은 토큰 위치, hunks는 묶인 변경 구간
+        changes, hunks = diff_text(original, modified, mode)
+        return self._build_result(original, modified, mode, changes, hunks)
+    
+    def track_edit(self, original: str, modified: str, mode: str = "word") -> Dict[str, Any]:
+        """편집을 리비전 체인에 기록하고 원본 대비 차이 반환
         
+        같은 원본의 연속 편집은 직전 리비전 대비 변경분만 계산해 저장하고,
+        원본 대비 diff는 리비전이 바뀐 경우에만 다시 계산합니다.
+        """
+        if self.revisions is None or self.revisions.original != original:
+            self.revisions = RevisionChain(original, self.max_revisions)
+        revision = self.revisions.append(modified)
+        changes, hunks = self.revisions.diff(mode)
+        result = self._build_result(original, modified, mode, changes, hunks)
+        result["revision"] = self.revisions.head
+        if revision is not None:
+            result["step"] = {
+                "hunks": len(revision.edits),
+                "added_words": revision.added_words,
+                "removed_words": revision.removed_words
+            }
+        return result
+    
+    def _build_result(self, original: str, modified: str, mode: str,
+                      changes: List[Dict], hunks: List[Dict]) -> Dict[str, Any]:
         # 변경 사항 요약
         summary = self._generate_summary(changes, original, modified)
         
@@ -39,7 +78,9 @@ class PromptEditor:
             "timestamp": datetime.now().isoformat(),
             "original": original,
             "modified": modified,
+            "mode": mode,
             "changes": changes,
+            "hunks": hunks,
             "summary": summary
         }
         
@@ -50,32 +91,12 @@ class PromptEditor:
     
     def _generate_summary(self, changes: List[Dict], original: str, modified: str) -> Dict[str, Any]:
         """변경 사항 요약 생성"""
-        added = len([c for c in changes if c["type"] == "added"])
-        removed = len([c for c in changes if c["type"] == "removed"])
-        
-        # 변경 유형 분석
-        change_types = []
-        if added > removed and added > 0:
-            change_types.append("세부 정보 추가")
-        if removed > added and removed > 0:
-            change_types.append("단순화")
-        if added > 0 and removed > 0:
-            change_types.append("내용 변경")
-        if added == 0 and removed == 0:
-            change_types.append("변경 없음")
-        
-        # 단어 수 변화
-        word_count_diff = len(modified.split()) - len(original.split())
-        
-        return {
-            "total_changes": added + removed,
-            "added_words": added,
-            "removed_words": removed,
-            "change_types": change_types,
-            "word_count_diff": word_count_diff,
-            "improved": word_count_diff > 0  # 단어 수 증가를 개선으로 간주
-        }
+        return summarize_changes(changes, original, modified)
     
     def get_edit_history(self) -> List[Dict[str, Any]]:
-        """편집 이력 반환"""
-        return self.edit_history
\ No newline at end of file
+        """편집 이력 반환 (최근 PROMPT_EDIT_HISTORY_SIZE개)"""
+        return list(self.edit_history)
+    
+    def get_revisions(self) -> List[Dict[str, Any]]:
+        """현재 원본 프롬프트의 리비전 요약 (최근 PROMPT_MAX_REVISIONS개)"""
+        return self.revisions.revisions() if self.revisions else []
\ No newline at end of file
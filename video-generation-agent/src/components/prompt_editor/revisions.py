@@ -0,0 +1,126 @@
+# src/components/prompt_editor/revisions.py
+# 편집 리비전 체인 - 리비전마다 직전 리비전 대비 변경분만 저장하고, 원본 대비 diff는 바뀐 구간만 다시 계산
+# 최근 max_revisions개만 링 버퍼로 보관 (밀려난 리비전의 변경분은 기준 텍스트에 합쳐짐)
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+from components.prompt_editor.diff_engine import IncrementalDiff, common_affixes, split_chunks
+
+# (직전 리비전 덩어리 시작, 끝, 대체 덩어리) - 공백/비공백 덩어리 기준
+Edit = Tuple[int, int, Tuple[str, ...]]
+
+
+@dataclass
+class Revision:
+    """리비전 하나 (직전 리비전 대비 변경분)"""
+    number: int
+    timestamp: str
+    edits: List[Edit]
+    added_words: int
+    removed_words: int
+
+
+def _apply(chunks: List[str], edits: List[Edit]) -> List[str]:
+    result: List[str] = []
+    position = 0
+    for i1, i2, inserted in edits:
+        result.extend(chunks[position:i1])
+        result.extend(inserted)
+        position = i2
+    result.extend(chunks[position:])
+    return result
+
+
+def _count_words(chunks) -> int:
+    return sum(1 for chunk in chunks if not chunk.isspace())
+
+
+class RevisionChain:
+    """원본 프롬프트 하나에 대한 편집 리비전 체인"""
+
+    def __init__(self, original: str, max_revisions: int = 100):
+        self.original = original
+        self.max_revisions = max(1, max_revisions)
+        self._revisions: Deque[Revision] = deque()
+        # 보관 중인 가장 오래된 리비전의 직전 상태 (처음에는 원본)
+        self._floor: List[str] = split_chunks(original)
+        self._floor_number = 0
+        self._chunks: List[str] = list(self._floor)
+        self._text = original
+        # mode -> 원본 대비 증분 diff, (리비전 번호, mode) -> 원본 대비 (changes, hunks)
+        self._diffs: Dict[str, IncrementalDiff] = {}
+        self._composed: Dict[Tuple[int, str], Tuple[List[Dict], List[Dict]]] = {}
+
+    @property
+    def head(self) -> int:
+        """현재 리비전 번호 (편집 전 0)"""
+        return self._revisions[-1].number if self._revisions else self._floor_number
+
+    @property
+    def current(self) -> str:
+        return self._text
+
+    def append(self, text: str) -> Optional[Revision]:
+        """새 리비전 추가 - 직전 리비전과 같으면 None"""
+        if text == self._text:
+            return None
+        chunks = split_chunks(text)
+        # 직전 리비전 대비 변경분은 앞/뒤 공통 부분을 뺀 구간 하나 (별도 diff 없음)
+        prefix, suffix = common_affixes(self._chunks, chunks)
+        edits = [(prefix, len(self._chunks) - suffix, tuple(chunks[prefix:len(chunks) - suffix]))]
+        revision = Revision(
+            number=self.head + 1,
+            timestamp=datetime.now().isoformat(),
+            edits=edits,
+            added_words=sum(_count_words(inserted) for _, _, inserted in edits),
+            removed_words=sum(_count_words(self._chunks[i1:i2]) for i1, i2, _ in edits)
+        )
+        if len(self._revisions) >= self.max_revisions:
+            oldest = self._revisions.popleft()
+            self._floor = _apply(self._floor, oldest.edits)
+            self._floor_number = oldest.number
+        self._revisions.append(revision)
+        self._chunks = chunks
+        self._text = text
+        self._composed.clear()
+        return revision
+
+    def text_at(self, number: int) -> str:
+        """리비전 번호의 텍스트 (0은 원본, 링 버퍼에서 밀려난 리비전은 KeyError)"""
+        if number == 0:
+            return self.original
+        if number == self.head:
+            return self._text
+        if not self._floor_number <= number <= self.head:
+            raise KeyError(number)
+        chunks = self._floor
+        for revision in self._revisions:
+            if revision.number > number:
+                break
+            chunks = _apply(chunks, revision.edits)
+        return "".join(chunks)
+
+    def diff(self, mode: str = "word") -> Tuple[List[Dict], List[Dict]]:
+        """원본 대비 현재 리비전의 (changes, hunks)
+
+        리비전이 바뀔 때만, 직전에 계산한 수정본과 달라진 구간 주변만 원본과 다시 비교합니다.
+        """
+        key = (self.head, mode)
+        composed = self._composed.get(key)
+        if composed is None:
+            incremental = self._diffs.get(mode)
+            if incremental is None:
+                incremental = self._diffs[mode] = IncrementalDiff(self.original, mode)
+            composed = self._composed[key] = incremental.update(self._text)
+        return composed
+
+    def revisions(self) -> List[Dict]:
+        """보관 중인 리비전 요약 (오래된 순)"""
+        return [{
+            "revision": revision.number,
+            "timestamp": revision.timestamp,
+            "hunks": len(revision.edits),
+            "added_words": revision.added_words,
+            "removed_words": revision.removed_words
+        } for revision in self._revisions]
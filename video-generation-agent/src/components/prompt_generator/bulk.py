@@ -0,0 +1,260 @@
+# src/components/prompt_generator/bulk.py
+# 대량 프롬프트 생성 CLI - JSONL/CSV 입력을 스트리밍으로 읽어 프로세스 풀에서 처리
+# 사용 예 (src 디렉토리에서):
+#   python -m components.prompt_generator.bulk concepts.jsonl -o prompts.jsonl --workers 8
+#   python -m components.prompt_generator.bulk concepts.jsonl -o prompts.jsonl --cache  # Redis 캐시 사용
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+import structlog
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+from components.cache.cache_manager import CacheManager
+from components.prompt_generator.generator import PreparedInput, PromptGenerator
+
+logger = structlog.get_logger()
+
+DEFAULT_CHUNK_SIZE = 500
+
+# 워커 프로세스별 생성기 (프로세스 초기화 시 생성)
+_worker_generator: Optional[PromptGenerator] = None
+
+
+class InvalidInput(NamedTuple):
+    """읽을 수 없는 입력 줄 - 생성하지 않고 오류 레코드로 출력"""
+    line: int
+    raw: str
+    error: str
+
+
+def _init_worker() -> None:
+    """워커 프로세스 초기화 - 사전 로드는 프로세스당 한 번"""
+    global _worker_generator
+    _worker_generator = PromptGenerator()
+
+
+def _process_chunk(chunk: List[Union[str, PreparedInput]]) -> List[Dict[str, Any]]:
+    """청크 단위 프롬프트 생성 (워커에서 실행, 준비된 입력은 캐시 키와 같은 품질 후보로 생성)"""
+    return _worker_generator.generate_batch(chunk)
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _invalid(line_no: int, raw: str, error: str) -> InvalidInput:
+    logger.warning("bulk_invalid_line", line=line_no, error=error)
+    return InvalidInput(line_no, raw, error)
+
+
+def read_inputs(stream: TextIO, fmt: str = "jsonl", field: str = "input") -> Iterator[Union[str, InvalidInput]]:
+    """입력 스트림에서 콘셉트 문자열을 순서대로 읽기
+
+    JSONL 각 줄은 JSON 문자열 또는 `field` 키를 가진 객체,
+    CSV는 헤더의 `field` 컬럼을 사용합니다. 읽을 수 없는 줄은 InvalidInput으로 전달합니다.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            value = row.get(field)
+            if value:
+                yield value
+            else:
+                yield _invalid(reader.line_num, json.dumps(row, ensure_ascii=False), f"missing field: {field}")
+        return
+
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield _invalid(line_no, line, str(e))
+            continue
+        if isinstance(record, str):
+            yield record
+        elif isinstance(record, dict):
+            value = record.get(field)
+            if value:
+                yield str(value)
+            else:
+                yield _invalid(line_no, line, f"missing field: {field}")
+        else:
+            # 문자열/객체가 아닌 JSON 값 (숫자, 배열 등)
+            yield _invalid(line_no, line, f"unsupported JSON type: {type(record).__name__}")
+
+
+def _error_record(invalid: InvalidInput) -> Dict[str, Any]:
+    """읽을 수 없는 줄의 출력 레코드 (생성 실패 결과와 같은 형태)"""
+    return {
+        "original_input": invalid.raw,
+        "category": "error",
+        "optimized_prompt": f"Error: invalid input on line {invalid.line}: {invalid.error}",
+        "metadata": {"line": invalid.line}
+    }
+
+
+def _split_invalid(chunk: List[Union[str, InvalidInput]]) -> Tuple[List[str], Dict[int, Dict[str, Any]]]:
+    """청크를 생성할 입력과 (청크 내 위치 -> 오류 레코드)로 분리"""
+    texts = []
+    errors = {}
+    for index, item in enumerate(chunk):
+        if isinstance(item, InvalidInput):
+            errors[index] = _error_record(item)
+        else:
+            texts.append(item)
+    return texts, errors
+
+
+def _with_errors(results: List[Dict[str, Any]], errors: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """오류 레코드를 원래 위치에 다시 끼워 넣기"""
+    if not errors:
+        return results
+    merged = []
+    fresh = iter(results)
+    for index in range(len(results) + len(errors)):
+        merged.append(errors[index] if index in errors else next(fresh))
+    return merged
+
+
+def _split_cached(chunk: List[str], cache: Optional[CacheManager], keyer: Optional[PromptGenerator]
+                  ) -> Tuple[Optional[List[str]], Dict[str, Dict], List[Union[str, PreparedInput]]]:
+    """청크를 캐시 적중분과 새로 생성할 입력으로 분리 (MGET 한 번)
+
+    새로 생성할 입력은 캐시 키를 만든 스냅샷 그대로 넘겨, 워커의 편집 패턴 상태와 관계없이
+    키에 맞는 결과를 저장합니다.
+    """
+    if cache is None:
+        return None, {}, chunk
+    prepared = keyer.prepare_batch(chunk)
+    keys = [item.cache_key for item in prepared]
+    cached = cache.get_many(keys)
+    return keys, cached, [item for item in prepared if item.cache_key not in cached]
+
+
+def _merge_cached(chunk: List[str], keys: Optional[List[str]], cached: Dict[str, Dict],
+                  generated: List[Dict[str, Any]], cache: Optional[CacheManager]) -> List[Dict[str, Any]]:
+    """생성 결과를 캐시에 저장(파이프라인 한 번)하고 입력 순서대로 합치기
+
+    캐시 키는 정규화된 입력 기준이므로 적중 결과는 복사해 현재 줄의 원본 입력으로 바꾸고,
+    생성 실패(error) 결과는 저장하지 않습니다.
+    """
+    if keys is None:
+        return generated
+    fresh = iter(generated)
+    merged = []
+    to_store = {}
+    for text, key in zip(chunk, keys):
+        if key in cached:
+            result = dict(cached[key])
+            result["original_input"] = text
+            merged.append(result)
+        else:
+            result = next(fresh)
+            merged.append(result)
+            if result.get("category") != "error":
+                to_store[key] = result
+    if to_store:
+        cache.set_many(to_store)
+    return merged
+
+
+def generate_bulk(inputs: Iterable[Union[str, InvalidInput]], workers: int = 1,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  cache: Optional[CacheManager] = None) -> Iterator[Dict[str, Any]]:
+    """입력 순서를 유지하며 프롬프트를 생성하는 스트리밍 제너레이터
+
+    cache가 주어지면 청크마다 캐시를 일괄 조회해 적중하지 않은 입력만 생성하고,
+    생성 결과를 일괄 저장합니다. InvalidInput은 생성 없이 오류 레코드로 출력합니다.
+    """
+    chunks = _chunked(inputs, chunk_size)
+    keyer = PromptGenerator() if cache is not None else None
+
+    if workers <= 1:
+        generator = keyer or PromptGenerator()
+        for chunk in chunks:
+            texts, errors = _split_invalid(chunk)
+            keys, cached, misses = _split_cached(texts, cache, keyer)
+            yield from _with_errors(_merge_cached(texts, keys, cached, generator.generate_batch(misses), cache), errors)
+        return
+
+    # 처리 중인 청크 수를 워커 수의 2배로 제한 (메모리 상한)
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in chunks:
+            texts, errors = _split_invalid(chunk)
+            keys, cached, misses = _split_cached(texts, cache, keyer)
+            pending.append((texts, errors, keys, cached, pool.submit(_process_chunk, misses)))
+            if len(pending) >= max_in_flight:
+                texts, errors, keys, cached, future = pending.popleft()
+                yield from _with_errors(_merge_cached(texts, keys, cached, future.result(), cache), errors)
+        while pending:
+            texts, errors, keys, cached, future = pending.popleft()
+            yield from _with_errors(_merge_cached(texts, keys, cached, future.result(), cache), errors)
+
+
+def run(input_path: str, output_path: str, fmt: Optional[str] = None,
+        field: str = "input", workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE, use_cache: bool = False) -> int:
+    """파일 단위 대량 생성 실행 - 처리한 건수 반환"""
+    if fmt is None:
+        fmt = "csv" if input_path.lower().endswith(".csv") else "jsonl"
+
+    if input_path == "-":
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    else:
+        source = open(input_path, "r", encoding="utf-8", newline="")
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    count = 0
+    with source, open(output_path, "w", encoding="utf-8") as sink:
+        inputs = read_inputs(source, fmt=fmt, field=field)
+        cache = CacheManager() if use_cache else None
+        for result in generate_bulk(inputs, workers=workers, chunk_size=chunk_size, cache=cache):
+            sink.write(json.dumps(result, ensure_ascii=False))
+            sink.write("\n")
+            count += 1
+
+    elapsed = time.perf_counter() - started
+    logger.info("bulk_generation_complete", count=count, seconds=round(elapsed, 2),
+                per_second=round(count / elapsed, 1) if elapsed else None)
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="대량 프롬프트 생성 (JSONL/CSV -> JSONL)")
+    parser.add_argument("input", help="입력 파일 경로 (- 는 표준 입력)")
+    parser.add_argument("-o", "--output", required=True, help="출력 JSONL 파일 경로")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None,
+                        help="입력 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--field", default="input", help="콘셉트가 담긴 필드/컬럼 이름")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="워커 프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="워커에 전달할 청크 크기")
+    parser.add_argument("--cache", action="store_true",
+                        help="Redis 캐시에서 기존 결과를 읽고 새 결과를 저장")
+    args = parser.parse_args(argv)
+
+    run(args.input, args.output, fmt=args.format, field=args.field,
+        workers=args.workers, chunk_size=args.chunk_size, use_cache=args.cache)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,31 @@
 # src/components/prompt_generator/generator.py
 import structlog
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 import re
+import hashlib
+import unicodedata
 from datetime import datetime
 import random
+from config.settings import settings
+from components.history.edit_patterns import get_edit_patterns
+from components.lexicon.lexicon import get_lexicon
+from components.prompt_generator.template import FALLBACK_STRUCTURE, compile_template
+from components.prompt_generator.tokenizer import Tokenizer, TokenizedText, get_tokenizer
+from utils.aho_corasick import ScanResult
+from utils.ttl_cache import TTLCache
 
 
 logger = structlog.get_logger()
 
+# 입력 정규화 패턴
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s.,!?~…。、！？，．·\-]+$')
+
+# 캐시 키 스키마 버전 (정규화/결과 구조 변경 시 증가)
+CACHE_KEY_VERSION = 3
+
 class PromptCategory(Enum):
     """프롬프트 카테고리"""
     ANIMAL = "animal"
@@ -29,99 +45,137 @@ class ExtractedElements:
     quality: str
     metadata: Dict[str, Any]
 
+@dataclass(frozen=True)
+class PreparedInput:
+    """캐시 키와 생성이 함께 쓰는 입력 스냅샷 (키를 만든 뒤 편집 패턴이 바뀌어도 같은 품질 후보로 생성)"""
+    user_input: str
+    normalized: str
+    cache_key: str
+    quality_candidates: Tuple[str, ...]
+
 class PromptGenerator:
-    def __init__(self):
+    # 파싱 단계 메모이제이션 - Streamlit 재실행마다 인스턴스가 새로 생기므로 클래스 단위로 공유
+    _parse_cache = TTLCache(settings.PROMPT_MEMO_SIZE, settings.PROMPT_MEMO_TTL)
+    _category_cache = TTLCache(settings.PROMPT_MEMO_SIZE, settings.PROMPT_MEMO_TTL)
+    
+    def __init__(self, tokenizer: Optional[Tokenizer] = None,
+                 deterministic: Optional[bool] = None, seed: int = 0):
+        self.tokenizer = tokenizer or get_tokenizer(settings.TOKENIZER_BACKEND)
+        # 결정적 모드: 같은 정규화 입력은 항상 같은 프롬프트 생성
+        self.deterministic = settings.PROMPT_DETERMINISTIC if deterministic is None else deterministic
+        self.seed = seed
+        self.lexicon = None
+        self._sync_lexicon()
+    
+    def _sync_lexicon(self) -> None:
+        """어휘 사전이 바뀌었으면 템플릿과 매핑 갱신 (핫 리로드)"""
+        lexicon = get_lexicon()
+        if lexicon is self.lexicon:
+            return
+        
+        self.lexicon = lexicon
         self.templates = self._load_templates()
         self.style_modifiers = self._load_style_modifiers()
-        # 품질 향상 문구 최적화
-        self.quality_enhancers = [
-            "high quality", 
-            "4K resolution", 
-            "professional lighting",
-            "detailed textures",
-            "professional composition"
-        ]
-        
-        # 한국어-영어 주제 매핑
-        self.korean_subject_map = {
-            "영상": "scene",
-            "강아지": "puppy",
-            "고양이": "cat",
-            "사람": "person",
-            "여성": "woman",
-            "여자": "woman",
-            "남성": "man",
-            "남자": "man",
-            "아이": "child",
-            "아기": "baby",
-            "풍경": "landscape",
-            "자연": "nature",
-            "숲": "forest",
-            "하늘": "sky",
-            "바다": "ocean",
-            "도시": "city",
-            "산": "mountain"
-        }
-        
-        # 한국어 동사 매핑
-        self.korean_verb_map = {
-            "뛰노는": "playfully running",
-            "달리는": "running",
-            "걷는": "walking",
-            "서있는": "standing",
-            "앉아있는": "sitting",
-            "움직이는": "moving",
-            "하는": "doing",
-            "보는": "looking",
-            "먹는": "eating",
-            "노는": "playing",
-            "쉬는": "resting",
-            "자는": "sleeping",
-            "점프하는": "jumping",
-            "춤추는": "dancing",
-            "부르는": "singing",
-            "노래하는": "singing"
-        }
+        # 품질 향상 문구
+        self.quality_enhancers = lexicon.quality_enhancers
+        # 한국어-영어 주제/동사 매핑
+        self.korean_subject_map = lexicon.maps["subject"]
+        self.korean_verb_map = lexicon.maps["verb"]
     
     def _load_templates(self) -> Dict[PromptCategory, Dict[str, str]]:
         """프롬프트 템플릿 로드"""
         return {
-            PromptCategory.ANIMAL: {
-                # 템플릿 구조 개선
-                "structure": "{adjective} {animal} {action} in {environment}, {style}, {quality}",
-                "keywords": ["dog", "cat", "puppy", "강아지", "고양이", "동물", "pet", "animal"]
-            },
-            PromptCategory.LANDSCAPE: {
-                "structure": "{style} {scene_type} with {elements}, {lighting} lighting, {quality}",
-                "keywords": ["landscape", "scenery", "풍경", "자연", "mountain", "ocean", "nature"]
-            },
-            PromptCategory.PERSON: {
-                "structure": "{adjective} {subject} {doing} in {environment}, {style}, {quality}",
-                "keywords": ["person", "woman", "man", "child", "baby", "people", "사람", "여성", "남성", "아이", "아기", "portrait", "character", "human"]
-            },
-            PromptCategory.GENERAL: {
-                "structure": "{description}, {style}, {quality}",
-                "keywords": []
-            }
+            PromptCategory(name): template
+            for name, template in self.lexicon.templates.items()
         }
     
     def _load_style_modifiers(self) -> Dict[str, List[str]]:
         """스타일 수정자 로드"""
-        return {
-            "bright": ["vibrant", "illuminated", "sunlit", "radiant"],
-            "dark": ["moody", "dramatic", "shadowy", "atmospheric"],
-            "cute": ["adorable", "charming", "endearing", "delightful"],
-            "beautiful": ["stunning", "gorgeous", "elegant", "magnificent"],
-            "pretty": ["lovely", "attractive", "charming", "delightful"],
-            "action": ["dynamic", "energetic", "motion", "movement"],
-            "calm": ["peaceful", "serene", "tranquil", "relaxing"]
+        return self.lexicon.style_modifiers
+    
+    def normalize_input(self, text: str) -> str:
+        """입력 정규화 - 유니코드(NFC), 공백, 끝 문장부호, 대소문자 통일"""
+        text = unicodedata.normalize("NFC", text or "")
+        text = _WHITESPACE.sub(" ", text).strip()
+        text = _TRAILING_PUNCTUATION.sub("", text)
+        return text.lower()
+    
+    def cache_key(self, user_input: str) -> str:
+        """정규화된 입력 기반 캐시 키 (사전이나 입력 카테고리의 우선 품질 문구가 바뀌면 키도 바뀜)"""
+        return self.prepare(user_input).cache_key
+    
+    def prepare(self, user_input: str, tokens: Optional[TokenizedText] = None) -> PreparedInput:
+        """캐시 키와 품질 후보를 같은 편집 패턴 스냅샷에서 계산 (생성 시 그대로 전달)"""
+        self._sync_lexicon()
+        normalized = self.normalize_input(user_input)
+        try:
+            category = self._determine_category(self._parse_input(normalized, tokens).subject)
+        except Exception:
+            # 생성 단계에서 다시 실패해 오류 결과가 되고, 오류 결과는 캐시하지 않음
+            category = PromptCategory.GENERAL
+        version, candidates = self._quality_preference(category)
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        mode = f"d{self.seed}" if self.deterministic else "r"
+        if version:
+            mode += f"p{version}"
+        key = f"prompt:v{CACHE_KEY_VERSION}:{self.lexicon.checksum}:{mode}:{digest[:32]}"
+        return PreparedInput(user_input, normalized, key, candidates)
+    
+    def prepare_batch(self, user_inputs: Iterable[Union[str, PreparedInput]]) -> List[PreparedInput]:
+        """여러 입력 준비 (메모이제이션되지 않은 입력만 배치 토큰화, 이미 준비된 입력은 그대로)"""
+        self._sync_lexicon()
+        user_inputs = list(user_inputs)
+        normalized = {
+            user_input: self.normalize_input(user_input)
+            for user_input in user_inputs if not isinstance(user_input, PreparedInput)
         }
+        misses = [
+            text for text in dict.fromkeys(normalized.values())
+            if self._parse_key(text) not in self._parse_cache
+        ]
+        tokenized = dict(zip(misses, self.tokenizer.tokenize_batch(misses)))
+        return [
+            user_input if isinstance(user_input, PreparedInput)
+            else self.prepare(user_input, tokenized.get(normalized[user_input]))
+            for user_input in user_inputs
+        ]
+    
+    def _quality_preference(self, category: PromptCategory) -> Tuple[str, Tuple[str, ...]]:
+        """카테고리의 (편집 패턴 버전, 품질 문구 후보) - 편집 패턴을 쓰지 않으면 버전 없이 전체 후보"""
+        if not settings.EDIT_PATTERNS_ENABLED:
+            return "", tuple(self.quality_enhancers)
+        return get_edit_patterns().preference(category.value, self.quality_enhancers)
     
-    async def generate_prompt(self, user_input: str) -> Dict[str, Any]:
+    async def generate_prompt(self, user_input: str,
+                              prepared: Optional[PreparedInput] = None) -> Dict[str, Any]:
         """메인 프롬프트 생성 메서드"""
+        return self.generate_prompt_sync(user_input, prepared=prepared)
+    
+    def generate_batch(self, user_inputs: Iterable[Union[str, PreparedInput]]) -> List[Dict[str, Any]]:
+        """여러 입력 일괄 처리 (I/O가 없으므로 동기 실행, 토큰화는 배치 단위)"""
+        return [
+            self.generate_prompt_sync(prepared.user_input, prepared=prepared)
+            for prepared in self.prepare_batch(user_inputs)
+        ]
+    
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """파싱/카테고리 메모이제이션 적중 통계"""
+        return {
+            "parse": self._parse_cache.stats(),
+            "category": self._category_cache.stats()
+        }
+    
+    def generate_prompt_sync(self, user_input: str, tokens: Optional[TokenizedText] = None,
+                             prepared: Optional[PreparedInput] = None) -> Dict[str, Any]:
+        """프롬프트 생성 (동기 버전, prepared가 있으면 캐시 키와 같은 품질 후보 사용)"""
         try:
+            if prepared is None:
+                prepared = self.prepare(user_input, tokens)
+            self._sync_lexicon()
+            normalized = prepared.normalized
+            
             # 1. 입력 분석
-            extracted = self._parse_input(user_input)
+            extracted = self._parse_input(normalized, tokens)
             
             # 2. 카테고리 결정
             category = self._determine_category(extracted.subject)
@@ -130,7 +184,7 @@ class PromptGenerator:
             template = self.templates[category]
             
             # 4. 프롬프트 구성
-            optimized_prompt = self._build_prompt(extracted, template)
+            optimized_prompt = self._build_prompt(extracted, template, prepared.quality_candidates)
             
             # 5. 결과 반환
             return {
@@ -138,6 +192,7 @@ class PromptGenerator:
                 "category": category.value,
                 "optimized_prompt": optimized_prompt,
                 "metadata": {
+                    "normalized_input": normalized,
                     "parsed_elements": {
                         "subject": extracted.subject,
                         "action": extracted.action,
@@ -158,21 +213,38 @@ class PromptGenerator:
                 "metadata": {}
             }
     
-    def _parse_input(self, text: str) -> ExtractedElements:
-        """입력 텍스트 파싱"""
-        # 간단한 정규표현식 기반 파싱
-        words = text.lower().split()
+    def _parse_key(self, text: str) -> tuple:
+        """파싱 메모 키 - 사전 내용이나 토크나이저가 바뀌면 다른 키"""
+        return (self.lexicon.checksum, self.tokenizer.name, text)
+    
+    def _parse_input(self, text: str, tokens: Optional[TokenizedText] = None) -> ExtractedElements:
+        """입력 텍스트 파싱 (정규화된 입력 단위로 메모이제이션)"""
+        key = self._parse_key(text)
+        extracted = self._parse_cache.get(key)
+        if extracted is None:
+            extracted = self._extract_elements(text, tokens)
+            self._parse_cache.set(key, extracted)
+        return extracted
+    
+    def _extract_elements(self, text: str, tokens: Optional[TokenizedText] = None) -> ExtractedElements:
+        """입력 텍스트에서 프롬프트 요소 추출"""
+        # 품사 후보 토큰화 (정규식 또는 spaCy 백엔드)
+        if tokens is None:
+            tokens = self.tokenizer.tokenize(text)
+        
+        # 사전 단어 매칭 (한 번의 스캔으로 모든 카테고리)
+        scan = self.lexicon.scan(text)
         
         # 명사, 형용사, 동사 추출
-        nouns = self._extract_nouns(text)
-        adjectives = self._extract_adjectives(text)
-        verbs = self._extract_verbs(text)
+        nouns = self._extract_nouns(tokens, scan)
+        adjectives = self._extract_adjectives(tokens, scan)
+        verbs = self._extract_verbs(tokens, scan)
         
         # 주요 요소 추출
         subject = self._extract_subject(nouns, adjectives)
-        action = self._extract_action(verbs, text)
-        environment = self._extract_environment(text)
-        style = self._extract_style(adjectives, text)
+        action = self._extract_action(verbs, text, scan)
+        environment = self._extract_environment(text, scan)
+        style = self._extract_style(adjectives, text, scan)
         
         return ExtractedElements(
             subject=subject,
@@ -188,130 +260,56 @@ class PromptGenerator:
             }
         )
     
-    def _extract_nouns(self, text: str) -> List[str]:
-        """명사 추출 (간단한 패턴 기반)"""
-        korean_patterns = [
-            r'[가-힣]+(?=[이가]?\s|[을를]?\s|[의]\s|$)',  # 조사가 붙은 명사
-            r'[가-힣]+(?=가\s)',  # '가' 주어 표시
-            r'[가-힣]+(?=는\s)',  # '는' 보조사
-            r'[가-힣]+(?=에서\s)',  # 장소 표시
-        ]
-        
-        nouns = []
-        for pattern in korean_patterns:
-            nouns.extend(re.findall(pattern, text))
+    def _extract_nouns(self, tokens: TokenizedText, scan: ScanResult) -> List[str]:
+        """명사 추출 (토크나이저 후보 + 사전 매칭)"""
+        nouns = list(tokens.nouns)
         
         # 영어 명사 추출
-        english_nouns = re.findall(r'\b[A-Za-z]+\b', text)
+        english_nouns = tokens.english_words
         
         # 특정 명사 매칭 - 주요 주제어 우선 추출
-        specific_nouns = {
-            "영상": "영상",
-            "노래": "노래",
-            "여성": "여성",
-            "여자": "여자", 
-            "남성": "남성",
-            "남자": "남자",
-            "아이": "아이",
-            "아기": "아기"
-        }
-        
-        for noun, value in specific_nouns.items():
-            if noun in text:
-                nouns.append(value)
+        nouns.extend(scan.values("noun"))
         
-        # 중복 제거 및 정리
-        all_nouns = list(set(nouns + english_nouns))
+        # 중복 제거 및 정리 (사전에 있는 명사 우선 - 결정적 순서)
+        all_nouns = list(dict.fromkeys(nouns + english_nouns))
+        all_nouns.sort(key=lambda noun: noun not in self.korean_subject_map)
         
         return [noun for noun in all_nouns if len(noun) > 1]  # 너무 짧은 단어 제거
     
-    def _extract_adjectives(self, text: str) -> List[str]:
+    def _extract_adjectives(self, tokens: TokenizedText, scan: ScanResult) -> List[str]:
         """형용사 추출 및 영어 매핑"""
-        korean_adj_patterns = [
-            r'[가-힣]+(?=한\s)',  # -한
-            r'[가-힣]+(?=ㄴ\s)',   # ㅂ니다체
-            r'[가-힣]+(?=은\s)',   # -은
-            r'[가-힣]+(?=고\s)',   # -고
-        ]
-        
-        # 한국어 형용사-영어 매핑 강화
-        adj_mapping = {
-            "귀여운": "cute",
-            "예쁜": "pretty",
-            "아름다운": "beautiful",
-            "멋진": "cool",
-            "밝은": "bright",
-            "어두운": "dark",
-            "화려한": "vibrant",
-            "자연적인": "natural",
-            "사실적인": "realistic",
-            "예술적인": "artistic",
-            "단순한": "minimalist",
-            "행복한": "happy",
-            "슬픈": "sad",
-            "분위기있는": "atmospheric",
-            "역동적인": "dynamic"
-        }
+        # 한국어 형용사-영어 매핑
+        adj_mapping = self.lexicon.maps["adjective"]
         
-        adjectives = []
-        for pattern in korean_adj_patterns:
-            adjectives.extend(re.findall(pattern, text))
+        adjectives = list(tokens.adjectives)
         
         # 자주 사용되는 형용사 직접 매칭
-        common_adjectives = ['귀여운', '예쁜', '아름다운', '멋진', '큰', '작은', 
-                           '밝은', '어두운', '즐거운', '행복한', '슬픈', '화려한']
-        
-        for adj in common_adjectives:
-            if adj in text:
-                adjectives.append(adj)
+        adjectives.extend(scan.terms("adjective"))
         
         # 매핑 테이블 적용
         translated = []
-        for adj in set(adjectives):  # 중복 제거
+        # 중복 제거 (사전에 있는 형용사 우선 - 결정적 순서)
+        for adj in sorted(dict.fromkeys(adjectives), key=lambda a: a not in adj_mapping):
             if adj in adj_mapping:
                 translated.append(adj_mapping[adj])
             else:
                 translated.append(adj)
             
-        return list(set(translated))  # 최종 중복 제거
+        return list(dict.fromkeys(translated))  # 최종 중복 제거
     
-    def _extract_verbs(self, text: str) -> List[str]:
+    def _extract_verbs(self, tokens: TokenizedText, scan: ScanResult) -> List[str]:
         """동사 추출 및 영어 변환"""
-        verb_patterns = [
-            r'[가-힣]+(?=하는\s)',  # -하는
-            r'[가-힣]+(?=하다\s)',  # -하다
-            r'[가-힣]+(?=한다\s)',  # -한다
-            r'[가-힣]+(?=는\s)',    # -는
-            r'[가-힣]+(?=고\s)',    # -고
-        ]
-        
-        verbs = []
-        for pattern in verb_patterns:
-            verbs.extend(re.findall(pattern, text))
+        verbs = list(tokens.verbs)
         
         # 자주 사용되는 동사 직접 매칭
-        common_verbs = [
-            '뛰노는', '달리는', '걷는', '서있는', '앉아있는', 
-            '움직이는', '있는', '하는', '보는', '먹는', '부르는', '노래하는'
-        ]
-        
-        for verb in common_verbs:
-            if verb in text:
-                verbs.append(verb)
+        verbs.extend(scan.terms("verb"))
         
         # 동사 감지를 위한 특정 구문 검색
-        special_verb_phrases = {
-            "노래를 부르": "부르는",
-            "노래 부르": "부르는"
-        }
+        verbs.extend(scan.values("verb_phrase"))
         
-        for phrase, verb in special_verb_phrases.items():
-            if phrase in text:
-                verbs.append(verb)
-        
-        # 중복 제거, 한국어 동사를 영어로 변환
+        # 중복 제거, 한국어 동사를 영어로 변환 (사전에 있는 동사 우선)
         translated_verbs = []
-        for verb in set(verbs):
+        for verb in sorted(dict.fromkeys(verbs), key=lambda v: v not in self.korean_verb_map):
             if len(verb) <= 2:
                 continue  # 짧은 불완전한 동사 제외
                 
@@ -329,8 +327,7 @@ class PromptGenerator:
             return "scene"
         
         # 특정 주제에 대한 우선순위 매핑
-        priority_nouns = ["여성", "여자", "남성", "남자", "사람", "아이", "아기"]
-        for priority in priority_nouns:
+        for priority in self.lexicon.rules["subject_priority"]:
             if priority in nouns:
                 translated = self.korean_subject_map.get(priority, priority)
                 if adjectives:
@@ -348,7 +345,7 @@ class PromptGenerator:
         # 주요 명사 찾기 - 우선순위 검사
         main_subject = None
         for subject in translated_nouns:
-            if subject in ["child", "baby", "puppy", "kitten", "person", "woman", "man"]:
+            if subject in self.lexicon.rules["main_subjects"]:
                 main_subject = subject
                 break
                 
@@ -366,25 +363,16 @@ class PromptGenerator:
         
         return main_subject
     
-    def _extract_action(self, verbs: List[str], text: str) -> str:
+    def _extract_action(self, verbs: List[str], text: str, scan: ScanResult) -> str:
         """동작 추출 및 한국어-영어 매핑 강화"""
         # 특정 문구 감지를 통한 동작 결정
-        if "노래를 부르" in text or "노래 부르" in text:
-            return "singing"
-        
-        if "뛰노는" in text:
-            return "playfully running"
+        hit = scan.first("action_phrase")
+        if hit:
+            return hit.value
         
         if not verbs:
-            # 기본 동작들
-            default_actions = {
-                "moving": ["moving", "moving gracefully"],
-                "playing": ["playfully moving", "playing"],
-                "standing": ["standing", "standing majestically"]
-            }
-            
             # 텍스트에서 동작 관련 키워드 찾기
-            for keyword, actions in default_actions.items():
+            for keyword, actions in self.lexicon.maps["default_action"].items():
                 if keyword in text.lower():
                     return actions[0]
             
@@ -393,56 +381,29 @@ class PromptGenerator:
         # 첫 번째 동사 반환 (이미 영어로 변환됨)
         return verbs[0]
     
-    def _extract_environment(self, text: str) -> str:
+    def _extract_environment(self, text: str, scan: ScanResult) -> str:
         """환경 추출 및 매핑 개선"""
-        # 환경 설정 개선
-        environment_map = {
-            "밝은": "bright outdoor space",
-            "어두운": "moody atmospheric setting",
-            "실내": "cozy indoor environment",
-            "실외": "open outdoor setting",
-            "자연": "natural environment with greenery",
-            "도시": "urban city environment",
-            "숲": "lush forest setting",
-            "해변": "sunny beach setting",
-            "공원": "peaceful park setting",
-            "집": "comfortable home setting",
-            "산": "majestic mountain landscape",
-            "바다": "peaceful ocean scene",
-            "무대": "professional stage",
-            "스튜디오": "professional studio"
-        }
-        
         # 노래 관련 환경 설정
         if "노래" in text or "부르" in text:
-            specific_environments = ["무대", "스튜디오"]
-            for env in specific_environments:
-                if env in text:
-                    return environment_map.get(env)
+            for env in self.lexicon.rules["singing_environments"]:
+                if scan.has("environment", env):
+                    return self.lexicon.tables["environment"].get(env)
             return "professional stage setting"
         
         # 밝은 영상 키워드 확인
         if "밝은" in text and "영상" in text:
             return "bright setting"
         
-        for keyword, env in environment_map.items():
-            if keyword in text:
-                return env
+        # 사전 순서상 가장 앞선 환경 키워드
+        hit = scan.first("environment")
+        if hit:
+            return hit.value
         
         return "natural setting"
     
-    def _extract_style(self, adjectives: List[str], text: str) -> str:
+    def _extract_style(self, adjectives: List[str], text: str, scan: ScanResult) -> str:
         """스타일 추출 로직 개선"""
-        style_mapping = {
-            "귀여운": "cute",
-            "밝은": "bright",
-            "어두운": "dark",
-            "화려한": "vibrant",
-            "자연적인": "natural",
-            "사실적인": "realistic",
-            "예술적인": "artistic",
-            "단순한": "minimalist"
-        }
+        style_mapping = self.lexicon.maps["style"]
         
         # 형용사에서 스타일 추출
         extracted_styles = []
@@ -455,18 +416,7 @@ class PromptGenerator:
                 extracted_styles.append(adj)
         
         # 텍스트에서 직접 스타일 키워드 찾기
-        style_keywords = {
-            "시네마틱": "cinematic",
-            "드라마틱": "dramatic",
-            "미니멀": "minimalist",
-            "다이나믹": "dynamic",
-            "분위기있는": "atmospheric",
-            "밝은": "bright"
-        }
-        
-        for keyword, style in style_keywords.items():
-            if keyword in text:
-                extracted_styles.append(style)
+        extracted_styles.extend(scan.values("style"))
         
         # 특정 환경 조건에 따른 스타일 설정
         if "밝은" in text:
@@ -476,13 +426,12 @@ class PromptGenerator:
             extracted_styles.append("natural")
         
         # 중복 스타일 필터링
-        unique_styles = list(set(extracted_styles))
+        unique_styles = list(dict.fromkeys(extracted_styles))
         
         # 스타일 우선순위 지정
-        priority_order = ["cinematic", "bright", "vibrant", "natural", "artistic", "realistic", "cute"]
         sorted_styles = []
         
-        for priority_style in priority_order:
+        for priority_style in self.lexicon.rules["style_priority"]:
             if priority_style in unique_styles:
                 sorted_styles.append(priority_style)
         
@@ -491,29 +440,38 @@ class PromptGenerator:
             if style not in sorted_styles:
                 sorted_styles.append(style)
         
-        # 최대 2개 스타일만 사용
-        final_styles = sorted_styles[:2] if sorted_styles else ["natural"]
+        # 최대 스타일 개수 제한
+        max_styles = self.lexicon.rules["max_styles"]
+        final_styles = sorted_styles[:max_styles] if sorted_styles else ["natural"]
         
         return ", ".join(final_styles)
     
     def _determine_category(self, subject: str) -> PromptCategory:
-        """카테고리 결정"""
-        subject_lower = subject.lower()
+        """카테고리 결정 (주제별 메모이제이션)"""
+        key = (self.lexicon.checksum, subject)
+        category = self._category_cache.get(key)
+        if category is None:
+            category = self._match_category(subject)
+            self._category_cache.set(key, category)
+        return category
+    
+    def _match_category(self, subject: str) -> PromptCategory:
+        """주제 키워드로 카테고리 매칭"""
+        scan = self.lexicon.scan(subject.lower())
         
         # 사람 관련 카테고리 확인 (특수 케이스)
-        person_keywords = ["woman", "man", "person", "child", "baby", "portrait"]
-        if any(keyword in subject_lower for keyword in person_keywords):
+        if scan.has("person"):
             return PromptCategory.PERSON
         
-        # 일반 카테고리 매칭
-        for category, template in self.templates.items():
-            keywords = template.get("keywords", [])
-            if any(keyword in subject_lower for keyword in keywords):
+        # 일반 카테고리 매칭 (템플릿 순서 우선)
+        for category in self.templates:
+            if scan.has(f"category:{category.value}"):
                 return category
         
         return PromptCategory.GENERAL
     
-    def _build_prompt(self, elements: ExtractedElements, template: Dict[str, str]) -> str:
+    def _build_prompt(self, elements: ExtractedElements, template: Dict[str, str],
+                      quality_candidates: Optional[Tuple[str, ...]] = None) -> str:
         """최종 프롬프트 구성"""
         structure = template["structure"]
         
@@ -530,7 +488,7 @@ class PromptGenerator:
             "description": f"{elements.subject} {elements.action}",
             "elements": "natural elements",
             "lighting": "natural",
-            "quality": random.choice(self.quality_enhancers)
+            "quality": self._select_quality(elements.metadata["original_text"], quality_candidates)
         }
         
         # 스타일이 이미 주제/형용사에 포함된 경우 중복 제거
@@ -539,43 +497,23 @@ class PromptGenerator:
             # 형용사가 이미 스타일을 포함하면 스타일을 natural로 변경
             template_vars["style"] = "natural"
         
-        # 템플릿 적용
+        # 컴파일된 템플릿 적용 (렌더링 중 중복 세그먼트 제거)
         try:
-            prompt = structure.format(**template_vars)
+            prompt = compile_template(structure).render(template_vars)
         except KeyError:
             # 템플릿 변수가 없을 경우 기본 프롬프트 생성
-            prompt = f"{elements.subject} {elements.action} in {elements.environment}, {elements.style}, high quality"
-        
-        # 중복 단어 및 스타일 제거
-        prompt = self._remove_duplicate_words(prompt)
+            template_vars["style"] = elements.style
+            prompt = compile_template(FALLBACK_STRUCTURE).render(template_vars)
         
         return prompt.strip()
     
-    def _remove_duplicate_words(self, text: str) -> str:
-        """중복 단어 제거 - 향상된 버전"""
-        # 1. 연속된 동일 단어 제거
-        cleaned_text = re.sub(r'\b(\w+)(\s+\1\b)+', r'\1', text)
-        
-        # 2. 콤마로 분리된 중복 단어 찾아서 제거
-        segments = cleaned_text.split(', ')
-        unique_segments = []
-        seen_words = set()
-        
-        for segment in segments:
-            segment_words = set(re.findall(r'\b\w+\b', segment.lower()))
-            # 이미 처리된 단어들과 중복 확인
-            if not any(word in seen_words for word in segment_words):
-                unique_segments.append(segment)
-                seen_words.update(segment_words)
-        
-        # 3. 동사 중복 제거 - 한국어 원본과 영어 번역이 함께 있는 경우
-        result = ', '.join(unique_segments)
-        
-        # 4. 최종 중복 확인 및 공백 정리
-        result = re.sub(r'\s{2,}', ' ', result)
-        result = re.sub(r',\s*,', ',', result)
-        
-        return result
+    def _select_quality(self, text: str, candidates: Optional[Tuple[str, ...]] = None) -> str:
+        """품질 문구 선택 - 사용자가 편집에서 남기는 문구 우선, 결정적 모드에서는 입력과 시드로 고정"""
+        candidates = candidates or self.quality_enhancers
+        if not self.deterministic:
+            return random.choice(candidates)
+        digest = hashlib.sha256(f"{self.seed}:{text}".encode("utf-8")).digest()
+        return candidates[int.from_bytes(digest[:8], "big") % len(candidates)]
 
 # 사용 예시
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+# src/components/prompt_generator/template.py
+import re
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, List, Optional, Set, Tuple
+
+# 템플릿 구조의 세그먼트 구분자 (콤마 단위로 중복 세그먼트 제거)
+SEGMENT_SEPARATOR = ", "
+
+# 템플릿 변수가 없을 때 사용하는 기본 구조
+FALLBACK_STRUCTURE = "{subject} {action} in {environment}, {style}, high quality"
+
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+_REPEATED_WORD_PATTERN = re.compile(r'\b(\w+)(\s+\1\b)+')
+_MULTI_SPACE_PATTERN = re.compile(r'\s{2,}')
+_EMPTY_SEGMENT_PATTERN = re.compile(r',\s*,')
+
+# (변수 여부, 리터럴 또는 변수명)
+Part = Tuple[bool, str]
+
+
+def _accept_segment(segment: str, seen_words: Set[str]) -> Optional[str]:
+    """앞 세그먼트와 단어가 겹치지 않으면 연속 중복 단어를 정리해 반환"""
+    words = _WORD_PATTERN.findall(segment)
+    lowered = {word.lower() for word in words}
+    if not seen_words.isdisjoint(lowered):
+        return None
+    seen_words.update(lowered)
+    if len(set(words)) < len(words):
+        # 같은 단어가 두 번 이상 나올 때만 연속 중복 제거 정규식 적용
+        segment = _REPEATED_WORD_PATTERN.sub(r'\1', segment)
+    return segment
+
+
+def _tidy(text: str) -> str:
+    """공백 및 빈 세그먼트 정리"""
+    text = _MULTI_SPACE_PATTERN.sub(' ', text)
+    return _EMPTY_SEGMENT_PATTERN.sub(',', text)
+
+
+def remove_duplicate_segments(text: str) -> str:
+    """이미 렌더링된 프롬프트의 중복 단어/세그먼트 제거"""
+    seen_words: Set[str] = set()
+    kept = []
+    for segment in text.split(SEGMENT_SEPARATOR):
+        accepted = _accept_segment(segment, seen_words)
+        if accepted is not None:
+            kept.append(accepted)
+    return _tidy(SEGMENT_SEPARATOR.join(kept))
+
+
+class CompiledTemplate:
+    """세그먼트 단위로 미리 파싱된 프롬프트 템플릿
+
+    렌더링하면서 앞 세그먼트와 단어가 겹치는 세그먼트는 만들지 않으므로
+    format 후 전체 문자열을 다시 정규식으로 정리할 필요가 없습니다.
+    """
+
+    def __init__(self, structure: str):
+        self.structure = structure
+        self.segments: Tuple[Tuple[Part, ...], ...] = ()
+        self.fields: frozenset = frozenset()
+        # 변환/서식 지정자가 있으면 str.format 경로 사용
+        self.simple = True
+        try:
+            self.segments = tuple(self._parse(segment) for segment in structure.split(SEGMENT_SEPARATOR))
+        except ValueError:
+            self.simple = False
+        if self.simple:
+            self.fields = frozenset(name for parts in self.segments for is_field, name in parts if is_field)
+        else:
+            self.fields = frozenset(
+                name for _, name, _, _ in Formatter().parse(structure) if name is not None
+            )
+
+    @staticmethod
+    def _parse(segment: str) -> Tuple[Part, ...]:
+        parts: List[Part] = []
+        for literal, name, format_spec, conversion in Formatter().parse(segment):
+            if literal:
+                parts.append((False, literal))
+            if name is None:
+                continue
+            if not name or format_spec or conversion or not name.isidentifier():
+                raise ValueError(f"unsupported template field: {name!r}")
+            parts.append((True, name))
+        return tuple(parts)
+
+    def render(self, values: Dict[str, str]) -> str:
+        """템플릿 렌더링 (변수 누락 시 KeyError)"""
+        if not self.simple:
+            return remove_duplicate_segments(self.structure.format(**values))
+
+        seen_words: Set[str] = set()
+        kept = []
+        for parts in self.segments:
+            text = "".join(values[name] if is_field else name for is_field, name in parts)
+            # 변수 값 자체에 구분자가 들어 있을 수 있음 (예: "bright, cute")
+            for segment in text.split(SEGMENT_SEPARATOR) if SEGMENT_SEPARATOR in text else (text,):
+                accepted = _accept_segment(segment, seen_words)
+                if accepted is not None:
+                    kept.append(accepted)
+        return _tidy(SEGMENT_SEPARATOR.join(kept))
+
+
+@lru_cache(maxsize=128)
+def compile_template(structure: str) -> CompiledTemplate:
+    """템플릿 구조 컴파일 (구조 문자열별로 한 번만 수행)"""
+    return CompiledTemplate(structure)
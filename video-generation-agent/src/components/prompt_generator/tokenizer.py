@@ -0,0 +1,130 @@
+# src/components/prompt_generator/tokenizer.py
+import structlog
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence
+from components.lexicon.lexicon import get_lexicon
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class TokenizedText:
+    """토크나이저가 추출한 품사별 후보 (사전 매핑 전 단계)"""
+    nouns: List[str] = field(default_factory=list)
+    english_words: List[str] = field(default_factory=list)
+    adjectives: List[str] = field(default_factory=list)
+    verbs: List[str] = field(default_factory=list)
+
+
+class Tokenizer(ABC):
+    """PromptGenerator 토크나이저 인터페이스"""
+    name = "base"
+
+    @abstractmethod
+    def tokenize(self, text: str) -> TokenizedText:
+        """단일 입력 토큰화"""
+
+    def tokenize_batch(self, texts: Sequence[str]) -> List[TokenizedText]:
+        """여러 입력 토큰화 (백엔드가 배치를 지원하면 재정의)"""
+        return [self.tokenize(text) for text in texts]
+
+
+class RegexTokenizer(Tokenizer):
+    """사전 파일의 조사/어미 정규식을 사용하는 기본 토크나이저"""
+    name = "regex"
+
+    def tokenize(self, text: str) -> TokenizedText:
+        patterns = get_lexicon().patterns
+        tokens = TokenizedText()
+        for pattern in patterns["noun"]:
+            tokens.nouns.extend(pattern.findall(text))
+        for pattern in patterns["english_noun"]:
+            tokens.english_words.extend(pattern.findall(text))
+        for pattern in patterns["adjective"]:
+            tokens.adjectives.extend(pattern.findall(text))
+        for pattern in patterns["verb"]:
+            tokens.verbs.extend(pattern.findall(text))
+        return tokens
+
+
+class SpacyTokenizer(Tokenizer):
+    """spaCy 품사 태깅 기반 토크나이저
+
+    spaCy는 첫 토큰화 시점에 import하며, 품사 태깅에 필요 없는
+    컴포넌트(parser, ner)는 로드하지 않습니다.
+    """
+    name = "spacy"
+
+    # 세종 품사 태그 (ko_core_news_sm의 tag_는 형태소 태그를 '+'로 연결)
+    NOUN_TAGS = ("NNG", "NNP")
+    ADJECTIVE_TAGS = ("VA",)
+    VERB_TAGS = ("VV",)
+
+    def __init__(self, model: str = "ko_core_news_sm", batch_size: int = 256,
+                 exclude: Iterable[str] = ("parser", "ner")):
+        self.model = model
+        self.batch_size = batch_size
+        self.exclude = list(exclude)
+        self._nlp = None
+
+    def load(self):
+        """spaCy 모델 지연 로드 (모델이 없으면 OSError/ImportError)"""
+        if self._nlp is None:
+            import spacy
+            self._nlp = spacy.load(self.model, exclude=self.exclude)
+        return self._nlp
+
+    def tokenize(self, text: str) -> TokenizedText:
+        return self._from_doc(self.load()(text))
+
+    def tokenize_batch(self, texts: Sequence[str]) -> List[TokenizedText]:
+        nlp = self.load()
+        return [self._from_doc(doc) for doc in nlp.pipe(texts, batch_size=self.batch_size)]
+
+    def _from_doc(self, doc) -> TokenizedText:
+        tokens = TokenizedText()
+        for token in doc:
+            if token.is_ascii and token.is_alpha:
+                tokens.english_words.append(token.text)
+                continue
+
+            tags = token.tag_.split("+")
+            morphemes = token.lemma_.split("+")
+            head_tag = tags[0]
+            if head_tag in self.NOUN_TAGS:
+                # 어절에서 조사를 뗀 명사 형태소 사용
+                tokens.nouns.append(morphemes[0] if len(morphemes) == len(tags) else token.text)
+            elif head_tag in self.ADJECTIVE_TAGS:
+                # 관형형 표층형('귀여운')이 사전 매핑 키
+                tokens.adjectives.append(token.text)
+            elif head_tag in self.VERB_TAGS:
+                tokens.verbs.append(token.text)
+        return tokens
+
+
+# 백엔드별 프로세스 공유 토크나이저 (spaCy 모델은 한 번만 로드)
+_tokenizers = {}
+
+
+def get_tokenizer(backend: str = "regex") -> Tokenizer:
+    """토크나이저 반환 - spaCy 모델을 쓸 수 없으면 정규식 토크나이저로 대체
+
+    backend: "regex" | "spacy" | "auto" ("auto"는 경고 없이 가능한 백엔드 선택)
+    """
+    if backend in _tokenizers:
+        return _tokenizers[backend]
+
+    if backend == "regex":
+        tokenizer = RegexTokenizer()
+    else:
+        tokenizer = SpacyTokenizer()
+        try:
+            tokenizer.load()
+        except (ImportError, OSError) as e:
+            if backend == "spacy":
+                logger.warning("spacy_tokenizer_unavailable", model=tokenizer.model, error=str(e))
+            tokenizer = RegexTokenizer()
+
+    _tokenizers[backend] = tokenizer
+    return tokenizer
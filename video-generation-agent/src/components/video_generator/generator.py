@@ -1,5 +1,6 @@
 # src/components/video_generator/generator.py
 import asyncio
+import hashlib
 import numpy as np
 import cv2
 import os
@@ -7,29 +8,44 @@ import base64
 import io
 import structlog
 import random
+import shutil
+import subprocess
 import time
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
 from typing import Dict, Any, List, Tuple, Optional
 from pathlib import Path
 from config.settings import settings
+from components.lexicon.lexicon import get_lexicon
 
 logger = structlog.get_logger()
 
 class VideoGenerator:
    """최적화된 Mock 영상 생성기"""
    
-   def __init__(self):
+   def __init__(self, deterministic: Optional[bool] = None):
        self.output_dir = Path(settings.DATA_DIR) / "videos"
+       # 결정적 모드: 같은 프롬프트는 같은 움직임 스타일 (미리 렌더링한 영상 재사용 가능)
+       self.deterministic = settings.PROMPT_DETERMINISTIC if deterministic is None else deterministic
        self.output_dir.mkdir(exist_ok=True, parents=True)
        
        # 기본 설정
        self.default_resolution = (640, 360)  # 16:9 비율
        self.default_fps = 24
        self.default_duration = 5  # 초
+       
+       # 루프 렌더링 주기 - 프레임 수는 fps에서 계산 (기본 24fps에서 48프레임)
+       self.loop_seconds = 2  # 초
+   
+   @staticmethod
+   def cache_key(prompt: str, duration: int, loop: bool) -> str:
+       """영상 메타데이터 캐시 키"""
+       digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:32]
+       return f"video:v2:{digest}:{duration}:{int(loop)}"
    
    async def generate(self, prompt: str, duration: int = None, 
-                      resolution: Tuple[int, int] = None) -> Dict[str, Any]:
+                      resolution: Tuple[int, int] = None,
+                      loop: bool = False) -> Dict[str, Any]:
        """개선된 비동기 영상 생성 메소드"""
        logger.info("video_generation_start", 
                    prompt=prompt[:30] + "..." if len(prompt) > 30 else prompt)
@@ -53,7 +69,8 @@ class VideoGenerator:
                resolution,
                self.default_fps,
                prompt,
-               keywords
+               keywords,
+               loop
            )
            
            self._generate_thumbnail(video_path, thumbnail_path)
@@ -66,6 +83,7 @@ class VideoGenerator:
                "keywords": keywords,
                "duration": duration,
                "resolution": f"{resolution[0]}x{resolution[1]}",
+               "loop": loop,
                "created_at": datetime.now().isoformat(),
                "success": True,
                "message": "영상이 성공적으로 생성되었습니다",
@@ -85,39 +103,13 @@ class VideoGenerator:
    
    def _extract_keywords(self, prompt: str) -> List[str]:
        """프롬프트에서 키워드 추출"""
-       words = prompt.lower().split()
-       
-       # 중요 키워드
-       important_words = [
-           "bright", "dark", "vibrant", "colorful", "monochrome",
-           "cinematic", "dramatic", "peaceful", "action", "slow",
-           "nature", "urban", "indoor", "outdoor", "portrait"
-       ]
-       
-       # 한국어 키워드와 영어 매핑
-       korean_mappings = {
-           "밝은": "bright",
-           "어두운": "dark",
-           "화려한": "colorful",
-           "자연": "nature",
-           "실내": "indoor",
-           "실외": "outdoor",
-           "느린": "slow",
-           "빠른": "fast"
-       }
-       
-       # 추출된 키워드
-       keywords = []
+       scan = get_lexicon().scan(prompt.lower())
        
-       # 영어 키워드 추출
-       for word in words:
-           if word in important_words:
-               keywords.append(word)
+       # 영어 키워드 추출 (단어 단위, 등장 순서)
+       keywords = [hit.term for hit in scan.in_order("video_keyword")]
        
        # 한국어 키워드 매핑
-       for k_word, e_word in korean_mappings.items():
-           if k_word in prompt:
-               keywords.append(e_word)
+       keywords.extend(scan.values("video_korean"))
        
        # 키워드가 없으면 기본값 추가
        if not keywords:
@@ -127,11 +119,20 @@ class VideoGenerator:
 
    def _generate_mock_video(self, output_path: Path, duration: int, 
                            resolution: Tuple[int, int], fps: int, 
-                           prompt: str, keywords: List[str]) -> None:
+                           prompt: str, keywords: List[str],
+                           loop: bool = False) -> None:
        """개선된 동기 영상 생성 메소드"""
        width, height = resolution
        color_scheme = self._determine_color_scheme(keywords)
-       movement_style = self._determine_movement_style(keywords)
+       movement_style = self._determine_movement_style(keywords, prompt)
+       
+       # 루프 모드: 한 주기만 렌더링하고 나머지는 반복
+       if loop and duration * fps > self._loop_period(fps):
+           self._generate_looped_video(
+               output_path, duration * fps, width, height, fps,
+               prompt, color_scheme, movement_style
+           )
+           return
        
        # VP80 코덱 사용 - WebM 형식에 적합하며 Streamlit과 호환성 좋음
        # 참고: https://forum.opencv.org/t/opencv-video-streamlit/20100
@@ -154,16 +155,92 @@ class VideoGenerator:
        finally:
            out.release()
    
+   def _loop_period(self, fps: int) -> int:
+       """루프 한 주기의 프레임 수"""
+       return max(1, int(round(fps * self.loop_seconds)))
+   
+   def _generate_looped_video(self, output_path: Path, total_frames: int,
+                              width: int, height: int, fps: int, prompt: str,
+                              color_scheme: List[Tuple[int, int, int]],
+                              movement_style: str) -> None:
+       """한 주기만 렌더링한 뒤 반복하여 긴 영상 생성"""
+       loop_period = self._loop_period(fps)
+       fourcc = cv2.VideoWriter_fourcc(*'VP80')
+       
+       # 1. 한 주기 렌더링
+       cycle_frames = [
+           self._create_frame(
+               frame_idx,
+               total_frames,
+               width,
+               height,
+               prompt,
+               color_scheme,
+               movement_style,
+               loop_period=loop_period
+           )
+           for frame_idx in range(loop_period)
+       ]
+       
+       # 2. ffmpeg이 있으면 한 주기만 인코딩하고 스트림 복사로 반복 (재인코딩 없음)
+       ffmpeg = shutil.which("ffmpeg")
+       if ffmpeg:
+           cycle_path = output_path.with_name(f"{output_path.stem}_cycle{output_path.suffix}")
+           out = cv2.VideoWriter(str(cycle_path), fourcc, fps, (width, height))
+           try:
+               for frame in cycle_frames:
+                   out.write(frame)
+           finally:
+               out.release()
+           
+           try:
+               if self._repeat_encoded_cycle(ffmpeg, cycle_path, output_path,
+                                             total_frames, loop_period, fps):
+                   return
+           finally:
+               cycle_path.unlink(missing_ok=True)
+       
+       # 3. 대체 경로: 렌더링된 프레임을 재사용하여 인코딩만 반복
+       out = cv2.VideoWriter(str(output_path), fourcc, fps, (width, height))
+       try:
+           for frame_idx in range(total_frames):
+               out.write(cycle_frames[frame_idx % loop_period])
+       finally:
+           out.release()
+   
+   def _repeat_encoded_cycle(self, ffmpeg: str, cycle_path: Path, output_path: Path,
+                             total_frames: int, loop_period: int, fps: int) -> bool:
+       """ffmpeg 스트림 복사로 인코딩된 주기 반복"""
+       repeats = -(-total_frames // loop_period) - 1
+       command = [
+           ffmpeg, "-y", "-loglevel", "error",
+           "-stream_loop", str(repeats),
+           "-i", str(cycle_path),
+           "-c", "copy",
+           "-frames:v", str(total_frames),
+           str(output_path)
+       ]
+       try:
+           subprocess.run(command, check=True, capture_output=True, timeout=60)
+           return True
+       except (subprocess.SubprocessError, OSError) as e:
+           logger.warning("loop_stream_copy_failed", error=str(e))
+           return False
+   
    def _create_frame(self, frame_idx: int, total_frames: int, 
                      width: int, height: int, prompt: str, 
                      color_scheme: List[Tuple[int, int, int]],
-                     movement_style: str) -> np.ndarray:
-       """단일 프레임 생성"""
+                     movement_style: str,
+                     loop_period: Optional[int] = None) -> np.ndarray:
+       """단일 프레임 생성 (loop_period 지정 시 주기적으로 이어지는 프레임)"""
        # 빈 프레임 생성
        frame = np.zeros((height, width, 3), dtype=np.uint8)
        
-       # 진행률
-       progress = frame_idx / total_frames
+       # 진행률 - 루프 모드에서는 주기 내 위치
+       if loop_period:
+           progress = (frame_idx % loop_period) / loop_period
+       else:
+           progress = frame_idx / total_frames
        
        # 움직임 스타일에 따른 처리
        if movement_style == "gradient":
@@ -195,11 +272,14 @@ class VideoGenerator:
            
            for i in range(num_particles):
                # 파티클 위치
-               x = int(width * (0.2 + 0.6 * ((i * 7 + frame_idx) % 100) / 100))
-               y = int(height * (0.2 + 0.6 * ((i * 13 + frame_idx) % 100) / 100))
+               # 루프 모드에서는 주기 내 위치로 100칸 경로를 한 바퀴 돌아 주기 끝에서 이어짐
+               step = progress * 100 if loop_period else frame_idx
+               x = int(width * (0.2 + 0.6 * ((i * 7 + step) % 100) / 100))
+               y = int(height * (0.2 + 0.6 * ((i * 13 + step) % 100) / 100))
                
-               # 파티클 크기 (최소값 1 보장)
-               size = max(1, int(5 + 10 * np.sin(frame_idx / 20 + i)))
+               # 파티클 크기 (최소값 1 보장, 루프 모드에서는 주기에 맞춘 위상)
+               size_phase = 2 * np.pi * progress if loop_period else frame_idx / 20
+               size = max(1, int(5 + 10 * np.sin(size_phase + i)))
                
                # 파티클 색상
                color = color_scheme[i % len(color_scheme)]
@@ -237,12 +317,12 @@ class VideoGenerator:
            color_idx = int(progress * len(color_scheme)) % len(color_scheme)
            frame[:] = color_scheme[color_idx]
        
-       # 텍스트 추가
-       self._add_text_to_frame(frame, prompt, progress)
+       # 텍스트 추가 (루프 영상은 이음새가 보이지 않도록 진행 바 생략)
+       self._add_text_to_frame(frame, prompt, None if loop_period else progress)
        
        return frame
    
-   def _add_text_to_frame(self, frame: np.ndarray, prompt: str, progress: float) -> None:
+   def _add_text_to_frame(self, frame: np.ndarray, prompt: str, progress: Optional[float]) -> None:
        """프레임에 텍스트 추가"""
        height, width = frame.shape[:2]
        
@@ -263,20 +343,21 @@ class VideoGenerator:
        cv2.putText(frame, "AI Generated Video", (20, 40), 
                   font, 1.0, (255, 255, 255), thickness+1)
        
-       # 프로그레스 바
-       bar_width = int(width * 0.8)
-       bar_height = 10
-       bar_x = int((width - bar_width) / 2)
-       bar_y = height - 30
+       # 프로그레스 바 (루프 영상은 생략)
+       if progress is not None:
+           bar_width = int(width * 0.8)
+           bar_height = 10
+           bar_x = int((width - bar_width) / 2)
+           bar_y = height - 30
        
-       # 배경 바
-       cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), 
-                    (100, 100, 100), -1)
+           # 배경 바
+           cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), 
+                        (100, 100, 100), -1)
        
-       # 진행 바
-       filled_width = int(bar_width * progress)
-       cv2.rectangle(frame, (bar_x, bar_y), (bar_x + filled_width, bar_y + bar_height), 
-                    (0, 255, 255), -1)
+           # 진행 바
+           filled_width = int(bar_width * progress)
+           cv2.rectangle(frame, (bar_x, bar_y), (bar_x + filled_width, bar_y + bar_height), 
+                        (0, 255, 255), -1)
        
        # 프롬프트 표시
        for i, line in enumerate(prompt_lines):
@@ -331,7 +412,7 @@ class VideoGenerator:
        
        return default_scheme
    
-   def _determine_movement_style(self, keywords: List[str]) -> str:
+   def _determine_movement_style(self, keywords: List[str], prompt: str = "") -> str:
        """키워드 기반 움직임 스타일 결정"""
        style_mappings = {
            "slow": "gradient",
@@ -347,8 +428,13 @@ class VideoGenerator:
            if keyword in style_mappings:
                return style_mappings[keyword]
        
+       styles = ["gradient", "particles", "wave"]
+       if self.deterministic:
+           # 프롬프트 해시로 고정 선택
+           digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+           return styles[digest[0] % len(styles)]
        # 랜덤 선택
-       return random.choice(["gradient", "particles", "wave"])
+       return random.choice(styles)
    
    def _generate_thumbnail(self, video_path: Path, thumbnail_path: Path) -> None:
        """영상에서 썸네일 추출"""
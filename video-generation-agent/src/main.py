@@ -2,6 +2,7 @@
 import streamlit as st
 import asyncio
 import os
+import uuid
 from datetime import datetime
 from pathlib import Path
 from config.settings import settings
@@ -11,9 +12,19 @@ from components.prompt_editor.editor import PromptEditor
 from components.video_generator.generator import VideoGenerator
 from components.history.history_manager import HistoryManager
 from components.cache.cache_manager import CacheManager
+from components.cache.warmup import start_background_warmup
+from components.history.mongo_client import get_mongo_breaker
+from components.history.retention import start_background_rollup
 
 logger = setup_logging()
 
+async def load_history_panel(history_manager: HistoryManager):
+    """히스토리 패널 데이터 (최근 항목, 통계)를 동시에 조회"""
+    return await asyncio.gather(
+        history_manager.aget_recent_history(limit=5),
+        history_manager.aget_stats()
+    )
+
 def main():
     st.set_page_config(
         page_title=settings.APP_NAME,
@@ -23,9 +34,17 @@ def main():
     
     st.title("🎬 프롬프트 최적화 영상 생성 에이전트")
     
+    # 인기 입력 캐시 워밍 (프로세스당 한 번 시작, 백그라운드 실행)
+    start_background_warmup()
+    # 오래된 히스토리 세션 정리 (프로세스당 한 번 시작, 백그라운드 실행)
+    start_background_rollup()
+    
     # 컴포넌트 초기화
     prompt_generator = PromptGenerator()
-    prompt_editor = PromptEditor()
+    # 편집기는 세션에 보관 (리비전 체인이 재실행 사이에도 이어지도록)
+    if 'prompt_editor_state' not in st.session_state:
+        st.session_state.prompt_editor_state = PromptEditor()
+    prompt_editor = st.session_state.prompt_editor_state
     video_generator = VideoGenerator()
     history_manager = HistoryManager()
     cache_manager = CacheManager()
@@ -37,7 +56,9 @@ def main():
         'diff_result': None,
         'request_history': [],
         'video_result': None,
-        'similar_prompts': []
+        'similar_prompts': [],
+        'prompt_category': None,
+        'session_id': uuid.uuid4().hex
     }
     for key, val in session_defaults.items():
         if key not in st.session_state:
@@ -84,22 +105,31 @@ def main():
                             if prompt_key:
                                 st.session_state.current_prompt = prompt[prompt_key]
                                 st.session_state.original_prompt = prompt[prompt_key]
+                                st.session_state.prompt_category = prompt.get('category')
                                 st.rerun()
         
         # 프롬프트 생성 처리
         if generate_btn and user_input:
             with st.spinner("프롬프트 생성 중..."):
                 try:
-                    cached = cache_manager.get(f"prompt:{user_input}")
+                    # 정규화된 입력 기반 캐시 키 (공백/유니코드/문장부호 차이 무시)
+                    # 키와 생성이 같은 편집 패턴 스냅샷을 쓰도록 한 번만 준비
+                    prepared = prompt_generator.prepare(user_input)
+                    cached = cache_manager.get(prepared.cache_key)
                     if cached:
                         result = cached
                         st.toast("캐시된 결과를 불러왔습니다", icon="💾")
                     else:
-                        result = asyncio.run(prompt_generator.generate_prompt(user_input))
-                        cache_manager.set(f"prompt:{user_input}", result)
+                        # 같은 입력을 동시에 요청한 세션은 한 번만 생성
+                        result = cache_manager.get_or_set(
+                            prepared.cache_key,
+                            lambda: asyncio.run(prompt_generator.generate_prompt(user_input, prepared)),
+                            cacheable=lambda result: result.get('category') != 'error'
+                        )
                     
                     st.session_state.original_prompt = result['optimized_prompt']
                     st.session_state.current_prompt = result['optimized_prompt']
+                    st.session_state.prompt_category = result.get('category')
                     st.session_state.diff_result = None
                     st.session_state.video_result = None
                 except Exception as e:
@@ -119,14 +149,16 @@ def main():
             # 변경 사항 감지
             if new_prompt != st.session_state.current_prompt:
                 st.session_state.current_prompt = new_prompt
-                st.session_state.diff_result = prompt_editor.generate_diff(
+                st.session_state.diff_result = prompt_editor.track_edit(
                     st.session_state.original_prompt,
                     st.session_state.current_prompt
                 )
                 history_manager.save_history({
+                    'session_id': st.session_state.session_id,
                     'input': user_input,
                     'original_prompt': st.session_state.original_prompt,
                     'edited_prompt': new_prompt,
+                    'category': st.session_state.prompt_category,
                     'diff': st.session_state.diff_result
                 })
             
@@ -138,14 +170,25 @@ def main():
             # 영상 생성 섹션
             st.subheader("🎥 영상 생성 설정")
             duration = st.slider("영상 길이 (초)", 5, 15, 10)
+            loop_render = st.checkbox("루프 렌더링 (한 주기만 렌더링 후 반복)", value=False, key="loop_render")
             if st.button("영상 생성 시작", type="secondary", key="video_gen"):
                 with st.spinner("영상 생성 중... 약 10-20초 소요됩니다"):
                     try:
-                        video_result = asyncio.run(
-                            video_generator.generate(
-                                st.session_state.current_prompt,
-                                duration=duration
-                            )
+                        # 같은 프롬프트/설정의 영상 메타데이터 캐시 (파일이 남아 있을 때만 재사용)
+                        video_key = video_generator.cache_key(st.session_state.current_prompt, duration, loop_render)
+                        cached_video = cache_manager.get(video_key)
+                        if cached_video and not (Path(settings.DATA_DIR) / cached_video['video_url']).exists():
+                            cache_manager.delete(video_key)
+                        video_result = cache_manager.get_or_set(
+                            video_key,
+                            lambda: asyncio.run(
+                                video_generator.generate(
+                                    st.session_state.current_prompt,
+                                    duration=duration,
+                                    loop=loop_render
+                                )
+                            ),
+                            cacheable=lambda result: bool(result.get('success'))
                         )
                         st.session_state.video_result = video_result
                         st.toast("영상 생성 완료!", icon="✅")
@@ -173,7 +216,8 @@ def main():
     with col2:
         # 히스토리 패널
         st.header("📚 작업 히스토리")
-        history = history_manager.get_recent_history(limit=5)
+        # 목록과 통계를 동시에 조회 (통계는 아래 시스템 상태에서 표시)
+        history, history_stats = asyncio.run(load_history_panel(history_manager))
         if history:
             for idx, entry in enumerate(history):
                 with st.expander(f"작업 {idx+1} - {entry.get('input','')[:20]}", expanded=False):
@@ -183,7 +227,7 @@ def main():
                     st.markdown(f"**수정 프롬프트:**")
                     st.code(entry['edited_prompt'], language="text")
                     st.markdown("**변경 사항:**")
-                    st.json(entry['diff'], expanded=False)
+                    st.json(entry.get('diff', {}).get('summary', {}), expanded=False)
                     st.caption(f"생성 시간: {entry['timestamp']}")
         else:
             st.info("아직 저장된 히스토리가 없습니다")
@@ -193,10 +237,34 @@ def main():
         st.metric("서버 상태", "정상 작동" if settings.APP_ENV == "production" else "개발 모드")
         col2_1, col2_2 = st.columns(2)
         with col2_1:
-            st.metric("Redis", "연결됨" if cache_manager.redis is not None else "연결 안 됨")
+            redis_health = cache_manager.health()
+            redis_status = {
+                "closed": "연결됨" if redis_health["configured"] else "연결 안 됨",
+                "open": f"차단됨 ({redis_health['retry_in']}초 후 재시도)",
+                "half_open": "복구 확인 중"
+            }[redis_health["state"]]
+            st.metric("Redis", redis_status)
+            if redis_health["state"] != "closed" and redis_health["last_error"]:
+                st.caption(f"Redis 오류: {redis_health['last_error']}")
         with col2_2:
-            # 수정된 부분: collection 비교 방식 변경
-            st.metric("MongoDB", "연결됨" if history_manager.collection is not None else "연결 안 됨")
+            mongo_health = get_mongo_breaker().snapshot()
+            if history_manager.collection is not None:
+                mongo_status = "연결됨"
+            elif mongo_health["state"] == "open":
+                mongo_status = f"연결 안 됨 ({mongo_health['retry_in']}초 후 재시도)"
+            else:
+                mongo_status = "연결 안 됨"
+            st.metric("MongoDB", mongo_status)
+            if mongo_health["state"] != "closed" and mongo_health["last_error"]:
+                st.caption("MongoDB 대신 로컬 저장소 사용 중")
+        st.caption(f"히스토리: {history_stats['total']}건, 평균 변경 {history_stats['avg_changes']}개, "
+                   f"개선 비율 {history_stats['improved_ratio']:.0%}")
+        parse_stats = prompt_generator.cache_stats()["parse"]
+        st.caption(f"프롬프트 파싱 캐시: 적중 {parse_stats['hits']} / 미스 {parse_stats['misses']} "
+                   f"(적중률 {parse_stats['hit_rate']:.0%})")
+        local_stats = cache_manager.stats()
+        st.caption(f"로컬 캐시: {local_stats['size']}개, 적중률 {local_stats['hit_rate']:.0%}, "
+                   f"동시 요청 병합 {local_stats['coalesced']}회")
         
         # 도움말 섹션
         with st.expander("❓ 사용 가이드", expanded=False):
@@ -0,0 +1,143 @@
+# src/utils/aho_corasick.py
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class LexiconHit:
+    """스캔으로 찾은 사전 항목"""
+    term: str
+    category: str
+    value: Any
+    start: int
+    end: int
+    priority: int
+
+
+class ScanResult:
+    """한 번의 스캔 결과 - 카테고리별 조회 도우미"""
+
+    def __init__(self, hits: List[LexiconHit]):
+        self.hits = hits
+        self._first_hits: Dict[str, Dict[str, LexiconHit]] = {}
+        for hit in hits:
+            by_term = self._first_hits.setdefault(hit.category, {})
+            if hit.term not in by_term:
+                by_term[hit.term] = hit
+
+    def has(self, category: str, term: Optional[str] = None) -> bool:
+        """카테고리(또는 특정 단어)가 입력에 등장했는지 확인"""
+        by_term = self._first_hits.get(category, {})
+        return term in by_term if term is not None else bool(by_term)
+
+    def by_priority(self, category: str) -> List[LexiconHit]:
+        """카테고리 내 고유 단어를 사전 등록 순서대로 반환"""
+        return sorted(self._first_hits.get(category, {}).values(), key=lambda h: h.priority)
+
+    def terms(self, category: str) -> List[str]:
+        """사전 등록 순서의 고유 단어 목록"""
+        return [hit.term for hit in self.by_priority(category)]
+
+    def values(self, category: str) -> List[Any]:
+        """사전 등록 순서의 매핑 값 목록"""
+        return [hit.value for hit in self.by_priority(category)]
+
+    def first(self, category: str) -> Optional[LexiconHit]:
+        """사전 등록 순서상 가장 앞선 항목"""
+        hits = self._first_hits.get(category)
+        if not hits:
+            return None
+        return min(hits.values(), key=lambda h: h.priority)
+
+    def in_order(self, category: str) -> List[LexiconHit]:
+        """입력 등장 순서의 모든 항목 (중복 포함)"""
+        return [hit for hit in self.hits if hit.category == category]
+
+
+class AhoCorasick:
+    """여러 사전을 하나의 오토마톤으로 컴파일하는 다중 패턴 매처
+
+    입력을 한 번만 훑어 모든 사전 항목의 위치와 카테고리를 반환하므로
+    매칭 비용이 사전 크기가 아닌 입력 길이와 매칭 수에 비례합니다.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 노드 자신의 패턴 (term, category, value, priority, whole_word)
+        self._terms: List[List[Tuple[str, str, Any, int, bool]]] = [[]]
+        # 실패 링크를 따라 병합한 출력 (build에서 _terms로부터 다시 계산)
+        self._outputs: List[List[Tuple[str, str, Any, int, bool]]] = [[]]
+        self._built = False
+
+    def add(self, term: str, category: str, value: Any = None,
+            priority: int = 0, whole_word: bool = False) -> None:
+        """패턴 등록 (whole_word=True면 공백 단위로 분리된 단어만 매칭)"""
+        if not term:
+            return
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._terms.append([])
+            node = next_node
+        self._terms[node].append(
+            (term, category, term if value is None else value, priority, whole_word)
+        )
+        self._built = False
+
+    def build(self) -> "AhoCorasick":
+        """실패 링크 계산 (BFS) - 여러 번 호출해도 같은 결과"""
+        self._outputs = [list(terms) for terms in self._terms]
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # 접미사로 끝나는 패턴 출력 병합
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+        self._built = True
+        return self
+
+    def scan(self, text: str) -> ScanResult:
+        """입력을 한 번 훑어 모든 매칭 반환"""
+        if not self._built:
+            self.build()
+
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        hits = []
+        node = 0
+        text_length = len(text)
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not outputs[node]:
+                continue
+
+            end = index + 1
+            for term, category, value, priority, whole_word in outputs[node]:
+                start = end - len(term)
+                if whole_word and not (
+                    (start == 0 or text[start - 1].isspace())
+                    and (end == text_length or text[end].isspace())
+                ):
+                    continue
+                hits.append(LexiconHit(term, category, value, start, end, priority))
+
+        return ScanResult(hits)
@@ -0,0 +1,93 @@
+# src/utils/space_saving.py
+import heapq
+import threading
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """Space-Saving 빈발 항목 집계 (항목 수 capacity로 고정, 스레드 안전)
+
+    표가 가득 차면 가장 작은 카운트의 항목을 새 항목으로 교체하고 그 카운트를 오차로 물려받습니다.
+    추정값은 실제 빈도 이상이며 과대 추정은 error 이하입니다 (error <= 전체 수 / capacity).
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = max(1, capacity)
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # (카운트, 순번, 항목) 최소 힙 - 카운트가 바뀐 항목은 꺼낼 때 건너뜀
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        with self._lock:
+            self.total += count
+            if item in self._counts:
+                self._counts[item] += count
+            elif len(self._counts) < self.capacity:
+                self._counts[item] = count
+                self._errors[item] = 0
+            else:
+                floor = self._pop_min()
+                self._counts[item] = floor + count
+                self._errors[item] = floor
+            self._push(item)
+
+    def _push(self, item: Hashable) -> None:
+        self._sequence += 1
+        heapq.heappush(self._heap, (self._counts[item], self._sequence, item))
+        # 오래된 힙 항목이 쌓이면 현재 카운트로 재구성 (메모리 고정)
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, i, item) for i, (item, count) in enumerate(self._counts.items())]
+            heapq.heapify(self._heap)
+            self._sequence = len(self._heap)
+
+    def _pop_min(self) -> int:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                del self._counts[item]
+                del self._errors[item]
+                return count
+
+    def count(self, item: Hashable) -> int:
+        """추정 빈도 (표에 없으면 0)"""
+        return self._counts.get(item, 0)
+
+    def estimate(self, item: Hashable) -> Tuple[int, int]:
+        """(추정 빈도, 최대 오차) - 표에 없으면 (0, 표의 최소 카운트)"""
+        with self._lock:
+            if item in self._counts:
+                return self._counts[item], self._errors[item]
+            floor = min(self._counts.values()) if len(self._counts) >= self.capacity else 0
+            return 0, floor
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[Hashable, int, int]]:
+        """빈도 상위 항목 [(항목, 추정 빈도, 최대 오차)]"""
+        with self._lock:
+            ranked = sorted(self._counts.items(), key=lambda pair: pair[1], reverse=True)
+            return [(item, count, self._errors[item]) for item, count in ranked[:n]]
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "total": self.total,
+                "items": [[item, count, self._errors[item]] for item, count in self._counts.items()]
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict, capacity: Optional[int] = None) -> "SpaceSaving":
+        """to_dict 결과 복원 (capacity가 줄었으면 상위 항목만 유지)"""
+        sketch = cls(capacity or data.get("capacity", 256))
+        items = sorted(data.get("items", []), key=lambda row: row[1], reverse=True)[:sketch.capacity]
+        sketch.total = data.get("total", 0)
+        for item, count, error in items:
+            sketch._counts[item] = count
+            sketch._errors[item] = error
+        sketch._heap = [(count, i, item) for i, (item, count) in enumerate(sketch._counts.items())]
+        heapq.heapify(sketch._heap)
+        sketch._sequence = len(sketch._heap)
+        return sketch